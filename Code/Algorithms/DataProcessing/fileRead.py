@@ -1,4 +1,5 @@
 import os
+import numpy as np
 import pandas as pd
 import struct
 import math
@@ -12,16 +13,20 @@ if __name__ == "__main__":
     file_path = os.path.normpath(os.path.join(script_dir, relative_path))
 
     print(f"Processing file: {file_path}")
-    frames_data = process_log_file(file_path, snr_threshold=15, z_min=-0.50, z_max=2, doppler_threshold=0.1)
-    # Count total rows in the file (excluding header)
-    total_rows = sum(1 for _ in open(file_path)) - 1
+    # Total rows in the file (excluding header) are counted while parsing
+    frames_data, total_rows = process_log_file(file_path, snr_threshold=15, z_min=-0.50, z_max=2, doppler_threshold=0.1, return_total_rows=True)
     
     # Print sample data (first 5 frames) with limited decimal points
     for frame_num, frame_content in list(frames_data.items())[:50]:
         print(f"\nFrame {frame_num}:")
         for tlv in frame_content["TLVs"]:
             for key, value in tlv.items():
-                if isinstance(value, list):  # For lists, print each item on a new line
+                if isinstance(value, np.ndarray):  # For structured arrays, print each row on a new line
+                    print(f"  {key}:")
+                    for item in value:
+                        formatted_item = {k: round(float(item[k]), 3) for k in value.dtype.names}
+                        print(f"    {formatted_item}")
+                elif isinstance(value, list):  # For lists, print each item on a new line
                     print(f"  {key}:")
                     for item in value:
                         if isinstance(item, dict):  # If the item is a dictionary, limit decimals
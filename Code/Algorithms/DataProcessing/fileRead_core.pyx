@@ -0,0 +1,100 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled TLV parser used by radar_utilsProcessing.process_log_file.
+
+Build it in place (next to radar_utilsProcessing.py) with:
+    cythonize -i fileRead_core.pyx
+If the compiled module is not present, the pure Python parser is used instead.
+"""
+import numpy as np
+cimport cython
+from libc.math cimport sqrt, atan2
+from libc.string cimport memcpy
+
+cdef double RAD_TO_DEG = 180.0 / 3.14159265358979323846
+
+# Little-endian reads (the radar and all supported hosts are little-endian)
+cdef inline unsigned int read_uint32(const unsigned char[:] buf, Py_ssize_t offset) noexcept nogil:
+    cdef unsigned int value
+    memcpy(&value, &buf[offset], 4)
+    return value
+
+cdef inline unsigned short read_uint16(const unsigned char[:] buf, Py_ssize_t offset) noexcept nogil:
+    cdef unsigned short value
+    memcpy(&value, &buf[offset], 2)
+    return value
+
+cdef inline float read_float32(const unsigned char[:] buf, Py_ssize_t offset) noexcept nogil:
+    cdef float value
+    memcpy(&value, &buf[offset], 4)
+    return value
+
+
+cpdef tuple parse_tlvs(const unsigned char[:] buf, Py_ssize_t offset, unsigned int num_tlvs, unsigned int num_detected_obj):
+    """
+    Walks all TLVs of one frame starting at offset (right after the frame header).
+
+    Returns:
+        points (np.ndarray): (N, 7) float32 rows of X, Y, Z, Doppler, Range, Azimuth, Elevation.
+        side_info (np.ndarray): (M, 2) float32 rows of SNR [dB], Noise [dB].
+        unknown_types (list): TLV types other than 1, 2, 3 and 7.
+    """
+    cdef Py_ssize_t n = buf.shape[0]
+    cdef Py_ssize_t payload_offset, available, num_points = 0, num_entries = 0, i
+    cdef Py_ssize_t points_offset = 0, side_offset = 0
+    cdef unsigned int tlv_idx, tlv_type, tlv_length
+    cdef double x, y, z, xy
+    cdef float[:, ::1] points_view
+    cdef float[:, ::1] side_view
+    unknown_types = []
+
+    # First pass: locate the payloads of interest (the last occurrence wins, as in Python)
+    for tlv_idx in range(num_tlvs):
+        if n - offset < 8:
+            raise ValueError("Insufficient data for TLV Header")
+        tlv_type = read_uint32(buf, offset)
+        tlv_length = read_uint32(buf, offset + 4)
+        payload_offset = offset + 8
+        available = n - payload_offset
+        if available < 0:
+            available = 0
+
+        if tlv_type == 1:
+            points_offset = payload_offset
+            num_points = min(<Py_ssize_t>tlv_length, available) // 16
+        elif tlv_type == 7:
+            side_offset = payload_offset
+            if tlv_length != 4 * num_detected_obj:
+                num_entries = 0
+            else:
+                num_entries = min(<Py_ssize_t>num_detected_obj, available // 4)
+        elif tlv_type != 2 and tlv_type != 3:
+            unknown_types.append(tlv_type)
+
+        offset = payload_offset + tlv_length
+
+    # Second pass: decode points and side info straight into the output arrays
+    points = np.empty((num_points, 7), dtype=np.float32)
+    side_info = np.empty((num_entries, 2), dtype=np.float32)
+    points_view = points
+    side_view = side_info
+
+    with nogil:
+        for i in range(num_points):
+            x = read_float32(buf, points_offset + 16 * i)
+            y = read_float32(buf, points_offset + 16 * i + 4)
+            z = read_float32(buf, points_offset + 16 * i + 8)
+            xy = sqrt(x * x + y * y)
+            points_view[i, 0] = <float>x
+            points_view[i, 1] = <float>y
+            points_view[i, 2] = <float>z
+            points_view[i, 3] = read_float32(buf, points_offset + 16 * i + 12)
+            points_view[i, 4] = <float>sqrt(x * x + y * y + z * z)
+            points_view[i, 5] = <float>(atan2(x, y) * RAD_TO_DEG)
+            points_view[i, 6] = <float>(atan2(z, xy) * RAD_TO_DEG)
+
+        for i in range(num_entries):
+            side_view[i, 0] = <float>(read_uint16(buf, side_offset + 4 * i) * 0.1)
+            side_view[i, 1] = <float>(read_uint16(buf, side_offset + 4 * i + 2) * 0.1)
+
+    return points, side_info, unknown_types
@@ -2,6 +2,23 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 
+# Index of all points in frame order, so any run of frames is a single slice
+def build_submap_index(frames_data):
+    """ Returns the sorted frame numbers, all their points stacked, and each frame's start offset (plus the end). """
+    frames = np.array(sorted(frames_data), dtype=int)
+    all_points = np.concatenate([frames_data[frame] for frame in frames] + [np.empty((0, 4), dtype=np.float32)])
+    frame_ptr = np.cumsum([0] + [len(frames_data[frame]) for frame in frames])
+    return frames, all_points, frame_ptr
+
+# Submap aggregation function
+def aggregate_submap(frames_data, start_frame, num_frames=10, submap_index=None):
+    # Index the frames (unless the caller already did)
+    frames, all_points, frame_ptr = submap_index if submap_index is not None else build_submap_index(frames_data)
+
+    # Frames start_frame .. start_frame + num_frames - 1 are one contiguous run of points
+    first, last = np.searchsorted(frames, [start_frame, start_frame + num_frames])
+    return all_points[frame_ptr[first]:frame_ptr[last]]
+
 # Submap aggregation and plotting
 def plot_submap(frames_data):
     aggregated_points = []
@@ -10,14 +27,14 @@ def plot_submap(frames_data):
     for frame in frames_data.values():
         for tlv in frame["TLVs"]:
             if "Type 1 Data" in tlv:
-                for point in tlv["Type 1 Data"]:
-                    aggregated_points.append([point["X [m]"], point["Y [m]"], point["Z [m]"]])
+                points = tlv["Type 1 Data"]
+                aggregated_points.append(np.column_stack((points["X [m]"], points["Y [m]"], points["Z [m]"])))
         frame_count += 1
         if frame_count == 10:
             break
 
-    # Convert to numpy array
-    aggregated_points = np.array(aggregated_points)
+    # Stack the per-frame arrays into one (N, 3) array
+    aggregated_points = np.concatenate(aggregated_points)
 
     # Plot the aggregated points
     fig = plt.figure(figsize=(10, 8))
@@ -1,12 +1,51 @@
 import struct
-import math
+import numpy as np
 import pandas as pd
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: fall back to plain Python functions
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    # Optional compiled TLV parser, built in place with: cythonize -i fileRead_core.pyx
+    import fileRead_core
+except ImportError:
+    fileRead_core = None
+
+# Precompiled binary layouts, built once at import instead of on every unpack
+FRAME_HEADER_STRUCT = struct.Struct('<QIIIIIIII')
+TLV_HEADER_STRUCT = struct.Struct('<II')
+POINT_STRUCT = struct.Struct('<ffff')
+SIDE_INFO_STRUCT = struct.Struct('<HH')
+
+# Number of CSV rows read per chunk (each row holds one full frame)
+CSV_CHUNK_SIZE = 10000
+
+# Structured layouts for Type 1 points and Type 7 side info (field names match the former dict keys)
+POINT_DTYPE = np.dtype([
+    ("X [m]", np.float32),
+    ("Y [m]", np.float32),
+    ("Z [m]", np.float32),
+    ("Doppler [m/s]", np.float32),
+    ("Range [m]", np.float32),
+    ("Azimuth [deg]", np.float32),
+    ("Elevation Angle [deg]", np.float32)
+])
+SIDE_INFO_DTYPE = np.dtype([
+    ("SNR [dB]", np.float32),
+    ("Noise [dB]", np.float32)
+])
+
 # Parse Frame Header
-def parse_frame_header(raw_data_list):
-    if len(raw_data_list) < 40:
+def parse_frame_header(raw_data, offset=0):
+    if len(raw_data) - offset < FRAME_HEADER_STRUCT.size:
         raise ValueError("Insufficient data for Frame Header")
-    raw_bytes = bytes([raw_data_list.pop(0) for _ in range(40)])
-    frame_header = struct.unpack('<QIIIIIIII', raw_bytes)
+    frame_header = FRAME_HEADER_STRUCT.unpack_from(raw_data, offset)
     return {
         "Magic Word": f"0x{frame_header[0]:016X}",
         "Version": f"0x{frame_header[1]:08X}",
@@ -17,153 +56,191 @@ def parse_frame_header(raw_data_list):
         "Num Detected Obj": frame_header[6],
         "Num TLVs": frame_header[7],
         "Subframe Number": frame_header[8]
-    }
+    }, offset + FRAME_HEADER_STRUCT.size
 
 # Parse TLV Header
-def parse_tlv_header(raw_data_list):
-    if len(raw_data_list) < 8:
+def parse_tlv_header(raw_data, offset):
+    if len(raw_data) - offset < TLV_HEADER_STRUCT.size:
         raise ValueError("Insufficient data for TLV Header")
-    raw_bytes = bytes([raw_data_list.pop(0) for _ in range(8)])
-    tlv_type, tlv_length = struct.unpack('<II', raw_bytes)
-    return {"TLV Type": tlv_type, "TLV Length": tlv_length}
+    tlv_type, tlv_length = TLV_HEADER_STRUCT.unpack_from(raw_data, offset)
+    return {"TLV Type": tlv_type, "TLV Length": tlv_length}, offset + TLV_HEADER_STRUCT.size
+
+# Read a little-endian uint32 from a uint8 buffer
+@njit
+def read_uint32(buf, offset):
+    return (int(buf[offset]) | (int(buf[offset + 1]) << 8) |
+            (int(buf[offset + 2]) << 16) | (int(buf[offset + 3]) << 24))
+
+# Walk all TLV headers of a frame in compiled code
+@njit
+def index_tlvs(buf, offset, num_tlvs):
+    """Returns the type, payload offset and payload length of every complete TLV header."""
+    tlv_types = np.empty(num_tlvs, dtype=np.int64)
+    tlv_offsets = np.empty(num_tlvs, dtype=np.int64)
+    tlv_lengths = np.empty(num_tlvs, dtype=np.int64)
+
+    count = 0
+    for _ in range(num_tlvs):
+        if buf.shape[0] - offset < 8:
+            break
+        tlv_types[count] = read_uint32(buf, offset)
+        tlv_lengths[count] = read_uint32(buf, offset + 4)
+        offset += 8
+        tlv_offsets[count] = offset
+        offset += tlv_lengths[count]
+        count += 1
+
+    return tlv_types[:count], tlv_offsets[:count], tlv_lengths[:count]
 
 # Parse Type 1: Detected Points
-def parse_type_1_data(tlv_header, raw_data_list):
-    """Parses Type 1 TLV payload (Detected Points)."""
+def parse_type_1_data(tlv_header, raw_data, offset):
+    """Parses Type 1 TLV payload (Detected Points) starting at offset."""
     payload_length = tlv_header["TLV Length"]
-    point_size = 16  # Each point has 16 bytes: X, Y, Z, Doppler
-    num_points = payload_length // point_size
+    point_size = POINT_STRUCT.size  # Each point has 16 bytes: X, Y, Z, Doppler
+    # Only decode the points that are fully present in the buffer
+    num_points = max(min(payload_length, len(raw_data) - offset), 0) // point_size
 
-    detected_points = []
-    for _ in range(num_points):
-        if len(raw_data_list) < point_size:
-            #print("Warning: Insufficient data for Type 1 point.")
-            break
-        point_bytes = bytes([raw_data_list.pop(0) for _ in range(point_size)])
-        x, y, z, doppler = struct.unpack('<ffff', point_bytes)
-
-        # Calculate range profile from x, y, z
-        comp_detected_range = math.sqrt((x * x) + (y * y) + (z * z))
-
-        # Calculate azimuth from x, y
-        if y == 0:
-            detected_azimuth = 90 if x >= 0 else -90
-        else:
-            detected_azimuth = math.atan(x / y) * (180 / math.pi)
-
-        # Calculate elevation angle from x, y, z
-        if x == 0 and y == 0:
-            detected_elev_angle = 90 if z >= 0 else -90
-        else:
-            detected_elev_angle = math.atan(z / math.sqrt((x * x) + (y * y))) * (180 / math.pi)
-
-        # Append to detected points with additional info
-        detected_points.append({
-            "X [m]": x,
-            "Y [m]": y,
-            "Z [m]": z,
-            "Doppler [m/s]": doppler,
-            "Range [m]": comp_detected_range,
-            "Azimuth [deg]": detected_azimuth,
-            "Elevation Angle [deg]": detected_elev_angle
-        })
-
-    return {"Type 1 Data": detected_points}
+    # View the whole payload as an (N, 4) float32 array and compute all points at once,
+    # staying in float32 (the precision of the stored columns) instead of upcasting to float64
+    points = np.frombuffer(raw_data, dtype='<f4', count=num_points * 4, offset=offset).reshape(-1, 4)
+    x, y, z, doppler = points.T
+
+    # Calculate range profile from x, y, z
+    comp_detected_range = np.sqrt((x * x) + (y * y) + (z * z))
+
+    # Calculate azimuth from x, y (arctan2 also covers y == 0)
+    detected_azimuth = np.degrees(np.arctan2(x, y))
+
+    # Calculate elevation angle from x, y, z (arctan2 also covers x == y == 0)
+    detected_elev_angle = np.degrees(np.arctan2(z, np.hypot(x, y)))
+
+    # Store the detected points with additional info as one structured array
+    detected_points = np.empty(num_points, dtype=POINT_DTYPE)
+    detected_points["X [m]"] = x
+    detected_points["Y [m]"] = y
+    detected_points["Z [m]"] = z
+    detected_points["Doppler [m/s]"] = doppler
+    detected_points["Range [m]"] = comp_detected_range
+    detected_points["Azimuth [deg]"] = detected_azimuth
+    detected_points["Elevation Angle [deg]"] = detected_elev_angle
+
+    return {"Type 1 Data": detected_points}, offset + payload_length
 
 
 # Parse Type 2: Placeholder for additional payloads
-def parse_type_2_data(tlv_header, raw_data_list):
+def parse_type_2_data(tlv_header, raw_data, offset):
     payload_length = tlv_header["TLV Length"]
-    payload = raw_data_list[:payload_length]
-    raw_data_list[:payload_length] = []
-    return {"Type 2 Data": payload}
+    payload = raw_data[offset:offset + payload_length]
+    return {"Type 2 Data": payload}, offset + payload_length
 
 # Parse Type 3: Another placeholder for raw data
-def parse_type_3_data(tlv_header, raw_data_list):
+def parse_type_3_data(tlv_header, raw_data, offset):
     payload_length = tlv_header["TLV Length"]
-    payload = raw_data_list[:payload_length]
-    raw_data_list[:payload_length] = []
-    return {"Type 3 Data": payload}
+    payload = raw_data[offset:offset + payload_length]
+    return {"Type 3 Data": payload}, offset + payload_length
 
 # Parse Type 7: Side Info (SNR and Noise)
-def parse_type_7_data(tlv_header, raw_data_list, num_detected_obj):
+def parse_type_7_data(tlv_header, raw_data, offset, num_detected_obj):
     payload_length = tlv_header["TLV Length"]
-    expected_length = 4 * num_detected_obj  # 4 bytes per point (2 SNR, 2 Noise)
+    expected_length = SIDE_INFO_STRUCT.size * num_detected_obj  # 4 bytes per point (2 SNR, 2 Noise)
 
     if payload_length != expected_length:
         #print(f"Warning: Type 7 length mismatch. Expected {expected_length}, got {payload_length}.")
-        raw_data_list[:payload_length] = []
-        return {"Side Info": []}
+        return {"Side Info": np.empty(0, dtype=SIDE_INFO_DTYPE)}, offset + payload_length
 
-    side_info = []
-    for _ in range(num_detected_obj):
-        if len(raw_data_list) < 4:
-            #print("Warning: Insufficient data for Type 7 point.")
-            break
-        point_bytes = bytes([raw_data_list.pop(0) for _ in range(4)])
-        snr, noise = struct.unpack('<HH', point_bytes)
-        side_info.append({"SNR [dB]": snr * 0.1, "Noise [dB]": noise * 0.1})
+    # Only decode the entries that are fully present in the buffer
+    num_entries = min(num_detected_obj, max(len(raw_data) - offset, 0) // SIDE_INFO_STRUCT.size)
+    values = np.frombuffer(raw_data, dtype='<u2', count=num_entries * 2, offset=offset).reshape(-1, 2)
+
+    side_info = np.empty(num_entries, dtype=SIDE_INFO_DTYPE)
+    side_info["SNR [dB]"] = values[:, 0] * 0.1
+    side_info["Noise [dB]"] = values[:, 1] * 0.1
+
+    return {"Side Info": side_info}, offset + payload_length
+
+# Parse all TLVs of a frame into its detected points and side info
+def parse_frame_tlvs(raw_data, offset, frame_header):
+    frame_number = frame_header["Frame Number"]
+    num_detected_obj = frame_header["Num Detected Obj"]
+
+    # Compiled path: same rules as below, returns (N, 7) and (M, 2) float32 arrays
+    if fileRead_core is not None:
+        points, values, unknown_types = fileRead_core.parse_tlvs(raw_data, offset, frame_header["Num TLVs"], num_detected_obj)
+        for tlv_type in unknown_types:
+            print(f"Unknown TLV Type {tlv_type} in Frame {frame_number}. Skipping.")
+        return points.view(POINT_DTYPE).reshape(-1), values.view(SIDE_INFO_DTYPE).reshape(-1)
 
-    return {"Side Info": side_info}
+    detected_points = np.empty(0, dtype=POINT_DTYPE)
+    side_info = np.empty(0, dtype=SIDE_INFO_DTYPE)
+
+    # Locate every TLV first, then only decode the payloads we use
+    tlv_types, tlv_offsets, tlv_lengths = index_tlvs(raw_data, offset, frame_header["Num TLVs"])
+    if len(tlv_types) < frame_header["Num TLVs"]:
+        raise ValueError("Insufficient data for TLV Header")
+
+    for tlv_type, tlv_offset, tlv_length in zip(tlv_types.tolist(), tlv_offsets.tolist(), tlv_lengths.tolist()):
+        tlv_header = {"TLV Type": tlv_type, "TLV Length": tlv_length}
+
+        # Parse Type 1 - Detected Points
+        if tlv_type == 1:
+            detected_points = parse_type_1_data(tlv_header, raw_data, tlv_offset)[0]["Type 1 Data"]
+        # Parse Type 7 - Side Info
+        elif tlv_type == 7:
+            side_info = parse_type_7_data(tlv_header, raw_data, tlv_offset, num_detected_obj)[0]["Side Info"]
+        # Other types (2, 3, ...) are not needed for filtering
+        elif tlv_type not in [2, 3]:
+            print(f"Unknown TLV Type {tlv_type} in Frame {frame_number}. Skipping.")
+
+    return detected_points, side_info
+
+# Stream the log rows chunk by chunk so only CSV_CHUNK_SIZE rows are held in memory
+# (only RawData is read, as strings, so pandas neither stores the timestamps nor infers column types)
+def iter_log_rows(file_path, chunksize=CSV_CHUNK_SIZE):
+    reader = pd.read_csv(file_path, names=["Timestamp", "RawData"], skiprows=1, usecols=["RawData"],
+                         dtype={"RawData": "string"}, engine="c", chunksize=chunksize)
+    for chunk in reader:
+        yield from chunk.itertuples(index=False)
 
 # Process the log file with optional SNR and Z[m] filtering
-def process_log_file(file_path, snr_threshold=None):
+# (with return_total_rows, the number of rows read is returned too, so callers need no second pass)
+def process_log_file(file_path, snr_threshold=None, return_total_rows=False):
     frames_dict = {}
-    data = pd.read_csv(file_path, names=["Timestamp", "RawData"], skiprows=1)
+    total_rows = 0
 
-    for row_idx in range(len(data)):
+    for row_idx, row in enumerate(iter_log_rows(file_path)):
+        total_rows += 1
         try:
-            if pd.isnull(data.iloc[row_idx]['RawData']):
+            if pd.isnull(row.RawData):
                 print(f"Skipping row {row_idx + 1}: Null data.")
                 continue
 
-            raw_data_list = [int(x) for x in data.iloc[row_idx]['RawData'].split(',')]
-            frame_header = parse_frame_header(raw_data_list)
+            # Decode the row once into a contiguous uint8 buffer; parsers advance an offset into it
+            raw_data = np.fromstring(row.RawData, dtype=np.uint8, sep=',')
+            frame_header, offset = parse_frame_header(raw_data)
             frame_number = frame_header["Frame Number"]
 
-            detected_points = []
-            side_info = []
-
-            for _ in range(frame_header["Num TLVs"]):
-                tlv_header = parse_tlv_header(raw_data_list)
-                tlv_type = tlv_header["TLV Type"]
-
-                # Parse Type 1 - Detected Points
-                if tlv_type == 1:
-                    detected_points = parse_type_1_data(tlv_header, raw_data_list)["Type 1 Data"]
-                # Parse Type 7 - Side Info
-                elif tlv_type == 7:
-                    num_detected_obj = frame_header["Num Detected Obj"]
-                    side_info = parse_type_7_data(tlv_header, raw_data_list, num_detected_obj)["Side Info"]
-                # Placeholder for other types
-                elif tlv_type in [2, 3]:
-                    parse_type_2_data(tlv_header, raw_data_list)
-                else:
-                    print(f"Unknown TLV Type {tlv_type} in Frame {frame_number}. Skipping.")
-                    raw_data_list[:tlv_header["TLV Length"]] = []
-
-            # Apply Filtering (SNR, Z[m], Doppler)
-            if detected_points and side_info:
-                filtered_points = []
-                filtered_info = []
-
-                for i in range(len(detected_points)):
-                    snr = side_info[i]["SNR [dB]"]
-
-                    # Filter conditions (only if thresholds are provided)
-                    snr_valid = snr_threshold is None or snr >= snr_threshold
-
-                    if snr_valid:
-                        filtered_points.append(detected_points[i])
-                        filtered_info.append(side_info[i])
+            detected_points, side_info = parse_frame_tlvs(raw_data, offset, frame_header)
+
+            # Apply Filtering (SNR, Z[m], Doppler) as one boolean mask over all points
+            if len(detected_points) and len(side_info):
+                if len(side_info) < len(detected_points):
+                    raise ValueError("Side Info does not cover all detected points")
+                side_info = side_info[:len(detected_points)]
+
+                # Filter conditions (only if thresholds are provided)
+                mask = np.ones(len(detected_points), dtype=bool)
+                if snr_threshold is not None:
+                    mask &= side_info["SNR [dB]"] >= snr_threshold
 
                 # Save filtered data only if non-empty
-                if filtered_points:
+                if mask.any():
                     frames_dict[frame_number] = {"Frame Header": frame_header, "TLVs": []}
-                    frames_dict[frame_number]["TLVs"].append({"Type 1 Data": filtered_points})
-                    frames_dict[frame_number]["TLVs"].append({"Side Info": filtered_info})
+                    frames_dict[frame_number]["TLVs"].append({"Type 1 Data": detected_points[mask]})
+                    frames_dict[frame_number]["TLVs"].append({"Side Info": side_info[mask]})
 
         except (ValueError, IndexError) as e:
             print(f"Error parsing row {row_idx + 1}: {e}")
 
+    if return_total_rows:
+        return frames_dict, total_rows
     return frames_dict
\ No newline at end of file
@@ -1,7 +1,11 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.cluster import DBSCAN
-from matplotlib.patches import Rectangle, Ellipse
+from matplotlib.patches import Ellipse
+from matplotlib.collections import PolyCollection
+
+# Corners of a unit rectangle, scaled and shifted into every cluster's bounding box
+RECT_CORNERS = np.array([[0, 0], [1, 0], [1, 1], [0, 1]])
 
 # -------------------------------
 # FUNCTION: Cluster Points
@@ -39,13 +43,19 @@ def plot_clusters(clusters, ax):
         ax.scatter(cluster['points'][:, 0], cluster['points'][:, 1], label=f"Cluster {cid}")
         ax.scatter(centroid[0], centroid[1], c='black', marker='x')  # Centroid marker
 
-        # Draw bounding box
-        width = np.max(cluster['points'][:, 0]) - np.min(cluster['points'][:, 0])
-        height = np.max(cluster['points'][:, 1]) - np.min(cluster['points'][:, 1])
-        ax.add_patch(Rectangle(
-            (centroid[0] - width / 2, centroid[1] - height / 2), width, height,
-            fill=False, edgecolor='purple', linewidth=1.5
-        ))
-
         # Add priority labels
-        ax.text(centroid[0], centroid[1], f"P{cluster['priority']}", color='red')
\ No newline at end of file
+        ax.text(centroid[0], centroid[1], f"P{cluster['priority']}", color='red')
+
+    # Draw the bounding boxes of all clusters (centered on their centroids) as one collection
+    if clusters:
+        ax.add_collection(bbox_polys(clusters))
+
+# -------------------------------
+# FUNCTION: Bounding Boxes
+# -------------------------------
+def bbox_polys(clusters):
+    """ Build one PolyCollection with the bounding box of every cluster, centered on its centroid. """
+    centroids = np.array([cluster['centroid'][:2] for cluster in clusters.values()])
+    extents = np.array([np.ptp(cluster['points'][:, :2], axis=0) for cluster in clusters.values()])
+    corners = centroids[:, np.newaxis, :] + (RECT_CORNERS - 0.5) * extents[:, np.newaxis, :]  # (K, 4, 2)
+    return PolyCollection(corners, facecolors='none', edgecolors='purple', linewidths=1.5, joinstyle='miter')
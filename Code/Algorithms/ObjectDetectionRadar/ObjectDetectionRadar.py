@@ -1,53 +1,64 @@
 import os
-import pandas as pd
+import hashlib
 import numpy as np
-import struct
 import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider, RadioButtons
+from matplotlib.widgets import Slider
 from matplotlib.patches import Wedge
+from matplotlib.collections import LineCollection
 from matplotlib.gridspec import GridSpec
-from matplotlib.colors import ListedColormap, BoundaryNorm
+from matplotlib.axis import Axis
+from matplotlib.transforms import Bbox
+from matplotlib.colors import ListedColormap
 
 from sklearn.cluster import DBSCAN
-from sklearn.preprocessing import StandardScaler
 
 from DataProcessing.radar_utilsProcessing import *
 from DataProcessing.radar_utilsPlot import *
 
 # Create a new dictionary with frame numbers and coordinates + Doppler speed
 def extract_coordinates_with_doppler(frames_data, y_threshold=None, z_threshold=None, doppler_threshold=None):
-    coordinates_dict = {}
-
+    """
+    Filter the detected points of every frame and return them per frame as (N, 4) arrays
+    with columns X, Y, Z and Doppler. All frames are filtered at once on a single array.
+    """
+    # Stack the detected points (Type 1 data) of all frames into one array plus a frame column
+    frame_column = []
+    point_arrays = []
     for frame_num, frame_content in frames_data.items():
-        # Extract detected points for the current frame
-        points = frame_content["Detected Points"]
-
-        # Create a list of dictionaries with required fields and filters
-        coordinates = []
-        for point in points:
-            # Apply threshold filters
-            if y_threshold is not None and point["Y [m]"] < y_threshold:
-                continue  # Skip if Y is below the threshold
-            
-            if z_threshold is not None and not (z_threshold[0] <= point["Z [m]"] <= z_threshold[1]):
-                continue  # Skip if Z is outside the range
-            
-            if doppler_threshold is not None and abs(point["Doppler [m/s]"]) <= doppler_threshold:
-                continue  # Skip if Doppler speed is below the threshold
-
-            # Add the point to the list if it passes all filters
-            coordinates.append({
-                "X [m]": point["X [m]"],
-                "Y [m]": point["Y [m]"],
-                "Z [m]": point["Z [m]"],
-                "Doppler [m/s]": point["Doppler [m/s]"]
-            })
-        
-        # Add the filtered coordinates list to the dictionary
-        if coordinates:  # Only add frames with valid points
-            coordinates_dict[frame_num] = coordinates
-
-    return coordinates_dict
+        for tlv in frame_content.get("TLVs", []):
+            if "Type 1 Data" in tlv:  # Look for Type 1 Data
+                points = tlv["Type 1 Data"]
+                frame_column.append(np.full(len(points), frame_num))
+                point_arrays.append(np.column_stack(
+                    (points["X [m]"], points["Y [m]"], points["Z [m]"], points["Doppler [m/s]"])
+                ).astype(np.float32))
+                break  # Assume only one Type 1 entry per frame
+
+    if not point_arrays:
+        return {}
+
+    frame_column = np.concatenate(frame_column)
+    coordinates = np.concatenate(point_arrays)
+
+    # Apply threshold filters as one boolean mask
+    mask = np.ones(len(coordinates), dtype=bool)
+    if y_threshold is not None:
+        mask &= coordinates[:, 1] >= y_threshold  # Skip if Y is below the threshold
+    if z_threshold is not None:
+        mask &= (coordinates[:, 2] >= z_threshold[0]) & (coordinates[:, 2] <= z_threshold[1])  # Skip if Z is outside the range
+    if doppler_threshold is not None:
+        mask &= np.abs(coordinates[:, 3]) > doppler_threshold  # Skip if Doppler speed is below the threshold
+
+    frame_column = frame_column[mask]
+    coordinates = coordinates[mask]
+
+    # Sort by frame and split into per-frame views (only frames with valid points are kept)
+    order = np.argsort(frame_column, kind="stable")
+    frame_column = frame_column[order]
+    coordinates = coordinates[order]
+    frame_numbers, starts = np.unique(frame_column, return_index=True)
+
+    return dict(zip(frame_numbers.tolist(), np.split(coordinates, starts[1:])))
 
 # Function to draw the sensor's detection area as a wedge
 def draw_sensor_area(ax, sensor_origin=(0, -1), azimuth=60, max_distance=12):
@@ -85,41 +96,106 @@ def draw_sensor_area(ax, sensor_origin=(0, -1), azimuth=60, max_distance=12):
     # Optionally, add the sensor's location as a point
     ax.scatter(*sensor_origin, color="green", label="Sensor Location")
 
-def calculate_occupancy_grid(points, x_limits, y_limits, grid_spacing):
+def occupancy_grid_edges(x_limits, y_limits, grid_spacing):
     """
-    Calculate an occupancy grid for the given points.
+    Calculate the cell edges of the occupancy grid along X and Y.
 
     Parameters:
-        points (list of tuples): List of (x, y) or (x, y, z) coordinates.
         x_limits (tuple): The x-axis limits as (xmin, xmax).
         y_limits (tuple): The y-axis limits as (ymin, ymax).
         grid_spacing (int): Spacing between grid cells.
 
     Returns:
-        np.ndarray: 2D occupancy grid.
+        tuple: (x_edges, y_edges); the grid shape is (len(x_edges) - 1, len(y_edges) - 1).
     """
-    # Calculate grid size
     x_bins = int((x_limits[1] - x_limits[0]) / grid_spacing)
     y_bins = int((y_limits[1] - y_limits[0]) / grid_spacing)
 
-    # Initialize the grid
-    occupancy_grid = np.zeros((x_bins, y_bins))
+    # The edges match the cell indexing (x - xmin) // grid_spacing
+    x_edges = x_limits[0] + grid_spacing * np.arange(x_bins + 1)
+    y_edges = y_limits[0] + grid_spacing * np.arange(y_bins + 1)
+    return x_edges, y_edges
 
-    # Populate the grid
-    for point in points:
-        if len(point) == 3:
-            x, y, _ = point  # Unpack x, y, z
-        elif len(point) == 2:
-            x, y = point  # Unpack x, y only
-        else:
-            raise ValueError(f"Point format not supported: {point}")
+def calculate_occupancy_grid(points, x_limits, y_limits, grid_spacing, edges=None):
+    """
+    Calculate an occupancy grid for the given points.
+
+    Parameters:
+        points (list of tuples or np.ndarray): (x, y) or (x, y, z) coordinates.
+        x_limits (tuple): The x-axis limits as (xmin, xmax).
+        y_limits (tuple): The y-axis limits as (ymin, ymax).
+        grid_spacing (int): Spacing between grid cells.
+        edges (tuple): Precomputed (x_edges, y_edges) from occupancy_grid_edges (optional).
+
+    Returns:
+        np.ndarray: 2D occupancy grid.
+    """
+    # Calculate the cell edges (unless the caller already did)
+    x_edges, y_edges = edges if edges is not None else occupancy_grid_edges(x_limits, y_limits, grid_spacing)
 
-        if x_limits[0] <= x < x_limits[1] and y_limits[0] <= y < y_limits[1]:
-            x_idx = int((x - x_limits[0]) / grid_spacing)
-            y_idx = int((y - y_limits[0]) / grid_spacing)
-            occupancy_grid[x_idx, y_idx] += 1
+    # Radar coordinates are float32; keep them (and the grid) in float32 instead of upcasting to float64
+    points = np.asarray(points, dtype=np.float32)
+    if points.size == 0:
+        return np.zeros((len(x_edges) - 1, len(y_edges) - 1), dtype=np.float32)
+    if points.ndim != 2 or points.shape[1] not in (2, 3):
+        raise ValueError(f"Point format not supported: {points.shape}")
 
-    return occupancy_grid
+    # Bin all points at once
+    occupancy_grid, _, _ = np.histogram2d(points[:, 0], points[:, 1], bins=[x_edges, y_edges])
+
+    return occupancy_grid.astype(np.float32)
+
+def get_cache_path(file_path, *params, cache_dir=None):
+    """
+    Get the cache file of a log file. The cache key covers the log's path and modification
+    time as well as the given processing parameters, so editing either invalidates the cache.
+
+    Parameters:
+        file_path (str): Path of the CSV log file.
+        *params: Parameters the cached data depends on (thresholds, grid limits, ...).
+        cache_dir (str): Directory of the cache files (default: "cache" next to this script).
+
+    Returns:
+        str: Path of the .npz cache file.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+    file_path = os.path.abspath(file_path)
+    key = hashlib.sha1(repr((file_path, os.path.getmtime(file_path), params)).encode()).hexdigest()[:16]
+    log_name = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir, f"{log_name}_{key}.npz")
+
+def save_frames_cache(cache_path, frames_data, frame_grids):
+    """
+    Save the per-frame points and occupancy grids as one .npz file.
+
+    Parameters:
+        cache_path (str): Path of the .npz cache file.
+        frames_data (dict): Frame number -> (N, 4) array of X, Y, Z, Doppler.
+        frame_grids (dict): Frame number -> occupancy grid of that frame.
+    """
+    frames = sorted(frames_data)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    np.savez_compressed(
+        cache_path,
+        frames=np.array(frames, dtype=np.int64),
+        counts=np.array([len(frames_data[frame]) for frame in frames], dtype=np.int64),
+        points=np.concatenate([frames_data[frame] for frame in frames]) if frames else np.empty((0, 4), dtype=np.float32),
+        grids=np.stack([frame_grids[frame] for frame in frames]) if frames else np.empty((0, 0, 0), dtype=np.float32)
+    )
+
+def load_frames_cache(cache_path):
+    """
+    Load the per-frame points and occupancy grids saved by save_frames_cache.
+
+    Returns:
+        tuple: (frames_data, frame_grids) in the same layout they were saved in.
+    """
+    with np.load(cache_path) as cached:
+        frames = cached["frames"].tolist()
+        points = np.split(cached["points"], np.cumsum(cached["counts"])[:-1]) if frames else []
+        grids = cached["grids"]
+    return dict(zip(frames, points)), dict(zip(frames, grids))
 
 def dbscan_clustering(data, eps=1.0, min_samples=3):
     """
@@ -151,7 +227,7 @@ def dbscan_clustering(data, eps=1.0, min_samples=3):
 
 
 # Plotting function
-def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, eps=0.5, min_samples=5, history_frames=5):
+def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, eps=0.5, min_samples=5, history_frames=5, frame_grids=None):
     """
     Create an interactive plot with two subplots, a slider, and radio buttons,
     including a grid with customizable spacing. Annotates points in ax2 with Doppler values.
@@ -162,53 +238,103 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         y_limits (tuple): The y-axis limits as (ymin, ymax).
         grid_spacing (int): Spacing between grid lines (default is 1).
         history_frames (int): Number of frames for history-based visualization.
+        frame_grids (dict): Precomputed occupancy grid per frame, e.g. from load_frames_cache (optional).
     """
 
     # Helper function to draw the grid with specified spacing
+    # (all grid lines form one LineCollection instead of one Line2D per line)
     def draw_grid(ax, x_limits, y_limits, grid_spacing):
         x_ticks = range(int(np.floor(x_limits[0])), int(np.ceil(x_limits[1])) + 1, grid_spacing)
         y_ticks = range(int(np.floor(y_limits[0])), int(np.ceil(y_limits[1])) + 1, grid_spacing)
-        for x in x_ticks:
-            ax.plot([x, x], y_limits, linestyle='--', color='gray', linewidth=0.5)
-        for y in y_ticks:
-            ax.plot(x_limits, [y, y], linestyle='--', color='gray', linewidth=0.5)
+        segs = [[(x, y_limits[0]), (x, y_limits[1])] for x in x_ticks] + \
+               [[(x_limits[0], y), (x_limits[1], y)] for y in y_ticks]
+        ax.add_collection(LineCollection(segs, linestyles='--', colors='gray', linewidths=0.5))
+    # Grid edges and shape are fixed for the whole plot, so compute them once
+    grid_edges = occupancy_grid_edges(x_limits, y_limits, grid_spacing)
+    grid_shape = (len(grid_edges[0]) - 1, len(grid_edges[1]) - 1)
+
+    # Per-frame occupancy grids, computed once per frame and reused across slider ticks
+    frame_grids = dict(frame_grids) if frame_grids is not None else {}
+
+    # Helper function to get (and cache) the occupancy grid of a single frame
+    def get_frame_grid(frame):
+        if frame not in frame_grids:
+            coordinates = frames_data.get(frame, np.empty((0, 4), dtype=np.float32))  # Retrieve the frame's points
+            frame_grids[frame] = calculate_occupancy_grid(coordinates[:, :2], x_limits, y_limits, grid_spacing, grid_edges)
+        return frame_grids[frame]
+
+    # Running sum over the current history window [start, end), plus the buffer its clipped copy is written to
+    history_window = {"start": None, "end": None,
+                      "sum": np.zeros(grid_shape, dtype=np.float32), "clipped": np.zeros(grid_shape, dtype=np.float32)}
+
     # Helper function to calculate cumulative occupancy over history
-    def calculate_cumulative_occupancy(frames_data, frame_idx, x_limits, y_limits, grid_spacing, history_frames):
+    def calculate_cumulative_occupancy(frame_idx):
         """
         Calculate a cumulative occupancy grid over the last `history_frames` frames.
 
+        The running sum of the previous call is updated by subtracting the frames that
+        left the window and adding the ones that entered it, so scrubbing the slider
+        one frame at a time only touches two grids.
+
         Parameters:
-            frames_data (dict): Frame data dictionary.
             frame_idx (int): Current frame index.
-            x_limits (tuple): X-axis limits.
-            y_limits (tuple): Y-axis limits.
-            grid_spacing (int): Spacing between grid cells.
-            history_frames (int): Number of frames to include in the history.
 
         Returns:
             np.ndarray: Cumulative occupancy grid.
         """
-        cumulative_grid = np.zeros((int((x_limits[1] - x_limits[0]) / grid_spacing),
-                                    int((y_limits[1] - y_limits[0]) / grid_spacing)))
+        start = max(1, frame_idx - history_frames + 1)
+        end = frame_idx + 1
+        prev_start, prev_end = history_window["start"], history_window["end"]
+
+        cumulative_grid = history_window["sum"]
+        if prev_start is None or start >= prev_end or end <= prev_start:
+            # No overlap with the previous window: rebuild it in place
+            cumulative_grid.fill(0)
+            for i in range(start, end):
+                cumulative_grid += get_frame_grid(i)
+        else:
+            for i in range(prev_start, start):  # Frames dropped at the front
+                cumulative_grid -= get_frame_grid(i)
+            for i in range(start, prev_start):  # Frames added at the front
+                cumulative_grid += get_frame_grid(i)
+            for i in range(prev_end, end):  # Frames added at the back
+                cumulative_grid += get_frame_grid(i)
+            for i in range(end, prev_end):  # Frames dropped at the back
+                cumulative_grid -= get_frame_grid(i)
 
-        for i in range(max(1, frame_idx - history_frames + 1), frame_idx + 1):
-            coordinates = frames_data.get(i, [])  # Retrieve the list of points
-            # Extract X and Y coordinates as tuples
-            points = [(point["X [m]"], point["Y [m]"]) for point in coordinates]
-            # Update the cumulative grid
-            occupancy_grid = calculate_occupancy_grid(points, x_limits, y_limits, grid_spacing)
-            cumulative_grid += occupancy_grid
+        history_window.update(start=start, end=end)
 
         # Normalize cumulative grid to [0, 1] (optional for visualization purposes)
-        cumulative_grid = np.clip(cumulative_grid, 0, 10)  # Limit max values to 10
-        return cumulative_grid
+        return np.clip(cumulative_grid, 0, 10, out=history_window["clipped"])  # Limit max values to 10
+
+    # DBSCAN parameters of Dataset 2
+    eps2 = 0.4
+    min_samples2 = 2
+
+    # Per-frame DBSCAN labels and occupancy grids of the clustered points, computed once per frame
+    frame_clusters = {}
+
+    # Helper function to get (and cache) the clustering of a single frame
+    def get_frame_clusters(frame):
+        """
+        Returns the DBSCAN labels of the frame's points and the occupancy grid of its
+        clustered (non-noise) points, or None for the grid if every point is noise.
+        """
+        if frame not in frame_clusters:
+            coordinates = frames_data.get(frame, np.empty((0, 4), dtype=np.float32))[:, :2]
+            labels = dbscan_clustering(coordinates, eps=eps2, min_samples=min_samples2)
+            clustered_points = coordinates[labels != -1]
+            clustered_grid = None
+            if clustered_points.size:
+                clustered_grid = calculate_occupancy_grid(clustered_points, x_limits, y_limits, grid_spacing, grid_edges)
+            frame_clusters[frame] = (labels, clustered_grid)
+        return frame_clusters[frame]
     # Helper function 
     def create_custom_colormap():
         """
         Create a custom colormap for the occupancy grid.
         Returns:
             cmap: Custom colormap with a specific background color.
-            norm: Normalizer to map data values to colormap levels.
         """
         # Define colors: First is the background color, followed by density colors
         colors = [
@@ -221,11 +347,7 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         ]
         cmap = ListedColormap(colors)
 
-        # Define boundaries for each color bin
-        boundaries = [0, 1, 2, 3, 4, 5, np.inf]  # Bins for densities
-        norm = BoundaryNorm(boundaries, cmap.N, clip=True)
-
-        return cmap, norm
+        return cmap
 
     # Create the figure and subplots
     fig = plt.figure(figsize=(18, 14))
@@ -252,22 +374,31 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
     for ax in [ax1_1, ax1_2, ax1_3, ax1_4]:
         draw_grid(ax, x_limits, y_limits, grid_spacing)
 
-    # Get the custom colormap and normalizer
-    cmap, norm = create_custom_colormap()
+    # Get the custom colormap
+    cmap = create_custom_colormap()
 
     # Initialize cumulative plots
     (line1_1,) = ax1_1.plot([], [], 'o', label="Dataset 1: Cumulative Data")
 
+    # All points in frame order, plus the number of points up to the end of each frame,
+    # so the cumulative data of any frame is a single slice
+    cumulative_frames = np.array(sorted(frame for frame in frames_data if frame >= 1))
+    cumulative_points1 = np.concatenate([frames_data[frame] for frame in cumulative_frames] + [np.empty((0, 4), dtype=np.float32)])
+    cumulative_x1 = cumulative_points1[:, 0]
+    cumulative_y1 = cumulative_points1[:, 1]
+    cumulative_ends1 = np.cumsum([len(frames_data[frame]) for frame in cumulative_frames], dtype=int)
+
     for ax, title in zip([ax1_1], ["Point Cloud"]):
         ax.set_xlim(*x_limits)
         ax.set_ylim(*y_limits)
+        ax.set_xlabel("X [m]")
+        ax.set_ylabel("Y [m]")
         ax.set_title(f"{title} - Cumulative Data")
 
     # Initialize per-frame plots
     for ax, title in zip([ax1_2], ["Point Cloud"]):
         ax.set_xlim(*x_limits)
         ax.set_ylim(*y_limits)
-        ax.legend(["Dots Per Frame"], loc="upper left")
         ax.set_title(f"{title} - Per Frame Data")
 
     # Initialize occupancy grids
@@ -282,6 +413,24 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         ax.set_ylim(*y_limits)
         ax.set_title(f"{title} - History-Based Grid")
 
+    # Dataset 1 artists are created once; update() only refreshes their data
+    empty_grid = np.zeros(grid_shape, dtype=np.float32).T
+    (frame_points1,) = ax1_2.plot([], [], 'ro', label="Current Frame")
+    ax1_2.legend(handles=[frame_points1], loc="upper left")
+    # Pool of Doppler annotations sized to the densest frame; update() only moves, rewrites and hides them
+    max_points1 = max((len(points) for points in frames_data.values()), default=0)
+    doppler_labels1 = [
+        ax1_2.text(0, 0, "", fontsize=8, ha="center", va="bottom", color="blue", visible=False)
+        for _ in range(max_points1)
+    ]
+    occupancy_image1 = ax1_3.imshow(empty_grid, extent=(*x_limits, *y_limits), origin='lower', cmap=cmap, aspect='auto')
+    history_image1 = ax1_4.imshow(empty_grid, extent=(*x_limits, *y_limits), origin='lower', cmap=cmap, aspect='auto')
+
+    for ax in [ax1_2, ax1_3, ax1_4]:
+        ax.set_xlabel("X [m]")
+        ax.set_ylabel("Y [m]")
+        draw_sensor_area(ax)
+
     for ax, title in zip([ax2_1], ["DBSCAN applied"]):
         ax.set_xlim(*x_limits)
         ax.set_ylim(*y_limits)
@@ -307,132 +456,105 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         ax.set_ylim(*y_limits)
         ax.set_title(f"{title} - History-Based Grid")
 
+    # Dataset 2 artists are created once as well; update() only refreshes their data
+    cumulative_clusters2 = ax2_1.scatter([], [], c='purple', alpha=0.5, label="Cumulative Clusters")
+    ax2_1.legend()
+    frame_clusters2 = ax2_2.scatter([], [])
+    occupancy_image2 = ax2_3.imshow(empty_grid, extent=(*x_limits, *y_limits), origin='lower', cmap=cmap, aspect='auto', visible=False)
+    history_image2 = ax2_4.imshow(empty_grid, extent=(*x_limits, *y_limits), origin='lower', cmap=cmap, aspect='auto')
+
+    for ax in [ax2_2, ax2_3, ax2_4]:
+        draw_grid(ax, x_limits, y_limits, grid_spacing)
+        draw_sensor_area(ax)
+
+    # Last frame drawn, so slider events that round to the same frame are skipped
+    slider_state = {"last": None}
+
     # Update function
     def update(val):
         # Get the current slider value
         frame_idx = int(slider_idx.val)
+        if frame_idx == slider_state["last"]:
+            return
+        slider_state["last"] = frame_idx
 
         # Initialize a persistent cumulative grid for ax2_4
         if not hasattr(update, "cumulative_grid"):
-                x_bins = int((x_limits[1] - x_limits[0]) / grid_spacing)
-                y_bins = int((y_limits[1] - y_limits[0]) / grid_spacing)
-                update.cumulative_grid = np.zeros((x_bins, y_bins))  # Initialize cumulative grid
+            update.cumulative_grid = np.zeros(grid_shape, dtype=np.float32)  # Initialize cumulative grid
 
 
         """
         Dataset 1
         """
-        # Initialize lists to store X, Y coordinates and Doppler values for the current frame
-        coordinates1 = []
-        doppler1 = []
-
-        # Get the list of points for the current frame
-        current_frame_points = frames_data.get(frame_idx, [])
+        # Get the points (X, Y, Z, Doppler) for the current frame
+        current_frame_points = frames_data.get(frame_idx, np.empty((0, 4), dtype=np.float32))
 
         # Extract X, Y coordinates and Doppler values
-        for point in current_frame_points:
-            x_coord = point["X [m]"]
-            y_coord = point["Y [m]"]
-            doppler_speed = point["Doppler [m/s]"]
-
-            coordinates1.append((x_coord, y_coord))
-            doppler1.append(doppler_speed)
+        coordinates1 = current_frame_points[:, :2]
+        doppler1 = current_frame_points[:, 3]
 
         # Check if the current frame has no valid points
-        if not coordinates1:
+        if len(coordinates1) == 0:
             print(f"Frame {frame_idx} for Dataset 1 has no points after filtering.")
+            redraw()  # Only the slider moved
             return
 
         # -----------------------------------------
         # Ax1_1: Update cumulative data for dataset 1
         # -----------------------------------------
-        x1, y1 = [], []
-        for frame in range(1, frame_idx + 1):  # Accumulate data up to the current frame
-            historical_points = frames_data.get(frame, [])  # Retrieve historical points
-            for point in historical_points:
-                x1.append(point["X [m]"])
-                y1.append(point["Y [m]"])
+        frames_so_far = np.searchsorted(cumulative_frames, frame_idx, side="right")  # Frames 1..frame_idx
+        num_points = cumulative_ends1[frames_so_far - 1] if frames_so_far else 0
 
-        line1_1.set_data(x1, y1)  # Update the cumulative plot
-        ax1_1.set_xlabel("X [m]")
-        ax1_1.set_ylabel("Y [m]")
+        line1_1.set_data(cumulative_x1[:num_points], cumulative_y1[:num_points])  # Update the cumulative plot
 
         # -----------------------------------------
         # Ax1_2: Update current frame data for dataset 1
         # -----------------------------------------
-        ax1_2.cla()
-        ax1_2.set_xlim(*x_limits)
-        ax1_2.set_ylim(*y_limits)
-        draw_grid(ax1_2, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax1_2)
-
         # Extract X and Y coordinates for the current frame
-        x1 = [coord[0] for coord in coordinates1]
-        y1 = [coord[1] for coord in coordinates1]
-        ax1_2.plot(x1, y1, 'ro')  # Plot current frame points
-
-        # Annotate Doppler values on the plot
-        for (x, y), d in zip(coordinates1, doppler1):
-            ax1_2.text(x, y, f"{d:.2f}", fontsize=8, ha="center", va="bottom", color="blue")
+        x1 = coordinates1[:, 0]
+        y1 = coordinates1[:, 1]
+        frame_points1.set_data(x1, y1)  # Plot current frame points
+
+        # Annotate Doppler values on the plot (reusing the pooled labels, hiding the unused ones)
+        for label, (x, y), d in zip(doppler_labels1, coordinates1, doppler1):
+            label.set_position((x, y))
+            label.set_text(f"{d:.2f}")
+            label.set_visible(True)
+        for label in doppler_labels1[len(coordinates1):]:
+            label.set_visible(False)
 
         ax1_2.set_title(f"Frame {frame_idx} - Dataset 1")
-        ax1_2.legend(["Current Frame"], loc="upper left")
-        ax1_2.set_xlabel("X [m]")
-        ax1_2.set_ylabel("Y [m]")
 
         # -----------------------------------------
         # Ax1_3: Update Occupancy Grid for Dataset 1
         # -----------------------------------------
-        occupancy_grid1 = calculate_occupancy_grid(coordinates1, x_limits, y_limits, grid_spacing)
-        ax1_3.cla()
-        ax1_3.imshow(occupancy_grid1.T, extent=(*x_limits, *y_limits), origin='lower', cmap=cmap, aspect='auto')
+        occupancy_grid1 = get_frame_grid(frame_idx)
+        occupancy_image1.set_data(occupancy_grid1.T)
+        occupancy_image1.autoscale()
         ax1_3.set_title(f"Occupancy Grid - Dataset 1 (Frame {frame_idx})")
-        ax1_3.set_xlabel("X [m]")
-        ax1_3.set_ylabel("Y [m]")
-        draw_grid(ax1_3, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax1_3)
 
         # -----------------------------------------
         # Ax1_4: Update History-Based Occupancy Grid for Dataset 1
         # -----------------------------------------
-        cumulative_grid1 = calculate_cumulative_occupancy(
-            frames_data, frame_idx, x_limits, y_limits, grid_spacing, history_frames
-        )
-        ax1_4.cla()
-        ax1_4.imshow(cumulative_grid1.T, extent=(*x_limits, *y_limits), origin='lower', cmap=cmap, aspect='auto')
+        cumulative_grid1 = calculate_cumulative_occupancy(frame_idx)
+        history_image1.set_data(cumulative_grid1.T)
+        history_image1.autoscale()
         ax1_4.set_title(f"History Grid - Dataset 1 (Last {history_frames} Frames)")
-        ax1_4.set_xlabel("X [m]")
-        ax1_4.set_ylabel("Y [m]")
-        draw_grid(ax1_4, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax1_4)
 
         """
         Dataset 2 (with DBSCAN clustering)
         """
-        eps2 = 0.4
-        min_samples2 = 2
-
-        # Initialize lists to store X, Y, and Z coordinates
-        coordinates2 = []
-
-        # Get the list of points for the current frame
-        current_frame_points = frames_data.get(frame_idx, [])
-
-        # Extract X, Y, and Z coordinates for clustering
-        for point in current_frame_points:
-            x_coord = point["X [m]"]
-            y_coord = point["Y [m]"]
-            coordinates2.append([x_coord, y_coord])
+        # Extract X and Y coordinates of the current frame for clustering
+        coordinates2 = current_frame_points[:, :2]
 
         # Check if the current frame has no valid points
-        if not coordinates2:
+        if len(coordinates2) == 0:
             print(f"Frame {frame_idx} for Dataset 2 has no points after filtering.")
+            redraw([ax1_1, ax1_2, ax1_3, ax1_4])
             return
 
-        # Prepare DataFrame for clustering
-        # Prepare DataFrame for clustering
-        df = pd.DataFrame(coordinates2, columns=["X [m]", "Y [m]"])
-        labels = dbscan_clustering(df, eps=eps2, min_samples=min_samples2)
+        # Cluster labels (and clustered occupancy grid) of the frame
+        labels, frame_grid = get_frame_clusters(frame_idx)
 
         # -----------------------------------------
         # Ax2_1: Update cumulative clusters
@@ -440,37 +562,29 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         if not hasattr(update, "cumulative_clusters"):
             update.cumulative_clusters = {"x": [], "y": []}  # Initialize cumulative clusters
 
-        for cluster_label in set(labels):
+        for cluster_label in np.unique(labels):
             if cluster_label != -1:  # Ignore noise points
-                cluster_points = df.loc[labels == cluster_label, ["X [m]", "Y [m]"]].values
+                cluster_points = coordinates2[labels == cluster_label]
                 update.cumulative_clusters["x"].extend(cluster_points[:, 0])
                 update.cumulative_clusters["y"].extend(cluster_points[:, 1])
 
-        ax2_1.cla()
-        ax2_1.scatter(update.cumulative_clusters["x"], update.cumulative_clusters["y"], c='purple', alpha=0.5, label="Cumulative Clusters")
-        ax2_1.set_xlim(*x_limits)
-        ax2_1.set_ylim(*y_limits)
+        cumulative_clusters2.set_offsets(np.column_stack((update.cumulative_clusters["x"], update.cumulative_clusters["y"])))
         ax2_1.set_title("Cumulative Clusters")
-        ax2_1.legend()
 
         # -----------------------------------------
         # Ax2_2: Current frame clusters
         # -----------------------------------------
-        ax2_2.cla()
-        ax2_2.set_xlim(*x_limits)
-        ax2_2.set_ylim(*y_limits)
-        draw_grid(ax2_2, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax2_2)
-
         unique_labels = set(labels)
         colors = [plt.cm.Spectral(each) for each in np.linspace(0, 1, len(unique_labels))]
 
+        # One scatter for all points, colored per cluster
+        point_colors = np.empty((len(labels), 4))
         for k, col in zip(unique_labels, colors):
             if k == -1:  # Noise points
                 col = [0, 0, 0, 1]  # Black for noise
-            class_member_mask = (labels == k)
-            xy = df[class_member_mask][["X [m]", "Y [m]"]].values
-            ax2_2.scatter(xy[:, 0], xy[:, 1], c=[col], label=f"Cluster {k}")
+            point_colors[labels == k] = col
+        frame_clusters2.set_offsets(coordinates2)
+        frame_clusters2.set_facecolor(point_colors)
 
         ax2_2.set_title(f"Frame {frame_idx} - DBSCAN Clusters")
         #ax2_2.legend()
@@ -478,61 +592,33 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         # -----------------------------------------
         # Ax2_3: Current frame occupancy grid for clusters
         # -----------------------------------------
-        ax2_3.cla()
-        ax2_3.set_xlim(*x_limits)
-        ax2_3.set_ylim(*y_limits)
-
-        # Filter only clustered points
-        clustered_points = df[labels != -1][["X [m]", "Y [m]"]].values
-        if clustered_points.size == 0:
-            pass  # Do nothing if there are no clustered points
+        # Occupancy grid of the clustered points (cached per frame)
+        if frame_grid is None:
+            occupancy_image2.set_visible(False)  # Show no grid if there are no clustered points
         else:
-            # Calculate the occupancy grid for clustered points
-            frame_grid = calculate_occupancy_grid(clustered_points, x_limits, y_limits, grid_spacing)
-
             # Update the cumulative grid
-            if not hasattr(update, "cumulative_grid"):
-                update.cumulative_grid = np.zeros_like(frame_grid)  # Initialize cumulative grid
             update.cumulative_grid += frame_grid
 
             # Plot the current frame's occupancy grid
-            ax2_3.imshow(
-                frame_grid.T,  # Transpose for proper orientation
-                extent=(*x_limits, *y_limits),
-                origin="lower",
-                cmap=cmap,
-                aspect="auto"
-            )
+            occupancy_image2.set_data(frame_grid.T)  # Transpose for proper orientation
+            occupancy_image2.autoscale()
+            occupancy_image2.set_visible(True)
 
         ax2_3.set_title("Clustered Occupancy Grid")
-        draw_grid(ax2_3, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax2_3)
 
         # -----------------------------------------
         # Ax2_4: Cumulative history-based clustered occupancy grid
         # -----------------------------------------
-        ax2_4.cla()
-        ax2_4.set_xlim(*x_limits)
-        ax2_4.set_ylim(*y_limits)
-
         # Normalize the cumulative grid for better visualization
         cumulative_grid_normalized = np.clip(update.cumulative_grid, 0, 10)
 
         # Plot the cumulative grid
-        ax2_4.imshow(
-            cumulative_grid_normalized.T,  # Transpose for proper orientation
-            extent=(*x_limits, *y_limits),
-            origin="lower",
-            cmap=cmap,
-            aspect="auto"
-        )
+        history_image2.set_data(cumulative_grid_normalized.T)  # Transpose for proper orientation
+        history_image2.autoscale()
 
         ax2_4.set_title("Cumulative Occupancy Grid")
-        draw_grid(ax2_4, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax2_4)
-
 
-        fig.canvas.draw_idle()
+        redraw(list(changing))
     # Add slider
     # [left, bottom, width, height]
     ax_slider = plt.axes([0.25, 0.10, 0.65, 0.03])  # Slider for Dataset 1
@@ -546,6 +632,53 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         valstep=1
     )
 
+    # Blitting: the artists update() changes, the slider, and the static artists stacked above them
+    # (grid, wedge and spines over the images, legends) are animated; everything underneath stays in
+    # the background saved after every full draw, and redraw() blits only the axes that changed
+    changing = {
+        ax1_1: [line1_1], ax1_2: [frame_points1, *doppler_labels1], ax1_3: [occupancy_image1], ax1_4: [history_image1],
+        ax2_1: [cumulative_clusters2], ax2_2: [frame_clusters2], ax2_3: [occupancy_image2], ax2_4: [history_image2],
+    }
+    blit = {"background": None, "artists": {}, "regions": {}}
+    if fig.canvas.supports_blit:
+        for ax, artists in changing.items():
+            # Same order as a full draw (titles, rewritten by update(), come last); the ticks lie
+            # outside the data area, so they stay static
+            children = sorted((artist for artist in ax.get_children() if artist is not ax.patch),
+                              key=lambda artist: artist.get_zorder())
+            first = min(children.index(artist) for artist in artists)
+            blit["artists"][ax] = [artist for artist in children[first:] if not isinstance(artist, Axis)]
+        blit["artists"][ax_slider] = [ax_slider]
+        for artists in blit["artists"].values():
+            for artist in artists:
+                artist.set_animated(True)
+        slider_idx.drawon = False  # The slider is drawn by redraw() instead of a full draw
+
+        def on_draw(event):
+            blit["background"] = fig.canvas.copy_from_bbox(fig.bbox)
+            for artists in blit["artists"].values():
+                for artist in artists:
+                    fig.draw_artist(artist)
+        fig.canvas.mpl_connect("draw_event", on_draw)
+
+    # Helper function to show the updated artists of the given axes (and the slider)
+    def redraw(axes=()):
+        if blit["background"] is None:
+            fig.canvas.draw_idle()  # No blitting support, or no full draw yet
+            return
+        fig.canvas.restore_region(blit["background"])
+        for artists in blit["artists"].values():
+            for artist in artists:
+                fig.draw_artist(artist)
+        renderer = fig.canvas.get_renderer()
+        for ax in [*axes, ax_slider]:
+            # Titles, Doppler labels and slider labels stick out of the axes, and may have been wider before
+            texts = [text for text in [ax.title, *ax.texts] if text.get_visible()]
+            region = Bbox.union([ax.bbox, *(text.get_window_extent(renderer) for text in texts)]).padded(2)
+            fig.canvas.blit(Bbox.union([region, blit["regions"].get(ax, region)]))
+            blit["regions"][ax] = region
+        fig.canvas.flush_events()
+
     slider_idx.on_changed(update)
 
     plt.show()
@@ -559,16 +692,33 @@ file_path = os.path.normpath(os.path.join(script_dir, relative_path))
 
 y_threshold = 0.0  # Disregard points with Y < num
 z_threshold = (0, 3.0)
-doppler_threshold = 0.0 # Disregard points with doppler < num
-
-print(f"Processing file: {file_path}")
-frames_data = process_log_file(file_path, snr_threshold=15, z_min=-0.30, z_max=2.0, doppler_threshold=0.1)
-
-# Extract new dictionary with frame numbers and coordinates + Doppler
-frames_data = extract_coordinates_with_doppler(frames_data, y_threshold, z_threshold, doppler_threshold)
+doppler_threshold = 0.1 # Disregard points with |doppler| < num (applied once, while parsing the log)
+
+x_limits = (-8, 8)
+y_limits = (0, 15)
+grid_spacing = 1
+
+# Reuse the frames and occupancy grids of a previous run on the same (unchanged) log
+cache_path = get_cache_path(file_path, 15, -0.30, 2.0, doppler_threshold, y_threshold, z_threshold,
+                            x_limits, y_limits, grid_spacing)
+if os.path.exists(cache_path):
+    print(f"Loading cached frames: {cache_path}")
+    frames_data, frame_grids = load_frames_cache(cache_path)
+else:
+    print(f"Processing file: {file_path}")
+    frames_data = process_log_file(file_path, snr_threshold=15, z_min=-0.30, z_max=2.0, doppler_threshold=doppler_threshold)
+
+    # Extract new dictionary with frame numbers and coordinates + Doppler (already Doppler filtered)
+    frames_data = extract_coordinates_with_doppler(frames_data, y_threshold, z_threshold)
+
+    # Occupancy grid of every frame, saved with the frames for the next run
+    grid_edges = occupancy_grid_edges(x_limits, y_limits, grid_spacing)
+    frame_grids = {frame: calculate_occupancy_grid(points[:, :2], x_limits, y_limits, grid_spacing, grid_edges)
+                   for frame, points in frames_data.items()}
+    save_frames_cache(cache_path, frames_data, frame_grids)
 
 """
 Having a legen of Cluster -1, means no cluster has been created
 Same as having Grey Clusters
 """
-create_interactive_plots(frames_data, x_limits=(-8, 8), y_limits=(0, 15), eps=0.4, min_samples=4, history_frames = 10)
\ No newline at end of file
+create_interactive_plots(frames_data, x_limits=x_limits, y_limits=y_limits, grid_spacing=grid_spacing, eps=0.4, min_samples=4, history_frames = 10, frame_grids=frame_grids)
\ No newline at end of file
@@ -1,24 +1,73 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
-import struct
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
 from matplotlib.patches import Wedge
+from matplotlib.collections import LineCollection
 from matplotlib.gridspec import GridSpec
-from matplotlib.colors import ListedColormap, BoundaryNorm
-from mpl_toolkits.mplot3d import Axes3D
+from matplotlib.colors import ListedColormap
 
 
 from sklearn.cluster import DBSCAN
-from sklearn.preprocessing import StandardScaler
+from sklearn.neighbors import radius_neighbors_graph
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # numba is optional: fall back to plain Python functions
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
+try:
+    # pyarrow is optional: it parses the CSV with multiple threads, otherwise pandas' C parser is used
+    import pyarrow
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+try:
+    # cuML is optional: very large clouds are clustered on the GPU when it is available
+    import cupy as cp
+    from cuml.cluster import DBSCAN as cuDBSCAN
+except ImportError:
+    cuDBSCAN = None
+
+# Binary layouts (little-endian) of the frame header and one detected point
+FRAME_HEADER_DTYPE = np.dtype([
+    ("Magic Word", "<u8"),
+    ("Version", "<u4"),
+    ("Total Packet Length", "<u4"),
+    ("Platform", "<u4"),
+    ("Frame Number", "<u4"),
+    ("Time [in CPU Cycles]", "<u4"),
+    ("Num Detected Obj", "<u4"),
+    ("Num TLVs", "<u4"),
+    ("Subframe Number", "<u4")
+])
+POINT_DTYPE = np.dtype([("X [m]", "<f4"), ("Y [m]", "<f4"), ("Z [m]", "<f4"), ("Doppler [m/s]", "<f4")])
+
+# Sizes and header field offsets (in bytes) used by the compiled TLV walk
+FRAME_HEADER_SIZE = FRAME_HEADER_DTYPE.itemsize
+POINT_SIZE = POINT_DTYPE.itemsize
+FRAME_NUMBER_OFFSET = FRAME_HEADER_DTYPE.fields["Frame Number"][1]
+NUM_TLVS_OFFSET = FRAME_HEADER_DTYPE.fields["Num TLVs"][1]
+
+# Maximum number of points drawn in the cumulative 3D scatter (larger clouds are drawn with a stride)
+MAX_CUMULATIVE_POINTS = 5000
+
+# Clouds above this size are clustered with cuML (below it, the host-to-GPU transfer dominates)
+GPU_DBSCAN_MIN_POINTS = 20000
 
 # Parse Frame Header
-def parse_frame_header(raw_data):
-    if len(raw_data) < 40:
+def parse_frame_header(raw_data, offset=0):
+    if len(raw_data) - offset < FRAME_HEADER_DTYPE.itemsize:
         raise ValueError("Insufficient data for Frame Header")
-    raw_bytes = bytes([raw_data.pop(0) for _ in range(40)])
-    frame_header = struct.unpack('<QIIIIIIII', raw_bytes)
+    frame_header = np.frombuffer(raw_data, dtype=FRAME_HEADER_DTYPE, count=1, offset=offset)[0].tolist()
     return {
         "Magic Word": f"0x{frame_header[0]:016X}",
         "Version": f"0x{frame_header[1]:08X}",
@@ -29,32 +78,80 @@ def parse_frame_header(raw_data):
         "Num Detected Obj": frame_header[6],
         "Num TLVs": frame_header[7],
         "Subframe Number": frame_header[8]
-    }
-
-# Parse TLV Header
-def parse_tlv_header(raw_data):
-    if len(raw_data) < 8:
-        raise ValueError("Insufficient data for TLV Header")
-    raw_bytes = bytes([raw_data.pop(0) for _ in range(8)])
-    tlv_type, tlv_length = struct.unpack('<II', raw_bytes)
-    return {"TLV Type": tlv_type, "TLV Length": tlv_length}
-
-# Parse TLV Payload
-def parse_tlv_payload(tlv_header, raw_data):
-    tlv_type = tlv_header["TLV Type"]
-    payload_length = tlv_header["TLV Length"]
-    payload = [raw_data.pop(0) for _ in range(payload_length)]
-
-    # Detected Points Example
-    if tlv_type == 1:  # Detected Points
-        point_size = 16
-        detected_points = []
-        for i in range(payload_length // point_size):
-            point_bytes = bytes(payload[i * point_size:(i + 1) * point_size])
-            x, y, z, doppler = struct.unpack('<ffff', point_bytes)
-            detected_points.append({"X [m]": x, "Y [m]": y, "Z [m]": z, "Doppler [m/s]": doppler})
-        return {"Detected Points": detected_points}
-    return None
+    }, offset + FRAME_HEADER_DTYPE.itemsize
+
+# Read a little-endian uint32 from a uint8 buffer
+@njit(nogil=True)
+def read_uint32(buf, offset):
+    return (int(buf[offset]) | (int(buf[offset + 1]) << 8) |
+            (int(buf[offset + 2]) << 16) | (int(buf[offset + 3]) << 24))
+
+# Walk the TLVs of one frame (row) in buf[start:end] in compiled code
+@njit(nogil=True)
+def walk_frame_tlvs(buf, start, end, point_offsets, out_pos, fill):
+    """
+    Returns (status, frame number, number of detected points) of one frame. With fill, the byte offset
+    of every detected point is also written to point_offsets[out_pos:].
+
+    Status: 0 ok, 1 incomplete TLV header, 2 truncated Detected Points payload, 3 incomplete frame header.
+    """
+    if end - start < FRAME_HEADER_SIZE:
+        return 3, 0, 0
+    frame_number = read_uint32(buf, start + FRAME_NUMBER_OFFSET)
+    num_tlvs = read_uint32(buf, start + NUM_TLVS_OFFSET)
+
+    offset = start + FRAME_HEADER_SIZE
+    num_points = 0
+    for _ in range(num_tlvs):
+        if end - offset < 8:  # TLV header: type and length (uint32 each)
+            return 1, frame_number, num_points
+        tlv_type = read_uint32(buf, offset)
+        tlv_length = read_uint32(buf, offset + 4)
+        offset += 8
+
+        # Only process Detected Points (TLV Type 1); as in the original parser, the payload of
+        # other TLVs is not consumed, so the next TLV header is read right after this one
+        if tlv_type == 1:
+            if end - offset < tlv_length:
+                return 2, frame_number, num_points
+            count = tlv_length // POINT_SIZE
+            if fill:
+                for i in range(count):
+                    point_offsets[out_pos + num_points + i] = offset + i * POINT_SIZE
+            num_points += count
+            offset += tlv_length
+
+    return 0, frame_number, num_points
+
+# Index every frame of the log in compiled code (rows are independent, so both passes run in parallel)
+@njit(nogil=True, parallel=True)
+def index_frames(buf, row_starts, row_ends):
+    """
+    Walks all rows (one frame each) of the concatenated byte buffer.
+
+    Returns:
+        status, frame_numbers, point_counts (np.ndarray): Per row, see walk_frame_tlvs.
+        point_offsets (np.ndarray): Byte offset of every detected point, row after row.
+    """
+    num_rows = len(row_starts)
+    status = np.zeros(num_rows, dtype=np.int64)
+    frame_numbers = np.zeros(num_rows, dtype=np.int64)
+    point_counts = np.zeros(num_rows, dtype=np.int64)
+    no_offsets = np.empty(0, dtype=np.int64)
+
+    # First pass: count the points of every row
+    for row in prange(num_rows):
+        status[row], frame_numbers[row], point_counts[row] = walk_frame_tlvs(
+            buf, row_starts[row], row_ends[row], no_offsets, 0, False)
+
+    # Second pass: record where each point starts (every row writes its own slice of point_offsets)
+    out_starts = np.zeros(num_rows, dtype=np.int64)
+    out_starts[1:] = np.cumsum(point_counts)[:-1]
+    point_offsets = np.empty(point_counts.sum(), dtype=np.int64)
+    for row in prange(num_rows):
+        walk_frame_tlvs(buf, row_starts[row], row_ends[row], point_offsets, out_starts[row], True)
+
+    return status, frame_numbers, point_counts, point_offsets
 
 # Process the CSV file and parse data
 def process_log_file(file_path):
@@ -66,84 +163,79 @@ def process_log_file(file_path):
     """
     frames_dict = {}  # Dictionary to hold all parsed frame data
 
-    # Load the CSV data, skip the header row
-    data = pd.read_csv(file_path, names=["Timestamp", "RawData"], skiprows=1)
-
-    for row_idx in range(len(data)):
-        try:
-            # Skip invalid rows
-            if pd.isnull(data.iloc[row_idx]['RawData']):
-                print(f"Skipping row {row_idx + 1}: Invalid or null data.")
-                continue
-
-            # Convert raw data to a list of integers
-            raw_data_list = [int(x) for x in data.iloc[row_idx]['RawData'].split(',')]
-
-            # Parse the Frame Header
-            frame_header = parse_frame_header(raw_data_list)
-            num_tlvs = frame_header["Num TLVs"]
-            frame_number = frame_header["Frame Number"]
-            #print(f"Parsing Frame {frame_number}: {frame_header}")
-
-            # Initialize the frame entry
-            frames_dict[frame_number] = {
-                "Frame Header": frame_header,
-                "Detected Points": []
-            }
-
-            # Parse TLVs
-            for _ in range(num_tlvs):
-                if len(raw_data_list) < 8:
-                    print(f"Skipping incomplete TLV data in Frame {frame_number}")
-                    break
-                
-                tlv_header = parse_tlv_header(raw_data_list)
-
-                # Only process Detected Points (TLV Type 1)
-                if tlv_header["TLV Type"] == 1:
-                    tlv_payload = parse_tlv_payload(tlv_header, raw_data_list)
-                    if tlv_payload and "Detected Points" in tlv_payload:
-                        frames_dict[frame_number]["Detected Points"].extend(tlv_payload["Detected Points"])
-
-        except (ValueError, IndexError) as e:
-            print(f"Error parsing row {row_idx + 1}: {e}")
+    # Load the CSV data, skip the header row (only RawData is needed, read as strings without type inference)
+    data = pd.read_csv(file_path, names=["Timestamp", "RawData"], skiprows=1, usecols=["RawData"],
+                       dtype={"RawData": "string"}, engine=CSV_ENGINE)
+
+    # Take the raw data column and its null mask out of the DataFrame once, instead of per row with .iloc
+    raw_column = data["RawData"].to_numpy()
+    null_rows = data["RawData"].isna().to_numpy()
+
+    # Convert every valid row once into bytes and concatenate them into one buffer
+    valid_rows = np.flatnonzero(~null_rows)
+    row_buffers = [np.fromstring(raw_column[row_idx], dtype=np.uint8, sep=',') for row_idx in valid_rows]
+    row_lengths = np.array([len(row_buffer) for row_buffer in row_buffers], dtype=np.int64)
+    row_ends = np.cumsum(row_lengths)
+    row_starts = row_ends - row_lengths
+    buf = np.concatenate(row_buffers) if row_buffers else np.empty(0, dtype=np.uint8)
+
+    # Walk all TLVs in compiled code, then decode every detected point of the log in one gather
+    status, frame_numbers, point_counts, point_offsets = index_frames(buf, row_starts, row_ends)
+    point_bytes = buf[point_offsets[:, None] + np.arange(POINT_SIZE)]
+    detected_points = np.split(point_bytes.view(POINT_DTYPE).reshape(-1), np.cumsum(point_counts)[:-1])
+
+    valid_idx = 0
+    for row_idx, is_null in enumerate(null_rows):
+        # Skip invalid rows
+        if is_null:
+            print(f"Skipping row {row_idx + 1}: Invalid or null data.")
+            continue
+        i = valid_idx
+        valid_idx += 1
+
+        if status[i] == 3:
+            print(f"Error parsing row {row_idx + 1}: Insufficient data for Frame Header")
+            continue
+
+        # Initialize the frame entry (points are kept as one structured array per frame)
+        frame_number = int(frame_numbers[i])
+        frames_dict[frame_number] = {
+            "Frame Header": parse_frame_header(buf, row_starts[i])[0],
+            "Detected Points": detected_points[i]
+        }
+
+        if status[i] == 1:
+            print(f"Skipping incomplete TLV data in Frame {frame_number}")
+        elif status[i] == 2:
+            print(f"Error parsing row {row_idx + 1}: Insufficient data for TLV Payload")
 
     return frames_dict
 
 # Create a new dictionary with frame numbers and coordinates + Doppler speed
 def extract_coordinates_with_doppler(frames_data, y_threshold=None, z_threshold=None, doppler_threshold=None):
-    coordinates_dict = {}
-
-    for frame_num, frame_content in frames_data.items():
-        # Extract detected points for the current frame
-        points = frame_content["Detected Points"]
-
-        # Create a list of dictionaries with required fields and filters
-        coordinates = []
-        for point in points:
-            # Apply threshold filters
-            if y_threshold is not None and point["Y [m]"] < y_threshold:
-                continue  # Skip if Y is below the threshold
-            
-            if z_threshold is not None and not (z_threshold[0] <= point["Z [m]"] <= z_threshold[1]):
-                continue  # Skip if Z is outside the range
-            
-            if doppler_threshold is not None and abs(point["Doppler [m/s]"]) <= doppler_threshold:
-                continue  # Skip if Doppler speed is below the threshold
-
-            # Add the point to the list if it passes all filters
-            coordinates.append({
-                "X [m]": point["X [m]"],
-                "Y [m]": point["Y [m]"],
-                "Z [m]": point["Z [m]"],
-                "Doppler [m/s]": point["Doppler [m/s]"]
-            })
-        
-        # Add the filtered coordinates list to the dictionary
-        if coordinates:  # Only add frames with valid points
-            coordinates_dict[frame_num] = coordinates
-
-    return coordinates_dict
+    # Stack the detected points of all frames into one array plus a frame column
+    frame_numbers = list(frames_data.keys())
+    point_arrays = [frames_data[frame_num]["Detected Points"] for frame_num in frame_numbers]
+    if not point_arrays:
+        return {}
+    points = np.concatenate(point_arrays)
+    frame_column = np.repeat(frame_numbers, [len(frame_points) for frame_points in point_arrays])
+
+    # Apply threshold filters to all frames at once as one boolean mask
+    mask = np.ones(len(points), dtype=bool)
+    if y_threshold is not None:
+        mask &= points["Y [m]"] >= y_threshold  # Skip if Y is below the threshold
+    if z_threshold is not None:
+        mask &= (points["Z [m]"] >= z_threshold[0]) & (points["Z [m]"] <= z_threshold[1])  # Skip if Z is outside the range
+    if doppler_threshold is not None:
+        mask &= np.abs(points["Doppler [m/s]"]) > doppler_threshold  # Skip if Doppler speed is below the threshold
+    points = points[mask]
+    frame_column = frame_column[mask]
+
+    # Split back into per-frame arrays at every change of frame number
+    # (frames keep their order, only frames with valid points are kept)
+    starts = np.flatnonzero(np.diff(frame_column, prepend=frame_column[:1] - 1))
+    return dict(zip(frame_column[starts].tolist(), np.split(points, starts[1:])))
 
 # Function to draw the sensor's detection area as a wedge
 def draw_sensor_area(ax, sensor_origin=(0, -1), azimuth=60, max_distance=12):
@@ -195,50 +287,64 @@ def draw_sensor_area_3d(ax, z_plane=0.30):
     y_circle = sensor_radius * np.sin(theta)
     ax.plot(x_circle, y_circle, zs=z_plane, color='red', linewidth=1.5, label="Sensor Area")
 
-def calculate_occupancy_grid(points, x_limits, y_limits, grid_spacing):
+def occupancy_grid_edges(x_limits, y_limits, grid_spacing):
     """
-    Calculate an occupancy grid for the given points.
+    Calculate the cell edges of the occupancy grid along X and Y.
 
     Parameters:
-        points (list of tuples): List of (x, y) or (x, y, z) coordinates.
         x_limits (tuple): The x-axis limits as (xmin, xmax).
         y_limits (tuple): The y-axis limits as (ymin, ymax).
         grid_spacing (int): Spacing between grid cells.
 
     Returns:
-        np.ndarray: 2D occupancy grid.
+        tuple: (x_edges, y_edges); the grid shape is (len(x_edges) - 1, len(y_edges) - 1).
     """
-    # Calculate grid size
     x_bins = int((x_limits[1] - x_limits[0]) / grid_spacing)
     y_bins = int((y_limits[1] - y_limits[0]) / grid_spacing)
 
-    # Initialize the grid
-    occupancy_grid = np.zeros((x_bins, y_bins))
+    # The edges match the cell indexing (x - xmin) // grid_spacing
+    x_edges = x_limits[0] + grid_spacing * np.arange(x_bins + 1)
+    y_edges = y_limits[0] + grid_spacing * np.arange(y_bins + 1)
+    return x_edges, y_edges
 
-    # Populate the grid
-    for point in points:
-        if len(point) == 3:
-            x, y, _ = point  # Unpack x, y, z
-        elif len(point) == 2:
-            x, y = point  # Unpack x, y only
-        else:
-            raise ValueError(f"Point format not supported: {point}")
+def calculate_occupancy_grid(points, x_limits, y_limits, grid_spacing, edges=None):
+    """
+    Calculate an occupancy grid for the given points.
 
-        if x_limits[0] <= x < x_limits[1] and y_limits[0] <= y < y_limits[1]:
-            x_idx = int((x - x_limits[0]) / grid_spacing)
-            y_idx = int((y - y_limits[0]) / grid_spacing)
-            occupancy_grid[x_idx, y_idx] += 1
+    Parameters:
+        points (list of tuples or np.ndarray): (x, y) or (x, y, z) coordinates.
+        x_limits (tuple): The x-axis limits as (xmin, xmax).
+        y_limits (tuple): The y-axis limits as (ymin, ymax).
+        grid_spacing (int): Spacing between grid cells.
+        edges (tuple): Precomputed (x_edges, y_edges) from occupancy_grid_edges (optional).
 
-    return occupancy_grid
+    Returns:
+        np.ndarray: 2D occupancy grid.
+    """
+    # Calculate the cell edges (unless the caller already did)
+    x_edges, y_edges = edges if edges is not None else occupancy_grid_edges(x_limits, y_limits, grid_spacing)
+
+    # Radar coordinates are float32; keep them (and the grid) in float32 instead of upcasting to float64
+    points = np.asarray(points, dtype=np.float32)
+    if points.size == 0:
+        return np.zeros((len(x_edges) - 1, len(y_edges) - 1), dtype=np.float32)
+    if points.ndim != 2 or points.shape[1] not in (2, 3):
+        raise ValueError(f"Point format not supported: {points.shape}")
+
+    # Bin all points at once
+    occupancy_grid, _, _ = np.histogram2d(points[:, 0], points[:, 1], bins=[x_edges, y_edges])
 
-def dbscan_clustering(data, eps=1.0, min_samples=3):
+    return occupancy_grid.astype(np.float32)
+
+def dbscan_clustering(data, eps=1.0, min_samples=3, n_jobs=None):
     """
     Perform DBSCAN clustering on the X and Y coordinates from the data.
 
     Args:
-    - data (list or DataFrame): Data containing X and Y coordinates.
+    - data (list, array or DataFrame): Data containing X and Y coordinates.
     - eps (float): The maximum distance between two samples for one to be considered in the neighborhood.
     - min_samples (int): The number of samples in a neighborhood for a point to be considered a core point.
+    - n_jobs (int): Parallel jobs for the neighborhood queries (-1 uses all cores; only pays off for large clouds).
 
     Returns:
     - labels (array): Cluster labels for each point. Noise points are labeled as -1.
@@ -255,8 +361,17 @@ def dbscan_clustering(data, eps=1.0, min_samples=3):
         print("DBSCAN: No valid points for clustering.")
         return np.array([])
 
-    # Perform DBSCAN
-    db = DBSCAN(eps=eps, min_samples=min_samples).fit(data)
+    data = np.ascontiguousarray(data, dtype=np.float32)
+
+    # Large clouds on the GPU (cuML), if available
+    if cuDBSCAN is not None and data.shape[0] > GPU_DBSCAN_MIN_POINTS:
+        labels = cuDBSCAN(eps=eps, min_samples=min_samples).fit_predict(cp.asarray(data))
+        return cp.asnumpy(labels)
+
+    # Build the sparse eps-neighborhood graph once (tree search on a contiguous float32 copy),
+    # then run DBSCAN on it, so no dense pairwise distances are ever materialized
+    graph = radius_neighbors_graph(data, radius=eps, mode='distance', include_self=True, n_jobs=n_jobs)
+    db = DBSCAN(eps=eps, min_samples=min_samples, metric='precomputed').fit(graph)
     return db.labels_
 
 
@@ -275,13 +390,13 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
     """
 
     # Helper function to draw the grid with specified spacing
+    # (all grid lines form one LineCollection instead of one Line2D per line)
     def draw_grid(ax, x_limits, y_limits, grid_spacing):
         x_ticks = range(int(np.floor(x_limits[0])), int(np.ceil(x_limits[1])) + 1, grid_spacing)
         y_ticks = range(int(np.floor(y_limits[0])), int(np.ceil(y_limits[1])) + 1, grid_spacing)
-        for x in x_ticks:
-            ax.plot([x, x], y_limits, linestyle='--', color='gray', linewidth=0.5)
-        for y in y_ticks:
-            ax.plot(x_limits, [y, y], linestyle='--', color='gray', linewidth=0.5)
+        segs = [[(x, y_limits[0]), (x, y_limits[1])] for x in x_ticks] + \
+               [[(x_limits[0], y), (x_limits[1], y)] for y in y_ticks]
+        ax.add_collection(LineCollection(segs, linestyles='--', colors='gray', linewidths=0.5))
     def draw_grid_3d(ax, x_limits, y_limits, grid_spacing, z_plane=0):
         """
         Draw a 2D grid at a fixed Z-plane on a 3D plot.
@@ -304,43 +419,70 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         for x in x_range:
             ax.plot([x, x], [y_limits[0], y_limits[1]], zs=z_plane, color='gray', linestyle='--', linewidth=0.5)
 
+    # Grid edges and shape are fixed for the whole plot, so compute them once
+    grid_edges = occupancy_grid_edges(x_limits, y_limits, grid_spacing)
+    grid_shape = (len(grid_edges[0]) - 1, len(grid_edges[1]) - 1)
+
+    # Per-frame occupancy grids, computed once per frame and reused across slider ticks
+    frame_grids = {}
+
+    # Helper function to get (and cache) the occupancy grid of a single frame
+    def get_frame_grid(frame):
+        if frame not in frame_grids:
+            coordinates = frames_data.get(frame, np.empty(0, dtype=POINT_DTYPE))  # Retrieve the frame's points
+            points = np.column_stack((coordinates["X [m]"], coordinates["Y [m]"]))
+            frame_grids[frame] = calculate_occupancy_grid(points, x_limits, y_limits, grid_spacing, grid_edges)
+        return frame_grids[frame]
+
+    # Running sum over the current history window [start, end), plus the buffer its clipped copy is written to
+    history_window = {"start": None, "end": None,
+                      "sum": np.zeros(grid_shape, dtype=np.float32), "clipped": np.zeros(grid_shape, dtype=np.float32)}
+
     # Helper function to calculate cumulative occupancy over history
-    def calculate_cumulative_occupancy(frames_data, frame_idx, x_limits, y_limits, grid_spacing, history_frames):
+    def calculate_cumulative_occupancy(frame_idx):
         """
         Calculate a cumulative occupancy grid over the last `history_frames` frames.
 
+        The running sum of the previous call is updated by subtracting the frames that
+        left the window and adding the ones that entered it, so scrubbing the slider
+        one frame at a time only touches two grids.
+
         Parameters:
-            frames_data (dict): Frame data dictionary.
             frame_idx (int): Current frame index.
-            x_limits (tuple): X-axis limits.
-            y_limits (tuple): Y-axis limits.
-            grid_spacing (int): Spacing between grid cells.
-            history_frames (int): Number of frames to include in the history.
 
         Returns:
             np.ndarray: Cumulative occupancy grid.
         """
-        cumulative_grid = np.zeros((int((x_limits[1] - x_limits[0]) / grid_spacing),
-                                    int((y_limits[1] - y_limits[0]) / grid_spacing)))
+        start = max(1, frame_idx - history_frames + 1)
+        end = frame_idx + 1
+        prev_start, prev_end = history_window["start"], history_window["end"]
+
+        cumulative_grid = history_window["sum"]
+        if prev_start is None or start >= prev_end or end <= prev_start:
+            # No overlap with the previous window: rebuild it in place
+            cumulative_grid.fill(0)
+            for i in range(start, end):
+                cumulative_grid += get_frame_grid(i)
+        else:
+            for i in range(prev_start, start):  # Frames dropped at the front
+                cumulative_grid -= get_frame_grid(i)
+            for i in range(start, prev_start):  # Frames added at the front
+                cumulative_grid += get_frame_grid(i)
+            for i in range(prev_end, end):  # Frames added at the back
+                cumulative_grid += get_frame_grid(i)
+            for i in range(end, prev_end):  # Frames dropped at the back
+                cumulative_grid -= get_frame_grid(i)
 
-        for i in range(max(1, frame_idx - history_frames + 1), frame_idx + 1):
-            coordinates = frames_data.get(i, [])  # Retrieve the list of points
-            # Extract X and Y coordinates as tuples
-            points = [(point["X [m]"], point["Y [m]"]) for point in coordinates]
-            # Update the cumulative grid
-            occupancy_grid = calculate_occupancy_grid(points, x_limits, y_limits, grid_spacing)
-            cumulative_grid += occupancy_grid
+        history_window.update(start=start, end=end)
 
         # Normalize cumulative grid to [0, 1] (optional for visualization purposes)
-        cumulative_grid = np.clip(cumulative_grid, 0, 10)  # Limit max values to 10
-        return cumulative_grid
+        return np.clip(cumulative_grid, 0, 10, out=history_window["clipped"])  # Limit max values to 10
     # Helper function 
     def create_custom_colormap():
         """
         Create a custom colormap for the occupancy grid.
         Returns:
             cmap: Custom colormap with a specific background color.
-            norm: Normalizer to map data values to colormap levels.
         """
         # Define colors: First is the background color, followed by density colors
         colors = [
@@ -353,15 +495,16 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         ]
         cmap = ListedColormap(colors)
 
-        # Define boundaries for each color bin
-        boundaries = [0, 1, 2, 3, 4, 5, np.inf]  # Bins for densities
-        norm = BoundaryNorm(boundaries, cmap.N, clip=True)
-
-        return cmap, norm
+        return cmap
 
     # Create a larger figure to accommodate bigger 3D plots
     fig = plt.figure(figsize=(24, 18))  # Larger figure size
 
+    # Two workers: the grids of Dataset 1 and the clustering of Dataset 2 are computed side by side;
+    # they live as long as the figure
+    pipeline_executor = ThreadPoolExecutor(max_workers=2)
+    fig.canvas.mpl_connect("close_event", lambda event: pipeline_executor.shutdown(wait=False))
+
     # Define a 4x3 grid layout with custom width ratios
     gs = GridSpec(4, 3, figure=fig, width_ratios=[3, 3, 1], height_ratios=[3, 3, 1, 1])
 
@@ -391,12 +534,8 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
     # Adjust subplot spacing
     plt.subplots_adjust(left=0.1, bottom=0.2, right=0.9, top=0.9, wspace=0.5, hspace=0.6)
 
-    # Apply grid to all subplots
-    for ax in [ax1_1, ax1_2, ax1_3, ax1_4]:
-        draw_grid(ax, x_limits, y_limits, grid_spacing)
-
-    # Get the custom colormap and normalizer
-    cmap, norm = create_custom_colormap()
+    # Get the custom colormap
+    cmap = create_custom_colormap()
 
     # Initialize cumulative plots
     (line1_1,) = ax1_1.plot([], [], 'o', label="Dataset 1: Cumulative Data")
@@ -450,246 +589,230 @@ def create_interactive_plots(frames_data, x_limits, y_limits, grid_spacing=1, ep
         ax.set_ylim(*y_limits)
         ax.set_title(f"{title} - History-Based Grid")
 
+    # 3D scatter artists are created once; update() only replaces their offsets.
+    # Without cla() the axes no longer autoscale, so they get fixed limits covering all frames.
+    all_points = np.concatenate(list(frames_data.values())) if frames_data else np.empty(0, dtype=POINT_DTYPE)
+
+    # All points in frame order, plus the number of points up to the end of each frame,
+    # so the cumulative data of any frame is a single slice
+    cumulative_frames = np.array(sorted(frame for frame in frames_data if frame >= 1))
+    cumulative_points1 = np.concatenate([frames_data[frame] for frame in cumulative_frames] + [np.empty(0, dtype=POINT_DTYPE)])
+    cumulative_x1 = cumulative_points1["X [m]"]
+    cumulative_y1 = cumulative_points1["Y [m]"]
+    cumulative_z1 = cumulative_points1["Z [m]"]
+    cumulative_ends1 = np.cumsum([len(frames_data[frame]) for frame in cumulative_frames], dtype=int)
+
+    z_limits = (min(0.0, all_points["Z [m]"].min(initial=0.0)), max(0.30, all_points["Z [m]"].max(initial=0.30)))
+
+    scatter1_1 = ax1_1.scatter3D([], [], [], c='blue', label="Cumulative Data")
+    scatter1_2 = ax1_2.scatter3D([], [], [], c='red', label="Current Frame")
+    scatter2_1 = ax2_1.scatter3D([], [], [], c='purple', alpha=0.5, label="Cumulative Clusters")
+    ax1_1.set_title("Cumulative Data (3D)")
+    ax2_1.set_title("Cumulative Clusters (3D)")
+
+    # Grid and sensor area never change, so they are drawn once here instead of in every update()
+    for ax in [ax1_1, ax1_2, ax2_1, ax2_2]:
+        ax.set_xlabel("X [m]")
+        ax.set_ylabel("Y [m]")
+        ax.set_zlabel("Z [m]")
+        # Draw 2D grid and sensor area at Z=0
+        draw_grid_3d(ax, x_limits, y_limits, grid_spacing, z_plane=0)
+        draw_sensor_area_3d(ax)
+        ax.set_xlim(*x_limits)
+        ax.set_ylim(*y_limits)
+        ax.set_zlim(*z_limits)
+
+    # Occupancy images are created once as well; update() swaps their data with set_data()
+    empty_grid = np.zeros(grid_shape, dtype=np.float32)
+    images = {}
+    for ax in [ax1_3, ax1_4, ax2_3, ax2_4]:
+        images[ax] = ax.imshow(empty_grid.T, extent=(*x_limits, *y_limits), origin='lower', cmap=cmap, aspect='auto')
+        ax.set_xlabel("X [m]")
+        ax.set_ylabel("Y [m]")
+        draw_grid(ax, x_limits, y_limits, grid_spacing)
+        draw_sensor_area(ax)
+        ax.set_xlim(*x_limits)
+        ax.set_ylim(*y_limits)
+    ax1_4.set_title(f"History Grid - Dataset 1 (Last {history_frames} Frames)")
+    ax2_3.set_title("Clustered Occupancy Grid")
+    ax2_4.set_title("Cumulative Occupancy Grid")
+
+    # Helper function to show a grid in one of the persistent occupancy images
+    def show_grid(ax, grid):
+        image = images[ax]
+        image.set_data(grid.T)
+        image.autoscale()  # Rescale colors to the new data, as a fresh imshow() would
+        image.set_visible(True)
+
+    # Per-cluster scatters of the current frame (removed and recreated on every update)
+    cluster_scatters = []
+
+    # DBSCAN parameters of Dataset 2
+    eps2 = 0.4
+    min_samples2 = 2
+
+    # Helper function computing the grids of Dataset 1 (runs on a worker thread)
+    def compute_dataset1(frame_idx):
+        return get_frame_grid(frame_idx), calculate_cumulative_occupancy(frame_idx)
+
+    # Helper function clustering the points of Dataset 2 (runs on a worker thread)
+    def compute_dataset2(coordinates):
+        """
+        Returns the DBSCAN labels of the (N, 3) coordinates and the occupancy grid of the
+        clustered (non-noise) points, or None for the grid if every point is noise.
+        """
+        labels = dbscan_clustering(coordinates, eps=eps2, min_samples=min_samples2)
+        clustered_points = coordinates[labels != -1, :2]
+        if clustered_points.size == 0:
+            return labels, None
+        return labels, calculate_occupancy_grid(clustered_points, x_limits, y_limits, grid_spacing, grid_edges)
+
+    # Last frame drawn, so slider events that round to the same frame are skipped
+    slider_state = {"last": None}
+
     # Update function
     def update(val):
         # Get the current slider value
         frame_idx = int(slider_idx.val)
+        if frame_idx == slider_state["last"]:
+            return
+        slider_state["last"] = frame_idx
 
         # Initialize a persistent cumulative grid for ax2_4
         if not hasattr(update, "cumulative_grid"):
-                x_bins = int((x_limits[1] - x_limits[0]) / grid_spacing)
-                y_bins = int((y_limits[1] - y_limits[0]) / grid_spacing)
-                update.cumulative_grid = np.zeros((x_bins, y_bins))  # Initialize cumulative grid
+            update.cumulative_grid = np.zeros(grid_shape, dtype=np.float32)  # Initialize cumulative grid
 
 
         """
         Dataset 1
         """
-        # Initialize lists to store X, Y coordinates and Doppler values for the current frame
-        coordinates1 = []
-        doppler1 = []
-
-        # Get the list of points for the current frame
-        current_frame_points = frames_data.get(frame_idx, [])
+        # Get the points (structured array) for the current frame
+        current_frame_points = frames_data.get(frame_idx, np.empty(0, dtype=POINT_DTYPE))
 
-        # Extract X, Y coordinates and Doppler values
-        for point in current_frame_points:
-            x_coord = point["X [m]"]
-            y_coord = point["Y [m]"]
-            z_coord = point["Y [m]"]
-            #doppler_speed = point["Doppler [m/s]"]
-
-            coordinates1.append((x_coord, y_coord, z_coord))
-            #doppler1.append(doppler_speed)
+        # Extract X, Y coordinates (an (N, 4) float32 view of the points, no copy)
+        coordinates1 = current_frame_points.view(np.float32).reshape(-1, 4)[:, :2]
 
         # Check if the current frame has no valid points
-        if not coordinates1:
+        if len(coordinates1) == 0:
             print(f"Frame {frame_idx} for Dataset 1 has no points after filtering.")
             return
 
+        # Compute both datasets in parallel (NumPy, numba and scikit-learn release the GIL);
+        # the artists below are only touched on this (the GUI) thread
+        coordinates2 = current_frame_points.view(np.float32).reshape(-1, 4)[:, :3]
+        dataset1 = pipeline_executor.submit(compute_dataset1, frame_idx)
+        dataset2 = pipeline_executor.submit(compute_dataset2, coordinates2)
+        occupancy_grid1, cumulative_grid1 = dataset1.result()
+
         # -----------------------------------------
         # Ax1_1: Update cumulative data for dataset 1
         # -----------------------------------------
-        x1, y1, z1 = [], [], []
         # Accumulate historical data
-        for frame in range(1, frame_idx + 1):
-            points = frames_data.get(frame, [])
-            for point in points:
-                x1.append(point["X [m]"])
-                y1.append(point["Y [m]"])
-                z1.append(point["Z [m]"])
-
-        # Plot cumulative data in 3D
-        ax1_1.cla()
-        ax1_1.scatter3D(x1, y1, z1, c='blue', label="Cumulative Data")
-        ax1_1.set_xlabel("X [m]")
-        ax1_1.set_ylabel("Y [m]")
-        ax1_1.set_zlabel("Z [m]")
-        ax1_1.set_title("Cumulative Data (3D)")
-        # Draw 2D grid and sensor area at Z=0
-        draw_grid_3d(ax1_1, x_limits, y_limits, grid_spacing, z_plane=0)
-        draw_sensor_area_3d(ax1_1)
+        frames_so_far = np.searchsorted(cumulative_frames, frame_idx, side="right")  # Frames 1..frame_idx
+        num_points = cumulative_ends1[frames_so_far - 1] if frames_so_far else 0
+
+        # Plot cumulative data in 3D, evenly thinned to at most MAX_CUMULATIVE_POINTS so the render cost stays bounded
+        step = max(1, -(-num_points // MAX_CUMULATIVE_POINTS))
+        scatter1_1._offsets3d = (cumulative_x1[:num_points:step], cumulative_y1[:num_points:step], cumulative_z1[:num_points:step])
 
         # -----------------------------------------
         # Ax1_2: Update current frame data for dataset 1
         # -----------------------------------------
         # Extract X, Y, and Z coordinates for the current frame
-        x2 = [point[0] for point in coordinates1]
-        y2 = [point[1] for point in coordinates1]
-        z2 = [point["Z [m]"] for point in current_frame_points]
+        x2 = current_frame_points["X [m]"]
+        y2 = current_frame_points["Y [m]"]
+        z2 = current_frame_points["Z [m]"]
 
         # Plot current frame points in 3D
-        ax1_2.cla()
-        ax1_2.scatter3D(z2, y2, z2, c='red', label="Current Frame")
-        ax1_2.set_xlabel("X [m]")
-        ax1_2.set_ylabel("Y [m]")
-        ax1_2.set_zlabel("Z [m]")
+        scatter1_2._offsets3d = (x2, y2, z2)
         ax1_2.set_title(f"Frame {frame_idx} - Current Frame (3D)")
-        # Draw 2D grid and sensor area at Z=0
-        draw_grid_3d(ax1_2, x_limits, y_limits, grid_spacing, z_plane=0)
-        draw_sensor_area_3d(ax1_2)
 
 
         # -----------------------------------------
         # Ax1_3: Update Occupancy Grid for Dataset 1
         # -----------------------------------------
-        occupancy_grid1 = calculate_occupancy_grid(coordinates1, x_limits, y_limits, grid_spacing)
-        ax1_3.cla()
-        ax1_3.imshow(occupancy_grid1.T, extent=(*x_limits, *y_limits), origin='lower', cmap=cmap, aspect='auto')
+        show_grid(ax1_3, occupancy_grid1)
         ax1_3.set_title(f"Occupancy Grid - Dataset 1 (Frame {frame_idx})")
-        ax1_3.set_xlabel("X [m]")
-        ax1_3.set_ylabel("Y [m]")
-        draw_grid(ax1_3, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax1_3)
 
         # -----------------------------------------
         # Ax1_4: Update History-Based Occupancy Grid for Dataset 1
         # -----------------------------------------
-        cumulative_grid1 = calculate_cumulative_occupancy(
-            frames_data, frame_idx, x_limits, y_limits, grid_spacing, history_frames
-        )
-        ax1_4.cla()
-        ax1_4.imshow(cumulative_grid1.T, extent=(*x_limits, *y_limits), origin='lower', cmap=cmap, aspect='auto')
-        ax1_4.set_title(f"History Grid - Dataset 1 (Last {history_frames} Frames)")
-        ax1_4.set_xlabel("X [m]")
-        ax1_4.set_ylabel("Y [m]")
-        draw_grid(ax1_4, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax1_4)
+        show_grid(ax1_4, cumulative_grid1)
 
         """
         Dataset 2 (with DBSCAN clustering)
         """
-        eps2 = 0.4
-        min_samples2 = 2
-
-        # Initialize lists to store X, Y, and Z coordinates
-        coordinates2 = []
-
-        # Get the list of points for the current frame
-        current_frame_points = frames_data.get(frame_idx, [])
-
-        # Extract X, Y, and Z coordinates for clustering
-        for point in current_frame_points:
-            x_coord = point["X [m]"]
-            y_coord = point["Y [m]"]
-            z_coord = point["Z [m]"]
-            coordinates2.append([x_coord, y_coord, z_coord])
-
-        # Check if the current frame has no valid points
-        if not coordinates2:
-            print(f"Frame {frame_idx} for Dataset 2 has no points after filtering.")
-            return
-
-        # Prepare DataFrame for clustering
-        # Prepare DataFrame for clustering
-        df = pd.DataFrame(coordinates2, columns=["X [m]", "Y [m]", "Z [m]"])
-        labels = dbscan_clustering(df, eps=eps2, min_samples=min_samples2)
+        # X, Y, and Z coordinates of the same frame (float32 view, no copy), clustered
+        # directly on the worker thread; labels index the same rows
+        labels, frame_grid = dataset2.result()
+        clustered_mask = labels != -1
 
         # -----------------------------------------
         # Ax2_1: Update cumulative clusters
         # -----------------------------------------
+        # Preallocated (capacity, 3) buffer; only the first num_cumulative_clusters rows are used
         if not hasattr(update, "cumulative_clusters"):
-            update.cumulative_clusters = {"x": [], "y": [], "z": []}
-
-        for cluster_label in set(labels):
-            if cluster_label != -1:  # Ignore noise points
-                cluster_points = df.loc[labels == cluster_label, ["X [m]", "Y [m]", "Z [m]"]].values
-                update.cumulative_clusters["x"].extend(cluster_points[:, 0])
-                update.cumulative_clusters["y"].extend(cluster_points[:, 1])
-                update.cumulative_clusters["z"].extend(cluster_points[:, 2])
+            update.cumulative_clusters = np.empty((1024, 3), dtype=np.float32)
+            update.num_cumulative_clusters = 0
+
+        # Append all clustered points (noise excluded) by slice assignment
+        cluster_points = coordinates2[clustered_mask]
+        start = update.num_cumulative_clusters
+        end = start + len(cluster_points)
+        if end > len(update.cumulative_clusters):
+            # Grow by doubling so appends stay amortized O(1)
+            grown = np.empty((max(end, 2 * len(update.cumulative_clusters)), 3), dtype=np.float32)
+            grown[:start] = update.cumulative_clusters[:start]
+            update.cumulative_clusters = grown
+        update.cumulative_clusters[start:end] = cluster_points
+        update.num_cumulative_clusters = end
 
         # Plot cumulative clusters in 3D
-        ax2_1.cla()
-        ax2_1.scatter3D(update.cumulative_clusters["x"], update.cumulative_clusters["y"], update.cumulative_clusters["z"],
-                        c='purple', alpha=0.5, label="Cumulative Clusters")
-        ax2_1.set_xlabel("X [m]")
-        ax2_1.set_ylabel("Y [m]")
-        ax2_1.set_zlabel("Z [m]")
-        ax2_1.set_title("Cumulative Clusters (3D)")
-        # Draw 2D grid and sensor area at Z=0
-        draw_grid_3d(ax2_1, x_limits, y_limits, grid_spacing, z_plane=0)
-        draw_sensor_area_3d(ax2_1)
+        cumulative_clusters = update.cumulative_clusters[:end]
+        scatter2_1._offsets3d = (cumulative_clusters[:, 0], cumulative_clusters[:, 1], cumulative_clusters[:, 2])
 
         # -----------------------------------------
         # Ax2_2: Current frame clusters
         # -----------------------------------------
-        ax2_2.cla()
-        ax2_2.set_xlabel("X [m]")
-        ax2_2.set_ylabel("Y [m]")
-        ax2_2.set_zlabel("Z [m]")
+        # Remove the previous frame's cluster scatters (grid and sensor area stay)
+        for scatter in cluster_scatters:
+            scatter.remove()
+        cluster_scatters.clear()
         ax2_2.set_title(f"Frame {frame_idx} - Current Frame Clusters (3D)")
 
-        unique_labels = set(labels)
+        unique_labels = np.unique(labels)
         colors = [plt.cm.Spectral(each) for each in np.linspace(0, 1, len(unique_labels))]
 
-        for cluster_label, col in zip(set(labels), colors):
+        for cluster_label, col in zip(unique_labels, colors):
             if cluster_label == -1:  # Noise points
                 col = [0, 0, 0, 1]  # Black for noise
             else:
                 class_member_mask = (labels == cluster_label)
-                cluster_points = df.loc[class_member_mask, ["X [m]", "Y [m]", "Z [m]"]].values
-                ax2_2.scatter3D(cluster_points[:, 0], cluster_points[:, 1], cluster_points[:, 2],
-                                c=[col], label=f"Cluster {cluster_label}")
-        
-        # Draw 2D grid and sensor area at Z=0
-        draw_grid_3d(ax2_2, x_limits, y_limits, grid_spacing, z_plane=0)
-        draw_sensor_area_3d(ax2_2)
+                cluster_points = coordinates2[class_member_mask]
+                cluster_scatters.append(ax2_2.scatter3D(cluster_points[:, 0], cluster_points[:, 1], cluster_points[:, 2],
+                                                        c=[col], label=f"Cluster {cluster_label}"))
 
         # -----------------------------------------
         # Ax2_3: Current frame occupancy grid for clusters
         # -----------------------------------------
-        ax2_3.cla()
-        ax2_3.set_xlim(*x_limits)
-        ax2_3.set_ylim(*y_limits)
-
-        # Filter only clustered points
-        clustered_points = df[labels != -1][["X [m]", "Y [m]"]].values
-        if clustered_points.size == 0:
-            pass  # Do nothing if there are no clustered points
+        # Occupancy grid of the clustered points only (computed with the clustering)
+        if frame_grid is None:
+            images[ax2_3].set_visible(False)  # Leave the grid empty if there are no clustered points
         else:
-            # Calculate the occupancy grid for clustered points
-            frame_grid = calculate_occupancy_grid(clustered_points, x_limits, y_limits, grid_spacing)
-
             # Update the cumulative grid
-            if not hasattr(update, "cumulative_grid"):
-                update.cumulative_grid = np.zeros_like(frame_grid)  # Initialize cumulative grid
             update.cumulative_grid += frame_grid
 
             # Plot the current frame's occupancy grid
-            ax2_3.imshow(
-                frame_grid.T,  # Transpose for proper orientation
-                extent=(*x_limits, *y_limits),
-                origin="lower",
-                cmap=cmap,
-                aspect="auto"
-            )
-
-        ax2_3.set_title("Clustered Occupancy Grid")
-        draw_grid(ax2_3, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax2_3)
+            show_grid(ax2_3, frame_grid)
 
         # -----------------------------------------
         # Ax2_4: Cumulative history-based clustered occupancy grid
         # -----------------------------------------
-        ax2_4.cla()
-        ax2_4.set_xlim(*x_limits)
-        ax2_4.set_ylim(*y_limits)
-
         # Normalize the cumulative grid for better visualization
         cumulative_grid_normalized = np.clip(update.cumulative_grid, 0, 10)
 
         # Plot the cumulative grid
-        ax2_4.imshow(
-            cumulative_grid_normalized.T,  # Transpose for proper orientation
-            extent=(*x_limits, *y_limits),
-            origin="lower",
-            cmap=cmap,
-            aspect="auto"
-        )
-
-        ax2_4.set_title("Cumulative Occupancy Grid")
-        draw_grid(ax2_4, x_limits, y_limits, grid_spacing)
-        draw_sensor_area(ax2_4)
+        show_grid(ax2_4, cumulative_grid_normalized)
 
 
         fig.canvas.draw_idle()
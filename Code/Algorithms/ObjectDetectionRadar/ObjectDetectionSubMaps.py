@@ -1,64 +1,59 @@
 import os
 import pandas as pd
 import numpy as np
-import struct
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
 from sklearn.cluster import DBSCAN
-from matplotlib.patches import Rectangle
+from matplotlib.patches import Polygon
 
 from DataProcessing.radar_utilsProcessing import *
 from DataProcessing.radar_utilsPlot import *
+from Clustering.dbClustering import bbox_polys
 
 # Create a new dictionary with frame numbers and coordinates + Doppler speed
 def extract_coordinates_with_doppler(frames_data, y_threshold=None, z_threshold=None, doppler_threshold=None):
-    coordinates_dict = {}
-
+    """
+    Filter the detected points of every frame and return them per frame as (N, 4) arrays
+    with columns X, Y, Z and Doppler. All frames are filtered at once on a single array.
+    """
+    # Stack the detected points (Type 1 data) of all frames into one array plus a frame column
+    frame_column = []
+    point_arrays = []
     for frame_num, frame_content in frames_data.items():
-        # Extract TLV data
-        tlvs = frame_content.get("TLVs", [])
-
-        # Find Type 1 data (Detected Points)
-        points = []
-        for tlv in tlvs:
+        for tlv in frame_content.get("TLVs", []):
             if "Type 1 Data" in tlv:  # Look for Type 1 Data
                 points = tlv["Type 1 Data"]
+                frame_column.append(np.full(len(points), frame_num))
+                point_arrays.append(np.column_stack(
+                    (points["X [m]"], points["Y [m]"], points["Z [m]"], points["Doppler [m/s]"])
+                ).astype(np.float32))
                 break  # Assume only one Type 1 entry per frame
 
-        # Create a list of dictionaries with required fields and filters
-        coordinates = []
-        for point in points:
-            # Apply threshold filters
-            if y_threshold is not None and point["Y [m]"] < y_threshold:
-                continue  # Skip if Y is below the threshold
-
-            if z_threshold is not None and not (z_threshold[0] <= point["Z [m]"] <= z_threshold[1]):
-                continue  # Skip if Z is outside the range
-
-            if doppler_threshold is not None and abs(point["Doppler [m/s]"]) <= doppler_threshold:
-                continue  # Skip if Doppler speed is below the threshold
-
-            # Add the point to the list if it passes all filters
-            coordinates.append([
-                point["X [m]"],
-                point["Y [m]"],
-                point["Z [m]"],
-                point["Doppler [m/s]"]
-            ])
-
-        # Add the filtered coordinates list to the dictionary
-        if coordinates:  # Only add frames with valid points
-            coordinates_dict[frame_num] = np.array(coordinates)
-
-    return coordinates_dict
-
-# Submap aggregation function
-def aggregate_submap(frames_data, start_frame, num_frames=10):
-    aggregated_points = []
-    for frame in range(start_frame, start_frame + num_frames):
-        if frame in frames_data:
-            aggregated_points.extend(frames_data[frame])
-    return np.array(aggregated_points)
+    if not point_arrays:
+        return {}
+
+    frame_column = np.concatenate(frame_column)
+    coordinates = np.concatenate(point_arrays)
+
+    # Apply threshold filters as one boolean mask
+    mask = np.ones(len(coordinates), dtype=bool)
+    if y_threshold is not None:
+        mask &= coordinates[:, 1] >= y_threshold  # Skip if Y is below the threshold
+    if z_threshold is not None:
+        mask &= (coordinates[:, 2] >= z_threshold[0]) & (coordinates[:, 2] <= z_threshold[1])  # Skip if Z is outside the range
+    if doppler_threshold is not None:
+        mask &= np.abs(coordinates[:, 3]) > doppler_threshold  # Skip if Doppler speed is below the threshold
+
+    frame_column = frame_column[mask]
+    coordinates = coordinates[mask]
+
+    # Sort by frame and split into per-frame views (only frames with valid points are kept)
+    order = np.argsort(frame_column, kind="stable")
+    frame_column = frame_column[order]
+    coordinates = coordinates[order]
+    frame_numbers, starts = np.unique(frame_column, return_index=True)
+
+    return dict(zip(frame_numbers.tolist(), np.split(coordinates, starts[1:])))
 
 # -------------------------------
 # FUNCTION: Cluster Points
@@ -110,18 +105,12 @@ def plot_clusters(clusters, ax):
         # Display the average Doppler speed
         ax.text(centroid[0], centroid[1] + 0.2, f"{doppler_avg:.2f} m/s", color='purple')
 
-        # Draw bounding box
-        width = np.max(cluster['points'][:, 0]) - np.min(cluster['points'][:, 0])
-        height = np.max(cluster['points'][:, 1]) - np.min(cluster['points'][:, 1])
-        ax.add_patch(Rectangle(
-            (centroid[0] - width / 2, centroid[1] - height / 2), width, height,
-            fill=False, edgecolor='purple', linewidth=1.5
-        ))
-
         # Add priority labels
         ax.text(centroid[0], centroid[1] - 0.2, f"P{cluster['priority']}", color='red')
 
-        draw_vehicle_2d(ax, position=(0, 0), size=(1.0, 1.8), color='cyan')
+    # Draw the bounding boxes of all clusters (centered on their centroids) as one collection
+    if clusters:
+        ax.add_collection(bbox_polys(clusters))
 
 # Interactive slider-based visualization
 def plot_with_slider(frames_data, num_frames=10):
@@ -132,15 +121,28 @@ def plot_with_slider(frames_data, num_frames=10):
     ax_slider = plt.axes([0.2, 0.01, 0.65, 0.03])
     slider = Slider(ax_slider, 'Frame', 1, len(frames_data) - num_frames + 1, valinit=1, valstep=1)
 
+    # Frame index built once, so every submap is a slice of it
+    submap_index = build_submap_index(frames_data)
+
+    # The vehicle patch is static: built once and re-attached after every ax.clear()
+    vehicle_patch = build_vehicle_2d(position=(0, 0), size=(1.0, 1.8), color='cyan')
+
+    # Last frame drawn, so slider events that round to the same frame are skipped
+    slider_state = {"last": None}
+
     def update(val):
         start_frame = int(slider.val)
-        submap = aggregate_submap(frames_data, start_frame, num_frames)
+        if start_frame == slider_state["last"]:
+            return
+        slider_state["last"] = start_frame
+        submap = aggregate_submap(frames_data, start_frame, num_frames, submap_index)
 
         # Perform clustering
         clusters = cluster_points(submap)
 
         ax.clear()
         plot_clusters(clusters, ax)
+        ax.add_patch(vehicle_patch)
         ax.set_xlabel('X [m]')
         ax.set_ylabel('Y [m]')
         ax.set_xlim(-10, 10)
@@ -154,8 +156,8 @@ def plot_with_slider(frames_data, num_frames=10):
     update(1)  # Initial plot
     plt.show()
 
-def draw_vehicle_2d(ax, position=(0, 0), size=(1.0, 1.8), color='cyan'):
-    """Draw a 2D representation of the vehicle on the XY plane."""
+def build_vehicle_2d(position=(0, 0), size=(1.0, 1.8), color='cyan'):
+    """Build a 2D representation of the vehicle on the XY plane."""
     # Extract position and size
     x, y = position  # Vehicle center position (X, Y)
     width, height = size  # Dimensions of the vehicle
@@ -168,19 +170,8 @@ def draw_vehicle_2d(ax, position=(0, 0), size=(1.0, 1.8), color='cyan'):
         [x - width / 2, y + height / 2]   # Top-left
     ]
 
-    # Create a polygon patch
-    from matplotlib.patches import Polygon
-    vehicle_patch = Polygon(vertices, closed=True, edgecolor='black', facecolor=color, alpha=0.3)
-
-    # Add the patch to the 2D axis
-    ax.add_patch(vehicle_patch)
-
-    # Set axis limits and labels
-    ax.set_xlim(-10, 10)  # Adjust as needed
-    ax.set_ylim(-10, 10)  # Adjust as needed
-    ax.set_xlabel('X [m]')
-    ax.set_ylabel('Y [m]')
-    ax.grid(True)
+    # Create a polygon patch (added to the axis by the caller)
+    return Polygon(vertices, closed=True, edgecolor='black', facecolor=color, alpha=0.3)
 
 
 # Example Usage
@@ -193,9 +184,10 @@ z_threshold = (0, 3.0)
 doppler_threshold = 0.1
 
 print(f"Processing file: {file_path}")
-frames_data = process_log_file(file_path, snr_threshold=15, z_min=-0.30, z_max=2.0, doppler_threshold=0.1)
+frames_data = process_log_file(file_path, snr_threshold=15, z_min=-0.30, z_max=2.0, doppler_threshold=doppler_threshold)
 
-frames_data = extract_coordinates_with_doppler(frames_data, y_threshold, z_threshold, doppler_threshold)
+# The Doppler filter is applied once, by process_log_file
+frames_data = extract_coordinates_with_doppler(frames_data, y_threshold, z_threshold)
 
 # Plot with slider and clustering
 plot_with_slider(frames_data, num_frames=10)
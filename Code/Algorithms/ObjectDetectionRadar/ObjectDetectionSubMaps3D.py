@@ -2,7 +2,6 @@ import os
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider
-from sklearn.cluster import DBSCAN
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 from matplotlib.gridspec import GridSpec
 
@@ -10,8 +9,27 @@ from DataProcessing.radar_utilsProcessing import *
 from DataProcessing.radar_utilsPlot import *
 from OccupancyGrid.OccupancyGrid import *
 
+try:
+    from numba import njit, prange
+except ImportError:
+    # numba is optional: fall back to plain Python functions
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
 SAFETY_BOX_CENTER = [0, 2, 0]  # Center position (X, Y, Z)
 SAFETY_BOX_SIZE = [2, 9, 2]   # Width, Height, Depth
+VEHICLE_BOX_MIN = [-0.5, -0.9, 0]  # Fixed vehicle box at the origin (min / max corners)
+VEHICLE_BOX_MAX = [0.5, 0.9, 0.5]
+
+# Box corners as min (0) / max (1) selectors per axis, and the 4 corners of each of the 6 faces
+BOX_CORNERS = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+                        [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]], dtype=bool)
+BOX_FACES = np.array([[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4],
+                      [2, 3, 7, 6], [1, 2, 6, 5], [4, 7, 3, 0]])
+PRIORITY_COLORS = {1: 'red', 2: 'yellow', 3: 'green'}
 
 # Create a new dictionary with frame numbers and coordinates + Doppler speed
 def extract_coordinates_with_doppler(frames_data, z_threshold=None):
@@ -28,178 +46,278 @@ def extract_coordinates_with_doppler(frames_data, z_threshold=None):
                 points = tlv["Type 1 Data"]
                 break  # Assume only one Type 1 entry per frame
 
-        # Create a list of dictionaries with required fields and filters
-        coordinates = []
-        for point in points:
-            # Apply threshold filters
-            if z_threshold is not None and not (z_threshold[0] <= point["Z [m]"] <= z_threshold[1]):
-                continue  # Skip if Z is outside the range
-
-            # Add the point to the list if it passes all filters
-            coordinates.append([
-                point["X [m]"],
-                point["Y [m]"],
-                point["Z [m]"],
-                point["Doppler [m/s]"]
-            ])
-
-        # Add the filtered coordinates list to the dictionary
-        if coordinates:  # Only add frames with valid points
-            coordinates_dict[frame_num] = np.array(coordinates)
+        # Stack the required fields into one (N, 4) array (float32, the precision of the radar data)
+        if len(points) == 0:
+            continue
+        coordinates = np.column_stack(
+            (points["X [m]"], points["Y [m]"], points["Z [m]"], points["Doppler [m/s]"])
+        ).astype(np.float32)
+
+        # Apply threshold filters as one boolean mask
+        if z_threshold is not None:
+            coordinates = coordinates[(coordinates[:, 2] >= z_threshold[0]) & (coordinates[:, 2] <= z_threshold[1])]  # Skip if Z is outside the range
+
+        # Add the filtered coordinates to the dictionary
+        if len(coordinates):  # Only add frames with valid points
+            coordinates_dict[frame_num] = coordinates
 
     return coordinates_dict
 
-# Submap aggregation function
-def aggregate_submap(frames_data, start_frame, num_frames=10):
-    aggregated_points = []
-    for frame in range(start_frame, start_frame + num_frames):
-        if frame in frames_data:
-            aggregated_points.extend(frames_data[frame])
-    return np.array(aggregated_points)
+# Running sum of the per-frame occupancy grids, so the grid of any run of frames is one subtraction
+def build_submap_grids(submap_index, x_limits, y_limits, grid_spacing):
+    """ Returns (F + 1, x_bins, y_bins) prefix sums: entry f holds the grid of the first f indexed frames. """
+    frames, all_points, frame_ptr = submap_index
+    frame_grids = [calculate_occupancy_grid(all_points[frame_ptr[i]:frame_ptr[i + 1], :2], x_limits, y_limits, grid_spacing)
+                   for i in range(len(frames))]
+    empty_grid = calculate_occupancy_grid(np.empty((0, 2)), x_limits, y_limits, grid_spacing)
+    return np.cumsum([empty_grid] + frame_grids, axis=0, dtype=np.float32)  # Counts, exact in float32
+
+# Occupancy grid of a submap, from the running sums
+def aggregate_submap_grid(start_frame, num_frames, submap_index, submap_grids):
+    first, last = np.searchsorted(submap_index[0], [start_frame, start_frame + num_frames])
+    return submap_grids[last] - submap_grids[first]
+
+# -------------------------------
+# FUNCTION: Grid DBSCAN
+# -------------------------------
+@njit
+def voxel_neighbors(xyz, i, cell_keys, sorted_keys, order, key_steps, eps2, neighbors, out_start, write):
+    """
+    Scans the 27 voxels around point i for points within eps (distance <= eps, the point itself included).
+
+    Returns the number of neighbors; with write, they are also stored from neighbors[out_start] on.
+    """
+    count = 0
+    for dx in range(-1, 2):
+        for dy in range(-1, 2):
+            for dz in range(-1, 2):
+                key = cell_keys[i] + dx * key_steps[0] + dy * key_steps[1] + dz
+                # Points of one voxel are a run of the key-sorted order
+                first = np.searchsorted(sorted_keys, key)
+                last = np.searchsorted(sorted_keys, key + 1)
+                for k in range(first, last):
+                    j = order[k]
+                    diff_x = xyz[j, 0] - xyz[i, 0]
+                    diff_y = xyz[j, 1] - xyz[i, 1]
+                    diff_z = xyz[j, 2] - xyz[i, 2]
+                    if diff_x * diff_x + diff_y * diff_y + diff_z * diff_z <= eps2:
+                        if write:
+                            neighbors[out_start + count] = j
+                        count += 1
+    return count
+
+@njit(parallel=True)
+def dbscan3d_grid(xyz, eps, min_samples):
+    """
+    DBSCAN on (N, 3) points, indexed by a uniform voxel grid with cell size eps.
+
+    Gives the same labels as sklearn's DBSCAN (clusters numbered in order of their first
+    core point, border points joining the first cluster that reaches them, noise = -1).
+    """
+    num_points = xyz.shape[0]
+    labels = np.full(num_points, -1, dtype=np.int64)
+    if num_points == 0:
+        return labels
+    xyz = xyz.astype(np.float64)
+
+    # 1. Hash every point to its voxel; the grid is padded by one voxel so all 27 neighbors have valid keys
+    cells = np.empty((num_points, 3), dtype=np.int64)
+    for i in range(num_points):
+        for axis in range(3):
+            cells[i, axis] = int(np.floor(xyz[i, axis] / eps))
+    cell_min = np.empty(3, dtype=np.int64)
+    grid_shape = np.empty(3, dtype=np.int64)
+    for axis in range(3):
+        cell_min[axis] = cells[:, axis].min() - 1
+        grid_shape[axis] = cells[:, axis].max() - cell_min[axis] + 2
+    key_steps = np.array([grid_shape[1] * grid_shape[2], grid_shape[2]])
+    cell_keys = ((cells[:, 0] - cell_min[0]) * key_steps[0] + (cells[:, 1] - cell_min[1]) * key_steps[1]
+                 + (cells[:, 2] - cell_min[2]))
+    order = np.argsort(cell_keys)
+    sorted_keys = cell_keys[order]
+    eps2 = eps * eps
+
+    # 2. First pass: count the neighbors of every point
+    neighbor_counts = np.zeros(num_points, dtype=np.int64)
+    no_neighbors = np.empty(0, dtype=np.int64)
+    for i in prange(num_points):
+        neighbor_counts[i] = voxel_neighbors(xyz, i, cell_keys, sorted_keys, order, key_steps, eps2,
+                                             no_neighbors, 0, False)
+
+    # 3. Second pass: list the neighbors (every point writes its own slice of neighbors)
+    neighbor_ptr = np.zeros(num_points + 1, dtype=np.int64)
+    neighbor_ptr[1:] = np.cumsum(neighbor_counts)
+    neighbors = np.empty(neighbor_ptr[-1], dtype=np.int64)
+    for i in prange(num_points):
+        voxel_neighbors(xyz, i, cell_keys, sorted_keys, order, key_steps, eps2, neighbors, neighbor_ptr[i], True)
+
+    # 4. Grow a cluster from every unlabeled core point, expanding only through core points
+    stack = np.empty(num_points, dtype=np.int64)
+    cluster_id = 0
+    for i in range(num_points):
+        if labels[i] != -1 or neighbor_counts[i] < min_samples:
+            continue
+        labels[i] = cluster_id
+        stack[0] = i
+        top = 1
+        while top > 0:
+            top -= 1
+            point = stack[top]
+            for k in range(neighbor_ptr[point], neighbor_ptr[point + 1]):
+                neighbor = neighbors[k]
+                if labels[neighbor] == -1:
+                    labels[neighbor] = cluster_id
+                    if neighbor_counts[neighbor] >= min_samples:
+                        stack[top] = neighbor
+                        top += 1
+        cluster_id += 1
+
+    return labels
 
 # -------------------------------
 # FUNCTION: Cluster Points
 # -------------------------------
 def cluster_points(points, eps=1.0, min_samples=2):
     """ Perform DBSCAN clustering and filter clusters based on priorities. """
-    dbscan = DBSCAN(eps=eps, min_samples=min_samples).fit(points[:, :3])  # Use X, Y, Z for clustering
-    labels = dbscan.labels_
-
-    clusters = {}
-    for cluster_id in np.unique(labels):
-        if cluster_id == -1:  # Ignore noise
-            continue
-        cluster_points = points[labels == cluster_id]
-        size = len(cluster_points)
-
-        # Ignore clusters with <3 points (Priority 3)
-        if size < 3:
-            continue
+    # Use X, Y, Z for clustering, as one contiguous float32 block
+    points_xyz = np.ascontiguousarray(points[:, :3], dtype=np.float32)
+    labels = dbscan3d_grid(points_xyz, eps, min_samples)
+
+    # Group the clustered (non-noise) points by label with one stable sort
+    clustered = labels != -1
+    order = np.argsort(labels[clustered], kind='stable')
+    sorted_labels = labels[clustered][order]
+    sorted_points = points[clustered][order]
+    if len(sorted_labels) == 0:
+        return {}
+
+    # Start and size of every cluster's run, then drop clusters with <3 points before any reduction
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_labels)) + 1]
+    sizes = np.diff(np.r_[starts, len(sorted_labels)])
+    keep = sizes >= 3
+    cluster_ids, starts, sizes = sorted_labels[starts][keep], starts[keep], sizes[keep]
+    if len(starts) == 0:
+        return {}
+
+    # Centroids and bounding boxes of all clusters, one reduction each (kept runs are
+    # reduced on their own, so the dropped runs in between never enter a result)
+    ends = starts + sizes
+    bounds = np.ravel(np.column_stack((starts, ends)))
+    if bounds[-1] == len(sorted_points):
+        bounds = bounds[:-1]  # reduceat indices must be in range; the last run then reduces to the end
+    centroids = (np.add.reduceat(sorted_points, bounds, axis=0)[::2] / sizes[:, np.newaxis]).astype(sorted_points.dtype)
+    bbox_min = np.minimum.reduceat(sorted_points, bounds, axis=0)[::2]
+    bbox_max = np.maximum.reduceat(sorted_points, bounds, axis=0)[::2]
+
+    # Priority by cluster size: >= 10 points -> 3, 5..9 -> 2, fewer -> 1
+    priorities = np.select([sizes >= 10, sizes >= 5], [3, 2], default=1)
+
+    # Store centroid, priority and bounding box
+    return {cluster_id: {'centroid': centroid, 'priority': priority, 'points': sorted_points[start:end],
+                         'bbox_min': box_min, 'bbox_max': box_max}
+            for cluster_id, start, end, centroid, priority, box_min, box_max
+            in zip(cluster_ids.tolist(), starts.tolist(), ends.tolist(), centroids, priorities.tolist(), bbox_min, bbox_max)}
 
-        # Store centroid and priority
-        centroid = np.mean(cluster_points, axis=0)
-        if size >= 10:
-            priority = 3
-        elif size < 10 and size >= 5:
-            priority = 2
-        elif size < 5:
-            priority = 1
-        else:
-            priority = 4
-        clusters[cluster_id] = {'centroid': centroid, 'priority': priority, 'points': cluster_points}
+# -------------------------------
+# FUNCTION: Box Faces
+# -------------------------------
+def box_faces(box_min, box_max):
+    """ Faces of axis-aligned boxes: (K, 3) min/max corners give (K, 6, 4, 3) face vertices. """
+    box_min = np.atleast_2d(box_min)[:, np.newaxis, :3]
+    box_max = np.atleast_2d(box_max)[:, np.newaxis, :3]
+    vertices = np.where(BOX_CORNERS, box_max, box_min)  # (K, 8, 3)
+    return vertices[:, BOX_FACES, :]
 
-    return clusters
+# -------------------------------
+# FUNCTION: Vehicle Box
+# -------------------------------
+def build_vehicle_poly():
+    """ Build the fixed vehicle box at the origin; it is static, so it is added to the axis once. """
+    return Poly3DCollection(box_faces(VEHICLE_BOX_MIN, VEHICLE_BOX_MAX)[0], alpha=0.3, facecolor='cyan')
 
 # -------------------------------
 # FUNCTION: Plot Clusters
 # -------------------------------
-def plot_clusters_3d(clusters, ax):
+def plot_clusters_3d(clusters, ax, safety_box, cluster_artists, cluster_boxes):
     """ Plot clusters, visualize bounding boxes and priorities in 3D, and display average Doppler speed. """
-    for cid, cluster in clusters.items():
+    # Grow the pool of per-cluster artists (points, centroid, Doppler label, priority label) to one
+    # entry per cluster; the artists stay on the axis and the surplus ones are hidden.
+    # The cluster points are not depth shaded: with a single color the marker is rasterized once and
+    # stamped at every point, instead of being drawn as a separate path per point
+    while len(cluster_artists) < len(clusters):
+        cluster_artists.append((ax.scatter([], [], [], depthshade=False), ax.scatter([], [], [], c='black', marker='x'),
+                                ax.text(0, 0, 0, "", color='purple'), ax.text(0, 0, 0, "", color='red')))
+    for artists in cluster_artists:
+        for artist in artists:
+            artist.set_visible(False)
+
+    for (cid, cluster), artists in zip(clusters.items(), cluster_artists):
+        points_scatter, centroid_scatter, doppler_label, priority_label = artists
         centroid = cluster['centroid']
         priority = cluster['priority']
         points = cluster['points']
         doppler_avg = np.mean(points[:, 2])  # Calculate average Doppler speed
 
-        # Scatter points and centroid
-        ax.scatter(points[:, 0], points[:, 1], points[:, 2], label=f"Cluster {cid}")
-        ax.scatter(centroid[0], centroid[1], centroid[2], c='black', marker='x')  # Centroid marker
+        # Scatter points and centroid (moved in place)
+        points_scatter._offsets3d = (points[:, 0], points[:, 1], points[:, 2])
+        points_scatter.set_label(f"Cluster {cid}")
+        centroid_scatter._offsets3d = (centroid[0:1], centroid[1:2], centroid[2:3])  # Centroid marker
 
         # Display the average Doppler speed
-        ax.text(centroid[0] + 0.2, centroid[1] + 0.2, centroid[2] + 0.2, f"{doppler_avg:.2f} m/s", color='purple')
+        doppler_label.set_position_3d((centroid[0] + 0.2, centroid[1] + 0.2, centroid[2] + 0.2))
+        doppler_label.set_text(f"{doppler_avg:.2f} m/s")
         # Add priority labels
-        ax.text(centroid[0] - 0.2, centroid[1] - 0.2, centroid[2] - 0.2, f"P{cluster['priority']}", color='red')
-        # Draw bounding box (cube)
-        min_vals = np.min(points, axis=0)
-        max_vals = np.max(points, axis=0)
-        r = [[min_vals[0], max_vals[0]], [min_vals[1], max_vals[1]], [min_vals[2], max_vals[2]]]
-        vertices = [
-            [r[0][0], r[1][0], r[2][0]], [r[0][1], r[1][0], r[2][0]],
-            [r[0][1], r[1][1], r[2][0]], [r[0][0], r[1][1], r[2][0]],
-            [r[0][0], r[1][0], r[2][1]], [r[0][1], r[1][0], r[2][1]],
-            [r[0][1], r[1][1], r[2][1]], [r[0][0], r[1][1], r[2][1]]
-        ]
-        edges = [
-            [vertices[i] for i in [0, 1, 2, 3]],
-            [vertices[i] for i in [4, 5, 6, 7]],
-            [vertices[i] for i in [0, 1, 5, 4]],
-            [vertices[i] for i in [2, 3, 7, 6]],
-            [vertices[i] for i in [1, 2, 6, 5]],
-            [vertices[i] for i in [4, 7, 3, 0]]
-        ]
-        if priority == 1:
-            ax.add_collection3d(Poly3DCollection(edges, alpha=0.2, facecolor='red'))
-        elif priority == 2:
-            ax.add_collection3d(Poly3DCollection(edges, alpha=0.2, facecolor='yellow'))
-        elif priority == 3:
-            ax.add_collection3d(Poly3DCollection(edges, alpha=0.2, facecolor='green'))
-        else:
-            ax.add_collection3d(Poly3DCollection(edges, alpha=0.2, facecolor='gray'))
+        priority_label.set_position_3d((centroid[0] - 0.2, centroid[1] - 0.2, centroid[2] - 0.2))
+        priority_label.set_text(f"P{cluster['priority']}")
+
+        for artist in artists:
+            artist.set_visible(True)
+
+    # Update the bounding boxes (cubes) of all clusters, one collection colored by priority
+    if clusters:
+        min_vals = np.array([cluster['bbox_min'] for cluster in clusters.values()])
+        max_vals = np.array([cluster['bbox_max'] for cluster in clusters.values()])
+        faces = box_faces(min_vals, max_vals)
+        colors = np.repeat([PRIORITY_COLORS.get(cluster['priority'], 'gray') for cluster in clusters.values()], len(BOX_FACES))
+        cluster_boxes.set_verts(faces.reshape(-1, 4, 3))
+        cluster_boxes.set_facecolor(colors)
+    else:
+        cluster_boxes.set_verts([])
 
     # Monitor safety box
-    monitor_safety_box(clusters, ax, SAFETY_BOX_CENTER, SAFETY_BOX_SIZE)
-
-    # Draw fixed rectangle (vehicle) at origin
-    vertices = [[-0.5, -0.9, 0], [0.5, -0.9, 0], [0.5, 0.9, 0], [-0.5, 0.9, 0],
-                [-0.5, -0.9, 0.5], [0.5, -0.9, 0.5], [0.5, 0.9, 0.5], [-0.5, 0.9, 0.5]]
-    edges = [
-        [vertices[i] for i in [0, 1, 2, 3]],
-        [vertices[i] for i in [4, 5, 6, 7]],
-        [vertices[i] for i in [0, 1, 5, 4]],
-        [vertices[i] for i in [2, 3, 7, 6]],
-        [vertices[i] for i in [1, 2, 6, 5]],
-        [vertices[i] for i in [4, 7, 3, 0]]
-    ]
-    ax.add_collection3d(Poly3DCollection(edges, alpha=0.3, facecolor='cyan'))
+    monitor_safety_box(clusters, safety_box, SAFETY_BOX_CENTER, SAFETY_BOX_SIZE)
 
 # -------------------------------
 # FUNCTION: Safety Box
 # -------------------------------
-def monitor_safety_box(clusters, ax, box_center, box_size):
+@njit
+def any_point_in_box(points_xyz, box_min, box_max):
+    """ Check whether any point lies within the box, stopping at the first hit. """
+    # Bounds are read once; the box limits stay float64 so float32 points are compared exactly against them
+    x_min, y_min, z_min = box_min[0], box_min[1], box_min[2]
+    x_max, y_max, z_max = box_max[0], box_max[1], box_max[2]
+    for k in range(points_xyz.shape[0]):
+        if (x_min <= points_xyz[k, 0] <= x_max and y_min <= points_xyz[k, 1] <= y_max
+                and z_min <= points_xyz[k, 2] <= z_max):
+            return True
+    return False
+
+def monitor_safety_box(clusters, safety_box, box_center, box_size):
     """ Monitor clusters for collisions with a static safety box and trigger warnings. """
 
-    # Remove previous safety box by identifying blue Poly3DCollection and removing them
-    collections_to_remove = []
-    for collection in ax.collections:
-        # Check if the collection is a Poly3DCollection with blue color
-        if isinstance(collection, Poly3DCollection):
-            facecolor = collection.get_facecolor()[0][:3]  # Get RGB values
-            if np.allclose(facecolor, [0.0, 0.0, 1.0]):  # Check if it's blue
-                collections_to_remove.append(collection)
-
-    # Remove identified collections
-    for collection in collections_to_remove:
-        collection.remove()
-
     # Calculate box boundaries
     box_min = np.array(box_center) - np.array(box_size) / 2
     box_max = np.array(box_center) + np.array(box_size) / 2
 
-    # Draw the safety box in blue
-    vertices = [
-        [box_min[0], box_min[1], box_min[2]], [box_max[0], box_min[1], box_min[2]],
-        [box_max[0], box_max[1], box_min[2]], [box_min[0], box_max[1], box_min[2]],
-        [box_min[0], box_min[1], box_max[2]], [box_max[0], box_min[1], box_max[2]],
-        [box_max[0], box_max[1], box_max[2]], [box_min[0], box_max[1], box_max[2]]
-    ]
-    edges = [
-        [vertices[i] for i in [0, 1, 2, 3]],
-        [vertices[i] for i in [4, 5, 6, 7]],
-        [vertices[i] for i in [0, 1, 5, 4]],
-        [vertices[i] for i in [2, 3, 7, 6]],
-        [vertices[i] for i in [1, 2, 6, 5]],
-        [vertices[i] for i in [4, 7, 3, 0]]
-    ]
-    ax.add_collection3d(Poly3DCollection(edges, alpha=0.3, facecolor='blue'))
+    # Move the (single, blue) safety box artist to the box boundaries
+    safety_box.set_verts(box_faces(box_min, box_max)[0])
 
     # Check if any point in the cluster lies within the safety box (ignoring Doppler values)
     for cid, cluster in clusters.items():
         points_xyz = cluster['points'][:, :3]  # Only X, Y, Z coordinates
         doppler_speeds = cluster['points'][:, 3]  # Doppler values
         priority = cluster['priority']
-        inside_box = np.all((points_xyz >= box_min) & (points_xyz <= box_max), axis=1)
-
-        if np.any(inside_box):
+        if any_point_in_box(points_xyz, box_min, box_max):
             avg_doppler = np.mean(doppler_speeds)  # Calculate average Doppler speed
             print(f"[!] WARNING: Cluster {cid} in safety zone!")
             print(f"[!] WARNING: Cluster with priority: {priority} in safety zone!")
@@ -221,39 +339,122 @@ def plot_with_slider(frames_data, num_frames=10):
     ax_slider = plt.axes([0.2, 0.01, 0.65, 0.03])
     slider = Slider(ax_slider, 'Frame', 1, len(frames_data) - num_frames + 1, valinit=1, valstep=1)
 
+    # Frame index built once, so every submap is a slice of it
+    submap_index = build_submap_index(frames_data)
+
+    # Clusters per submap, computed once per start frame and reused when the slider returns to it
+    submap_clusters = {}
+
+    # Helper function to get (and cache) the clusters of a submap
+    def get_submap_clusters(start_frame, submap):
+        if start_frame not in submap_clusters:
+            submap_clusters[start_frame] = cluster_points(submap)
+        return submap_clusters[start_frame]
+
+    # The 3D axis is set up once and never cleared; update() only moves its artists
+    ax.set_xlabel('X [m]')
+    ax.set_ylabel('Y [m]')
+    ax.set_zlabel('Z [m]')
+    ax.set_xlim(-10, 10)
+    ax.set_ylim(0, 15)
+    ax.set_zlim(-0.30, 10)
+
+    # The safety box is one artist, created once and only moved by monitor_safety_box
+    safety_box = Poly3DCollection([], alpha=0.3, facecolor='blue')
+    ax.add_collection3d(safety_box)
+
+    # All cluster bounding boxes share one collection, whose faces are swapped on every update
+    cluster_boxes = Poly3DCollection([], alpha=0.2)
+    ax.add_collection3d(cluster_boxes)
+
+    # Draw fixed rectangle (vehicle) at origin
+    ax.add_collection3d(build_vehicle_poly())
+
+    # Pool of per-cluster artists, grown as needed and reused across updates
+    cluster_artists = []
+
+    # Occupancy grid layout, colormap and image are set up once; update() only swaps the image data
+    x_limits=(-8, 8)
+    y_limits=(0, 15)
+    grid_spacing=1
+    cmap, norm = create_custom_colormap()
+    empty_grid = calculate_occupancy_grid(np.empty((0, 2)), x_limits, y_limits, grid_spacing)
+    submap_grids = build_submap_grids(submap_index, x_limits, y_limits, grid_spacing)
+    grid_image = ay.imshow(empty_grid.T, extent=(x_limits[0], x_limits[1], y_limits[0], y_limits[1]), origin='lower', cmap=cmap, aspect='auto')
+    ay.set_xlabel('X [m]')
+    ay.set_ylabel('Y [m]')
+    ay.set_xlim(-10, 10)
+    ay.set_ylim(0, 15)
+
+    # Blitting: the 3D collections and labels, the grid image, the titles and the slider are animated,
+    # so a full draw only renders the static background (panes, grids, ticks, axis labels), which is
+    # saved after every full draw; redraw() restores it and draws just the animated artists on top
+    blit = {"background": None}
+
+    # Helper function to draw the animated artists in the same order as a full draw
+    def draw_animated():
+        # Project the 3D collections and stack them by depth above the grids, as Axes3D.draw does
+        zorder = max(axis.get_zorder() for axis in (ax.xaxis, ax.yaxis, ax.zaxis)) + 1
+        visible = [collection for collection in ax.collections if collection.get_visible()]
+        for collection in sorted(visible, key=lambda collection: collection.do_3d_projection(), reverse=True):
+            collection.zorder = zorder
+            zorder += 1
+        for axis in (ax, ay):
+            artists = [artist for artist in axis.get_children() if artist.get_animated()]
+            for artist in sorted(artists, key=lambda artist: artist.get_zorder()):
+                fig.draw_artist(artist)
+
+    if fig.canvas.supports_blit:
+        ax_slider.set_animated(True)
+        slider.drawon = False  # The slider is drawn by redraw() instead of a full draw
+
+        def on_draw(event):
+            blit["background"] = fig.canvas.copy_from_bbox(fig.bbox)
+            draw_animated()
+            fig.draw_artist(ax_slider)
+        fig.canvas.mpl_connect("draw_event", on_draw)
+
+    # Helper function to show the updated artists
+    def redraw():
+        if not fig.canvas.supports_blit:
+            plt.draw()
+            return
+        # Pooled cluster artists are created during updates, so they are marked here, before any draw
+        # (the spines of the grid axis too, as they are drawn over the image)
+        for artist in [*ax.collections, *ax.texts, ax.title, *ay.images, *ay.spines.values(), ay.title]:
+            artist.set_animated(True)
+        if blit["background"] is None:
+            fig.canvas.draw_idle()  # No full draw yet
+            return
+        fig.canvas.restore_region(blit["background"])
+        draw_animated()
+        fig.draw_artist(ax_slider)
+        fig.canvas.blit(fig.bbox)
+        fig.canvas.flush_events()
+
+    # Last frame drawn, so slider events that round to the same frame are skipped
+    slider_state = {"last": None}
+
     def update(val):
-        x_limits=(-8, 8)
-        y_limits=(0, 15)
-        grid_spacing=1
         start_frame = int(slider.val)
-        submap = aggregate_submap(frames_data, start_frame, num_frames)
-        occupancyGrid = calculate_occupancy_grid(submap[:, :2], x_limits, y_limits, grid_spacing)
-
-        # Perform clustering
-        clusters = cluster_points(submap)
-
-        ax.clear()
-        ay.clear()
-        plot_clusters_3d(clusters, ax)
-        ax.set_xlabel('X [m]')
-        ax.set_ylabel('Y [m]')
-        ax.set_zlabel('Z [m]')
-        ay.set_xlabel('X [m]')
-        ay.set_ylabel('Y [m]')
-        ax.set_xlim(-10, 10)
-        ax.set_ylim(0, 15)
-        ax.set_zlim(-0.30, 10)
-        ay.set_xlim(-10, 10)
-        ay.set_ylim(0, 15)
-        ax.set_title(f"Clusters (Frames {start_frame} to {start_frame + num_frames - 1})")
-        ay.set_title(f"Grid Mapping (Frames {start_frame} to {start_frame + num_frames - 1})")
+        if start_frame == slider_state["last"]:
+            return
+        slider_state["last"] = start_frame
+        submap = aggregate_submap(frames_data, start_frame, num_frames, submap_index)
+        occupancyGrid = aggregate_submap_grid(start_frame, num_frames, submap_index, submap_grids)
+
+        # Perform clustering (cached per start frame)
+        clusters = get_submap_clusters(start_frame, submap)
+
+        plot_clusters_3d(clusters, ax, safety_box, cluster_artists, cluster_boxes)
+        # Only the title texts change (set_title() would also reset the position the last full draw gave them)
+        ax.title.set_text(f"Clusters (Frames {start_frame} to {start_frame + num_frames - 1})")
+        ay.title.set_text(f"Grid Mapping (Frames {start_frame} to {start_frame + num_frames - 1})")
         #ax.legend()
-        plt.draw()
-
-        # Get the custom colormap and normalizer
-        cmap, norm = create_custom_colormap()
 
-        ay.imshow(occupancyGrid.T, extent=(x_limits[0], x_limits[1], y_limits[0], y_limits[1]), origin='lower', cmap=cmap, aspect='auto')
+        grid_image.set_data(occupancyGrid.T)
+        grid_image.autoscale()  # Rescale colors to the new data, as a fresh imshow() would
+        redraw()
 
 
     slider.on_changed(update)
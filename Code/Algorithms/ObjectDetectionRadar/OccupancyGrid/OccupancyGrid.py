@@ -1,12 +1,35 @@
 import numpy as np
 from matplotlib.colors import ListedColormap, BoundaryNorm
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: fall back to plain Python functions
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Count the points falling into each cell of an (x_bins, y_bins) grid in compiled code
+@njit
+def fill_occupancy_grid(points, x_min, x_max, y_min, y_max, grid_spacing, x_bins, y_bins):
+    occupancy_grid = np.zeros((x_bins, y_bins))
+    for k in range(points.shape[0]):
+        x = points[k, 0]
+        y = points[k, 1]
+        if x_min <= x < x_max and y_min <= y < y_max:
+            x_idx = int((x - x_min) / grid_spacing)
+            y_idx = int((y - y_min) / grid_spacing)
+            if x_idx < x_bins and y_idx < y_bins:
+                occupancy_grid[x_idx, y_idx] += 1
+    return occupancy_grid
+
 def calculate_occupancy_grid(points, x_limits, y_limits, grid_spacing):
     """
     Calculate an occupancy grid for the given points.
 
     Parameters:
-        points (list of tuples): List of (x, y) or (x, y, z) coordinates.
+        points (list of tuples or np.ndarray): (x, y) or (x, y, z) coordinates.
         x_limits (tuple): The x-axis limits as (xmin, xmax).
         y_limits (tuple): The y-axis limits as (ymin, ymax).
         grid_spacing (int): Spacing between grid cells.
@@ -18,24 +41,15 @@ def calculate_occupancy_grid(points, x_limits, y_limits, grid_spacing):
     x_bins = int((x_limits[1] - x_limits[0]) / grid_spacing)
     y_bins = int((y_limits[1] - y_limits[0]) / grid_spacing)
 
-    # Initialize the grid
-    occupancy_grid = np.zeros((x_bins, y_bins))
-
-    # Populate the grid
-    for point in points:
-        if len(point) == 3:
-            x, y, _ = point  # Unpack x, y, z
-        elif len(point) == 2:
-            x, y = point  # Unpack x, y only
-        else:
-            raise ValueError(f"Point format not supported: {point}")
+    points = np.asarray(points, dtype=float)
+    if points.size == 0:
+        return np.zeros((x_bins, y_bins))
+    if points.ndim != 2 or points.shape[1] not in (2, 3):
+        raise ValueError(f"Point format not supported: {points.shape}")
 
-        if x_limits[0] <= x < x_limits[1] and y_limits[0] <= y < y_limits[1]:
-            x_idx = int((x - x_limits[0]) / grid_spacing)
-            y_idx = int((y - y_limits[0]) / grid_spacing)
-            occupancy_grid[x_idx, y_idx] += 1
-
-    return occupancy_grid
+    # Bin all points in one compiled pass
+    return fill_occupancy_grid(points, float(x_limits[0]), float(x_limits[1]), float(y_limits[0]), float(y_limits[1]),
+                               float(grid_spacing), x_bins, y_bins)
 
 def create_custom_colormap():
         """
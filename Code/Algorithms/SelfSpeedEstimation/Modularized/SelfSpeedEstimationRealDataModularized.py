@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+from collections import deque
 
 import dataDecoderBrokenTimestamp
 import pointFilter
@@ -18,26 +19,46 @@ fig, axes = plt.subplots(1, 1, figsize=(10, 6))
 ax1 = axes
 
 #Adding everything for kalman filtering the self speed
-self_speed_history = []
-kf_self_speed_history = []
 kf_self_speed = KalmanFilter(process_variance=0.01, measurement_variance=0.1)
-    
-def update_self_speed_plot(self_speed_history, kf_self_speed_history):
-    ax1.clear()
-    ax1.set_xlim(0, 200)
-    ax1.set_ylim(-5, 1)
-    ax1.set_title("Re-calculated self-speed over time")
-    ax1.set_xlabel("frame")
-    ax1.set_ylabel("Self-speed (m/s)")
 
-    #Creating a vector for the x axis
-    x_vec = np.arange(len(self_speed_history))
+#Setting up the self-speed plot once; every frame only replaces the data of its two lines
+ax1.set_xlim(0, 200)
+ax1.set_ylim(-5, 1)
+ax1.set_title("Re-calculated self-speed over time")
+ax1.set_xlabel("frame")
+ax1.set_ylabel("Self-speed (m/s)")
+raw_line, = ax1.plot([], [], linestyle='--') #Raw self-speed
+filtered_line, = ax1.plot([], []) #Filtered self-speed
+
+#Blitting: the lines are animated, so a full draw only renders the static axis, which is saved
+#after every full draw and restored before the lines are drawn on top of it
+#(the spines are animated too, as they are drawn over the lines)
+blit = {"background": None, "artists": [raw_line, filtered_line, *ax1.spines.values()]}
+if fig.canvas.supports_blit:
+    for artist in blit["artists"]:
+        artist.set_animated(True)
 
-    #Plotting raw self-speed
-    ax1.plot(x_vec, self_speed_history, linestyle='--')
+    def on_draw(event):
+        blit["background"] = fig.canvas.copy_from_bbox(fig.bbox)
+        for artist in blit["artists"]:
+            ax1.draw_artist(artist)
+    fig.canvas.mpl_connect("draw_event", on_draw)
+
+def update_self_speed_plot(self_speed_history, kf_self_speed_history):
+    #Taking the x axis as a view of the preallocated frame axis
+    x_vec = frame_axis[:len(self_speed_history)]
 
-    #Plotting filtered self-speed
-    ax1.plot(x_vec, kf_self_speed_history)
+    #Plotting raw and filtered self-speed
+    raw_line.set_data(x_vec, self_speed_history)
+    filtered_line.set_data(x_vec, kf_self_speed_history)
+
+    if blit["background"] is None:
+        fig.canvas.draw_idle() #No blitting support, or no full draw yet
+        return
+    fig.canvas.restore_region(blit["background"])
+    for artist in blit["artists"]:
+        ax1.draw_artist(artist)
+    fig.canvas.blit(fig.bbox)
 
 
 #Getting the data
@@ -45,26 +66,36 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 log_file = os.path.abspath(os.path.join(script_dir, "../../../../Logs/LogsPart3/DynamicMonitoring/30fps_straight_3x3_log_2024-12-16.csv"))
 frames = dataDecoderBrokenTimestamp.decodeData(log_file)
 
+#Preallocating the frame axis and the raw and filtered self-speed of every frame (filled in frame by frame)
+frame_axis = np.arange(len(frames))
+self_speed_history = np.zeros(len(frames))
+kf_self_speed_history = np.zeros(len(frames))
+
+#Ring buffer of the point clouds of the current and the past frames
+frame_window = deque(maxlen=NUM_PAST_FRAMES + 1)
+
 #Processing frame by frame
 for frm in range(len(frames)):
-    #Getting the point cloud of the current frame
-    point_cloud = frames[frm][1]
-    #Appending the number of past frames to the point cloud
-    for past_frm in range(max(0, frm - NUM_PAST_FRAMES), frm, 1):
-        point_cloud = point_cloud + frames[past_frm][1]
+    #Adding the current frame to the window (the oldest frame drops out)
+    frame_window.append(frames[frm][1])
+
+    #Getting the point cloud of the current frame, followed by the points of the past frames
+    past_frames = list(frame_window)[:-1]
+    point_cloud = np.concatenate([frame_window[-1]] + past_frames)
     
     #Calculating the self speed
-    #Filtering the input points
-    filteredPointCloud = pointFilter.filterCartesianZ(point_cloud, 0, 3) #Filtering everything below 0 and above 3m
-    filteredPointCloud = pointFilter.filterSphericalPhi(filteredPointCloud, -80, 80)
+    #Filtering the input points, with the masks combined so the point cloud is indexed once
+    keep = pointFilter.maskCartesianZ(point_cloud, 0, 3) #Filtering everything below 0 and above 3m
+    keep &= pointFilter.maskSphericalPhi(point_cloud, -80, 80)
+    filteredPointCloud = point_cloud[keep]
     self_speed = selfSpeedEstimator.estimate_self_speed(filteredPointCloud)
-    self_speed_history.append(self_speed)
+    self_speed_history[frm] = self_speed
 
     #Kalman filtering the self speed
     filtered_self_speed = kf_self_speed.update(self_speed)
-    kf_self_speed_history.append(filtered_self_speed)    
+    kf_self_speed_history[frm] = filtered_self_speed
 
-    update_self_speed_plot(self_speed_history, kf_self_speed_history)
+    update_self_speed_plot(self_speed_history[:frm + 1], kf_self_speed_history[:frm + 1])
 
     #Waiting
     plt.pause(0.01)
@@ -1,89 +1,121 @@
 import numpy as np
 
-__all__ = ['filterCartesianX', 'filterCartesianY', 'filterCartesianZ', 'filterSphericalR', 'filterSphericalTheta', 'filterSphericalPhi']
+__all__ = ['filterCartesianX', 'filterCartesianY', 'filterCartesianZ', 'filterSphericalR', 'filterSphericalTheta', 'filterSphericalPhi',
+           'maskCartesianX', 'maskCartesianY', 'maskCartesianZ', 'maskDoppler', 'maskSphericalR', 'maskSphericalTheta', 'maskSphericalPhi',
+           'asPointArray']
+
+# The point clouds are structured arrays with fields x, y, z and doppler; every mask function
+# compares a whole column at once and returns which points pass, so several masks can be
+# combined with & and applied in one go. The filter functions apply a single mask
+
+POINT_DTYPE = np.dtype([("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("doppler", "<f4")])
+
+def asPointArray(inputPoints):
+    #Lists of point dicts are converted to the structured array layout, arrays are used as they are
+    if isinstance(inputPoints, np.ndarray):
+        return inputPoints
+    return np.array([(point["x"], point["y"], point["z"], point["doppler"]) for point in inputPoints], dtype=POINT_DTYPE)
+
+def maskCartesianX(inputPoints, x_min, x_max):
+    inputPoints = asPointArray(inputPoints)
+    point_x = inputPoints["x"]
+    return (point_x >= x_min) & (point_x <= x_max)
+
+def maskCartesianY(inputPoints, y_min, y_max):
+    inputPoints = asPointArray(inputPoints)
+    point_y = inputPoints["y"]
+    return (point_y >= y_min) & (point_y <= y_max)
+
+def maskCartesianZ(inputPoints, z_min, z_max):
+    inputPoints = asPointArray(inputPoints)
+    point_z = inputPoints["z"]
+    return (point_z >= z_min) & (point_z <= z_max)
+
+def maskDoppler(inputPoints, doppler_min, doppler_max):
+    inputPoints = asPointArray(inputPoints)
+    point_doppler = inputPoints["doppler"]
+    return (point_doppler >= doppler_min) & (point_doppler <= doppler_max)
+
+def maskSphericalR(inputPoints, r_min, r_max):
+    inputPoints = asPointArray(inputPoints)
+    #Angles and ranges are computed in float64, like the former per-point math
+    x, y, z = (inputPoints[axis].astype(float) for axis in ("x", "y", "z"))
+    point_r = np.sqrt(x**2 + y**2 + z**2)
+    return (point_r >= r_min) & (point_r <= r_max)
+
+def maskSphericalTheta(inputPoints, theta_min, theta_max):
+    inputPoints = asPointArray(inputPoints)
+    x, y, z = (inputPoints[axis].astype(float) for axis in ("x", "y", "z"))
+    point_r = np.sqrt(x**2 + y**2 + z**2)
+    point_theta = np.rad2deg(np.arccos(z / point_r))
+    return (point_theta >= theta_min) & (point_theta <= theta_max)
+
+def maskSphericalPhi(inputPoints, phi_min, phi_max):
+    inputPoints = asPointArray(inputPoints)
+    #arctan(x/y) folds points behind the sensor (y < 0) into (-90, 90); x = y = 0 gives NaN and is rejected
+    with np.errstate(divide="ignore", invalid="ignore"):
+        point_phi = np.rad2deg(np.arctan(inputPoints["x"].astype(float) / inputPoints["y"].astype(float)))
+    return (point_phi >= phi_min) & (point_phi <= phi_max)
 
 def filterCartesianX(inputPoints, x_min, x_max):
-    filteredPoints = []
     try:
-        for i in range(len(inputPoints)):
-            point_x = inputPoints[i]["x"]
-            if point_x >= x_min and point_x <= x_max:
-                filteredPoints.append(inputPoints[i])
-    except (ValueError, IndexError) as e:
+        inputPoints = asPointArray(inputPoints)
+        filteredPoints = inputPoints[maskCartesianX(inputPoints, x_min, x_max)]
+    except (ValueError, IndexError, KeyError, TypeError) as e:
         print(f"Error filtering points: {e}")
         return None
     return filteredPoints
 
 def filterCartesianY(inputPoints, y_min, y_max):
-    filteredPoints = []
     try:
-        for i in range(len(inputPoints)):
-            point_y = inputPoints[i]["y"]
-            if point_y >= y_min and point_y <= y_max:
-                filteredPoints.append(inputPoints[i])
-    except (ValueError, IndexError) as e:
+        inputPoints = asPointArray(inputPoints)
+        filteredPoints = inputPoints[maskCartesianY(inputPoints, y_min, y_max)]
+    except (ValueError, IndexError, KeyError, TypeError) as e:
         print(f"Error filtering points: {e}")
         return None
     return filteredPoints
 
 def filterCartesianZ(inputPoints, z_min, z_max):
-    filteredPoints = []
     try:
-        for i in range(len(inputPoints)):
-            point_z = inputPoints[i]["z"]
-            if point_z >= z_min and point_z <= z_max:
-                filteredPoints.append(inputPoints[i])
-    except (ValueError, IndexError) as e:
+        inputPoints = asPointArray(inputPoints)
+        filteredPoints = inputPoints[maskCartesianZ(inputPoints, z_min, z_max)]
+    except (ValueError, IndexError, KeyError, TypeError) as e:
         print(f"Error filtering points: {e}")
         return None
     return filteredPoints
 
 def filterDoppler(inputPoints, doppler_min, doppler_max):
-    filteredPoints = []
     try:
-        for i in range(len(inputPoints)):
-            point_doppler = inputPoints[i]["doppler"]
-            if point_doppler >= doppler_min and point_doppler <= doppler_max:
-                filteredPoints.append(inputPoints[i])
-    except (ValueError, IndexError) as e:
+        inputPoints = asPointArray(inputPoints)
+        filteredPoints = inputPoints[maskDoppler(inputPoints, doppler_min, doppler_max)]
+    except (ValueError, IndexError, KeyError, TypeError) as e:
         print(f"Error filtering points: {e}")
         return None
     return filteredPoints
 
 def filterSphericalR(inputPoints, r_min, r_max):
-    filteredPoints = []
     try:
-        for i in range(len(inputPoints)):
-            point_r = np.sqrt(inputPoints[i]["x"]**2 + inputPoints[i]["y"]**2 + inputPoints[i]["z"]**2)
-            if point_r >= r_min and point_r <= r_max:
-                filteredPoints.append(inputPoints[i])
-    except (ValueError, IndexError) as e:
-                print(f"Error filtering points: {e}")
-                return None
+        inputPoints = asPointArray(inputPoints)
+        filteredPoints = inputPoints[maskSphericalR(inputPoints, r_min, r_max)]
+    except (ValueError, IndexError, KeyError, TypeError) as e:
+        print(f"Error filtering points: {e}")
+        return None
     return filteredPoints
 
 def filterSphericalTheta(inputPoints, theta_min, theta_max):
-    filteredPoints = []
     try:
-        for i in range(len(inputPoints)):
-            point_r = np.sqrt(inputPoints[i]["x"]**2 + inputPoints[i]["y"]**2 + inputPoints[i]["z"]**2)
-            point_theta = np.rad2deg(np.arccos(inputPoints[i]["z"] / point_r))
-            if point_theta >= theta_min and point_theta <= theta_max:
-                filteredPoints.append(inputPoints[i])
-    except (ValueError, IndexError) as e:
-                print(f"Error filtering points: {e}")
-                return None
+        inputPoints = asPointArray(inputPoints)
+        filteredPoints = inputPoints[maskSphericalTheta(inputPoints, theta_min, theta_max)]
+    except (ValueError, IndexError, KeyError, TypeError) as e:
+        print(f"Error filtering points: {e}")
+        return None
     return filteredPoints
 
 def filterSphericalPhi(inputPoints, phi_min, phi_max):
-    filteredPoints = []
     try:
-        for i in range(len(inputPoints)):
-            point_phi = np.rad2deg(np.arctan(inputPoints[i]["x"]/inputPoints[i]["y"]))
-            
-            if point_phi >= phi_min and point_phi <= phi_max:
-                filteredPoints.append(inputPoints[i])
-    except (ValueError, IndexError) as e:
-                print(f"Error filtering points: {e}")
-                return None
-    return filteredPoints
\ No newline at end of file
+        inputPoints = asPointArray(inputPoints)
+        filteredPoints = inputPoints[maskSphericalPhi(inputPoints, phi_min, phi_max)]
+    except (ValueError, IndexError, KeyError, TypeError) as e:
+        print(f"Error filtering points: {e}")
+        return None
+    return filteredPoints
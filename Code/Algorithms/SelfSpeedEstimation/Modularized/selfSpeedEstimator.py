@@ -1,30 +1,59 @@
 import numpy as np
 import pointFilter
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: fall back to plain Python functions
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 __all__ = ['estimate_self_speed']
 
+@njit
+def det3(col0, col1, col2):
+    #Determinant of the 3x3 matrix with the given columns
+    return (col0[0] * (col1[1] * col2[2] - col1[2] * col2[1])
+            - col1[0] * (col0[1] * col2[2] - col0[2] * col2[1])
+            + col2[0] * (col0[1] * col1[2] - col0[2] * col1[1]))
+
+@njit(error_model="numpy")  #Division by zero gives inf/NaN like numpy instead of raising
+def fit_self_speed(x, y, doppler):
+    #Summing the normal equations of the second order fit in one pass over the points
+    #(angles in units of 90 degrees, which keeps the equations well conditioned)
+    phi_sums = np.zeros(5)
+    radspeed_sums = np.zeros(3)
+    for i in range(len(x)):
+        phi = np.rad2deg(np.arctan(x[i] / y[i])) / 90.0  #Folded into (-90, 90) like the phi filter
+        phi_power = 1.0
+        for k in range(5):
+            if k < 3:
+                radspeed_sums[k] += phi_power * doppler[i]
+            phi_sums[k] += phi_power
+            phi_power *= phi
+
+    #Solving for the constant coefficient only (Cramer's rule), which is the speed at an angle of 0
+    det = det3(phi_sums[0:3], phi_sums[1:4], phi_sums[2:5])
+    if abs(det) <= 1e-10 * phi_sums[0]**3:
+        return np.nan  #Singular up to rounding: less than three distinct angles
+    return det3(radspeed_sums, phi_sums[1:4], phi_sums[2:5]) / det
+
 def estimate_self_speed(pointCloud):
     #Returning zero if there are no points to process
     if len(pointCloud) < 1:
         return 0
 
-    #Preparing an array to contain angle to target and radial speed
-    phi_radspeed = []
-
-    #Iterating over all points
-    for i in range(len(pointCloud)):
-        #Calculating the angle to target
-        phi = np.rad2deg(np.arctan(pointCloud[i]["x"]/pointCloud[i]["y"]))
-
-        #Appending the angle and the radial speed 
-        phi_radspeed.append([phi, pointCloud[i]["doppler"]])
-
-    #Converting array of tuples to NumPy array
-    phi_radspeed = np.array(phi_radspeed, dtype=float)
-
-    #Fitting a first order polynominal into the points
-    poly_coeff = np.polyfit(phi_radspeed[:,0], phi_radspeed[:,1], deg=2)  # Polynomial coefficients
-    poly_model = np.poly1d(poly_coeff)  # Polynomial model
+    #Fitting a second order polynominal into the (angle, radial speed) points, compiled if numba is available
+    pointCloud = pointFilter.asPointArray(pointCloud)
+    x, y, doppler = (pointCloud[axis].astype(float) for axis in ("x", "y", "doppler"))
+    self_speed = fit_self_speed(x, y, doppler)
+    if np.isnan(self_speed):
+        #Degenerate fit: np.polyfit gives the least-norm solution
+        with np.errstate(divide="ignore", invalid="ignore"):
+            phi = np.rad2deg(np.arctan(x / y))
+        self_speed = np.poly1d(np.polyfit(phi, doppler, deg=2))(0)
 
     #Returning the self-speed after interpolating
-    return poly_model(0)
\ No newline at end of file
+    return self_speed
@@ -6,13 +6,24 @@ from datetime import datetime
 #Only decodeData should be visible to the outside
 __all__ = ['decodeData']
 
-def parse_frame_header(raw_data):
-    if len(raw_data) < 40:
+# Precompiled binary layouts, so the format strings are parsed once at import
+FRAME_HEADER_STRUCT = struct.Struct('<QIIIIIIII')
+TLV_HEADER_STRUCT = struct.Struct('<II')
+POINT_STRUCT = struct.Struct('<ffff')
+SIDE_INFO_STRUCT = struct.Struct('<HH')
+STATISTICS_STRUCTS = {}  # Statistics layouts ('<' + 'I' * count), created once per count
+
+def get_statistics_struct(count):
+    if count not in STATISTICS_STRUCTS:
+        STATISTICS_STRUCTS[count] = struct.Struct('<' + 'I' * count)
+    return STATISTICS_STRUCTS[count]
+
+def parse_frame_header(raw_data, offset=0):
+    if len(raw_data) - offset < FRAME_HEADER_STRUCT.size:
         raise ValueError("Insufficient data for Frame Header")
 
-    # Extract values and unpack
-    raw_bytes = bytes([raw_data.pop(0) for _ in range(40)])
-    frame_header = struct.unpack('<QIIIIIIII', raw_bytes)
+    # Unpack in place and advance the offset
+    frame_header = FRAME_HEADER_STRUCT.unpack_from(raw_data, offset)
 
     return {
         "Magic Word": f"0x{frame_header[0]:016X}",
@@ -24,42 +35,44 @@ def parse_frame_header(raw_data):
         "Num Detected Obj": frame_header[6],
         "Num TLVs": frame_header[7],
         "Subframe Number": frame_header[8]
-    }
+    }, offset + FRAME_HEADER_STRUCT.size
 
-def parse_tlv_header(raw_data):
-    if len(raw_data) < 8:
+def parse_tlv_header(raw_data, offset):
+    if len(raw_data) - offset < TLV_HEADER_STRUCT.size:
         raise ValueError("Insufficient data for TLV Header")
 
-    # Extract values and unpack
-    raw_bytes = bytes([raw_data.pop(0) for _ in range(8)])
-    tlv_type, tlv_length = struct.unpack('<II', raw_bytes)
+    # Unpack in place and advance the offset
+    tlv_type, tlv_length = TLV_HEADER_STRUCT.unpack_from(raw_data, offset)
 
-    return {"TLV Type": tlv_type, "TLV Length": tlv_length}
+    return {"TLV Type": tlv_type, "TLV Length": tlv_length}, offset + TLV_HEADER_STRUCT.size
 
-def parse_tlv_payload(tlv_header, raw_data):
+def parse_tlv_payload(tlv_header, raw_data, offset):
+    """
+    Parses the TLV payload starting at offset. raw_data is a memoryview over the frame bytes,
+    so the payload slice is zero-copy. Returns the parsed payload and the offset after it.
+    """
     tlv_type = tlv_header["TLV Type"]
     tlv_length = tlv_header["TLV Length"]
     payload_length = tlv_length
 
-    if len(raw_data) < payload_length:
+    if len(raw_data) - offset < payload_length:
         raise ValueError(f"Insufficient data for TLV Payload: expected {payload_length} bytes, "
-                         f"but got {len(raw_data)} bytes.")
+                         f"but got {len(raw_data) - offset} bytes.")
 
-    # Extract the payload as a list
-    payload = [raw_data.pop(0) for _ in range(payload_length)]
+    # View of the payload (no copy)
+    payload = raw_data[offset:offset + payload_length]
+    offset += payload_length
 
     # Only process TLVs we're interested in
     if tlv_type == 1:  # Detected Points
-        point_size = 16
+        point_size = POINT_STRUCT.size
         detected_points = []
-        for i in range(payload_length // point_size):
-            point_bytes = bytes(payload[i * point_size:(i + 1) * point_size])
-            x, y, z, doppler = struct.unpack('<ffff', point_bytes)
+        for x, y, z, doppler in POINT_STRUCT.iter_unpack(payload[:payload_length - payload_length % point_size]):
             detected_points.append({"x": x, "y": y, "z": z, "doppler": doppler})
 
         #Insert logic here
 
-        return {"detectedPoints": detected_points}
+        return {"detectedPoints": detected_points}, offset
 
     elif tlv_type in (2, 3):  # Range Profile or Noise Profile
         range_points = []
@@ -67,7 +80,7 @@ def parse_tlv_payload(tlv_header, raw_data):
             point_raw = (payload[i * 2 + 1] << 8) | payload[i * 2]
             point_q9 = point_raw / 512.0  # Convert Q9 format to float
             range_points.append(point_q9)
-        return {"Range Profile" if tlv_type == 2 else "Noise Profile": range_points}
+        return {"Range Profile" if tlv_type == 2 else "Noise Profile": range_points}, offset
 
     elif tlv_type in (4, 8):  # Azimuth Static Heatmap or Azimuth/Elevation Heatmap
         heatmap = []
@@ -75,18 +88,18 @@ def parse_tlv_payload(tlv_header, raw_data):
             imag = (payload[i * 4 + 1] << 8) | payload[i * 4]
             real = (payload[i * 4 + 3] << 8) | payload[i * 4 + 2]
             heatmap.append({"Real": real, "Imaginary": imag})
-        return {"Azimuth Static Heatmap" if tlv_type == 4 else "Azimuth/Elevation Static Heatmap": heatmap}
+        return {"Azimuth Static Heatmap" if tlv_type == 4 else "Azimuth/Elevation Static Heatmap": heatmap}, offset
 
     elif tlv_type == 5:  # Range-Doppler Heatmap
         heatmap = []
         row_size = int(payload_length ** 0.5)  # Assuming square 2D array
         for i in range(row_size):
-            row = payload[i * row_size:(i + 1) * row_size]
+            row = payload[i * row_size:(i + 1) * row_size].tolist()
             heatmap.append(row)
-        return {"Range-Doppler Heatmap": heatmap}
+        return {"Range-Doppler Heatmap": heatmap}, offset
 
     elif tlv_type == 6:  # Statistics
-        stats = struct.unpack('<' + 'I' * (payload_length // 4), bytes(payload))
+        stats = get_statistics_struct(payload_length // 4).unpack_from(payload)
         return {
             "Statistics": {
                 "InterFrameProcessingTime": stats[0],
@@ -96,15 +109,14 @@ def parse_tlv_payload(tlv_header, raw_data):
                 "ActiveFrameCPULoad": stats[4],
                 "InterFrameCPULoad": stats[5]
             }
-        }
+        }, offset
 
     elif tlv_type == 7:  # Side Info for Detected Points
         side_info = []
-        point_size = 4  # Each point has 4 bytes of side info
-        for i in range(payload_length // point_size):
-            snr, noise = struct.unpack('<HH', bytes(payload[i * point_size:(i + 1) * point_size]))
+        point_size = SIDE_INFO_STRUCT.size  # Each point has 4 bytes of side info
+        for snr, noise in SIDE_INFO_STRUCT.iter_unpack(payload[:payload_length - payload_length % point_size]):
             side_info.append({"SNR": snr, "Noise": noise})
-        return {"Side Info for Detected Points": side_info}
+        return {"Side Info for Detected Points": side_info}, offset
 
     elif tlv_type == 9:  # Temperature Statistics
         # Type 9 payload structure:
@@ -137,10 +149,10 @@ def parse_tlv_payload(tlv_header, raw_data):
                 "Time (ms)": time_ms,
                 **temperature_data
             }
-        }
+        }, offset
 
     # If not interested, return None
-    return None
+    return None, offset
 
 def convert_timestamp_to_unix(timestamp_str):
     """
@@ -179,18 +191,18 @@ def dataToFrames(data):
             if timestamp is None:
                 continue
 
-            #Geting the raw data from the current row
-            raw_data_list = [int(x) for x in data.iloc[i]['RawData'].split(',')]
+            #Geting the raw data from the current row as a byte buffer
+            raw_data = memoryview(bytearray(int(x) for x in data.iloc[i]['RawData'].split(',')))
 
             #Parsing the frame header
-            frame_header = parse_frame_header(raw_data_list)
+            frame_header, offset = parse_frame_header(raw_data)
             num_tlvs = frame_header["Num TLVs"]
 
             # Parse TLVs
             for _ in range(num_tlvs):
-                tlv_header = parse_tlv_header(raw_data_list)
+                tlv_header, offset = parse_tlv_header(raw_data, offset)
                 if tlv_header["TLV Type"] == 1:  # Interested in Detected Points
-                    tlv_payload = parse_tlv_payload(tlv_header, raw_data_list)
+                    tlv_payload, offset = parse_tlv_payload(tlv_header, raw_data, offset)
                     if tlv_payload and "detectedPoints" in tlv_payload:
                         decodedFrames.append([timestamp, tlv_payload["detectedPoints"]])
 
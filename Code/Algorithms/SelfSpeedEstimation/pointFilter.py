@@ -79,7 +79,9 @@ def filterSphericalPhi(inputPoints, phi_min, phi_max):
     filteredPoints = []
     try:
         for i in range(len(inputPoints)):
-            point_phi = np.rad2deg(np.arctan(inputPoints[i]["x"]/inputPoints[i]["y"]))
+            #arctan(x/y) folds points behind the sensor (y < 0) into (-90, 90); x = y = 0 gives NaN and is rejected
+            with np.errstate(divide="ignore", invalid="ignore"):
+                point_phi = np.rad2deg(np.arctan(np.divide(inputPoints[i]["x"], inputPoints[i]["y"])))
             
             if point_phi >= phi_min and point_phi <= phi_max:
                 filteredPoints.append(inputPoints[i])
@@ -53,7 +53,8 @@ def estimating_self_speed(pointCloud):
     #Iterating over all points
     for i in range(len(filteredPointCloud)):
         #Calculating the angle to target
-        phi = np.rad2deg(np.arctan(filteredPointCloud[i]["x"]/filteredPointCloud[i]["y"]))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            phi = np.rad2deg(np.arctan(np.divide(filteredPointCloud[i]["x"], filteredPointCloud[i]["y"])))
 
         #Appending the angle and the radial speed 
         phi_radspeed.append([phi, filteredPointCloud[i]["doppler"]])
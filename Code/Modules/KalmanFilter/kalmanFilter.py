@@ -1,3 +1,25 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: fall back to plain Python functions
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+@njit
+def filter_measurements(measurements, estimated_value, estimated_error, process_variance, measurement_variance):
+    # The same steps as KalmanFilter.update(), for a whole sequence of measurements in one compiled loop
+    estimates = np.empty(len(measurements))
+    for i in range(len(measurements)):
+        kalman_gain = estimated_error / (estimated_error + measurement_variance)
+        estimated_value = estimated_value + kalman_gain * (measurements[i] - estimated_value)
+        estimated_error = (1 - kalman_gain) * estimated_error + process_variance
+        estimates[i] = estimated_value
+    return estimates, estimated_value, estimated_error
+
 class KalmanFilter:
     def __init__(self, process_variance, measurement_variance):
         self.process_variance = process_variance
@@ -13,3 +35,11 @@ class KalmanFilter:
         # Update the error covariance
         self.estimated_error = (1 - kalman_gain) * self.estimated_error + self.process_variance
         return self.estimated_value
+
+    def update_batch(self, measurements):
+        # Filter a recorded sequence of measurements at once (same results as calling update() on each);
+        # returns the array of estimates and leaves the filter in the state after the last measurement
+        estimates, self.estimated_value, self.estimated_error = filter_measurements(
+            np.asarray(measurements, dtype=float), float(self.estimated_value), float(self.estimated_error),
+            float(self.process_variance), float(self.measurement_variance))
+        return estimates
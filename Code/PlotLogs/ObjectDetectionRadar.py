@@ -8,6 +8,16 @@ from sklearn.cluster import DBSCAN
 from filterpy.kalman import KalmanFilter
 import time
 
+try:
+    # pyarrow is optional: it parses the CSV with multiple threads, otherwise pandas' C parser is used
+    import pyarrow
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+# Only the columns the plots use are read from the CSV
+CSV_COLUMNS = ["Timestamp", "Frame", "X [m]", "Y [m]"]
+CSV_DTYPES = {"X [m]": np.float32, "Y [m]": np.float32}
 
 # Common Utility Function
 def load_data(file_name):
@@ -16,7 +26,29 @@ def load_data(file_name):
     """
     if not os.path.exists(file_name):
         raise FileNotFoundError(f"Error: File not found at {file_name}")
-    return pd.read_csv(file_name)
+    return pd.read_csv(file_name, engine=CSV_ENGINE, usecols=CSV_COLUMNS, dtype=CSV_DTYPES)
+
+def group_points(data, column):
+    """
+    Split the X/Y coordinates into one (N, 2) array per value of the given column.
+
+    The data is sorted by the column once and cut at the value changes, so each frame
+    (or timestamp) is a slice instead of a boolean filter over the whole DataFrame.
+
+    Args:
+    - data (pd.DataFrame): The radar data.
+    - column (str): Column to group by (e.g. "Frame" or "Timestamp").
+
+    Returns:
+    - dict: Column value -> (N, 2) array of X [m], Y [m], in ascending order of the value.
+    """
+    data = data.sort_values(by=column, kind="stable")
+    keys = data[column].to_numpy()
+    if len(keys) == 0:
+        return {}
+    coordinates = data[["X [m]", "Y [m]"]].to_numpy()
+    boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    return dict(zip(keys[np.r_[0, boundaries]].tolist(), np.split(coordinates, boundaries)))
 
 def initialize_plot(plot_x_limits, plot_y_limits):
     """
@@ -40,11 +72,8 @@ def plot_data_by_timestamp(data, dt=0.5, clear_plot=True):
     - dt (float): Time delay (in seconds) between frames.
     - clear_plot (bool): If True, clears the plot between frames. If False, overlays data on the existing plot.
     """
-    # Sort data by timestamp
-    data = data.sort_values(by="Timestamp")
-
-    # Extract unique timestamps
-    unique_timestamps = data["Timestamp"].unique()
+    # Group the points by timestamp once (sorted by timestamp)
+    timestamp_points = group_points(data, "Timestamp")
 
     # Initialize the plot
     fig, ax = initialize_plot(
@@ -56,16 +85,13 @@ def plot_data_by_timestamp(data, dt=0.5, clear_plot=True):
     ax.legend()
 
     # Animate by updating the scatter plot for each timestamp
-    for current_time in unique_timestamps:
+    for current_time, current_points in timestamp_points.items():
         if clear_plot:
             # Clear existing points and re-plot
             scatter.set_offsets(data.iloc[0:0])  # Effectively clears the scatter plot
 
-        # Filter data for the current timestamp
-        current_data = data[data["Timestamp"] == current_time]
-
         # Update scatter plot
-        scatter.set_offsets(current_data[["X [m]", "Y [m]"]])
+        scatter.set_offsets(current_points)
         ax.set_title(f"Radar Data (Time: {current_time:.2f} s)")
 
         # Pause for dt seconds to create an animation effect
@@ -85,7 +111,8 @@ def plot_data_with_slider(data, clear_plot=True):
     - data (pd.DataFrame): The radar data to animate.
     - clear_plot (bool): If True, clears the plot between frames. If False, overlays data on the existing plot.
     """
-    unique_frames = sorted(data["Frame"].unique())
+    frame_points = group_points(data, "Frame")  # Points of every frame, split once
+    unique_frames = list(frame_points)
     fig, ax = initialize_plot(data["X [m]"].min() - 1, data["X [m]"].max() + 1)
     scatter = ax.scatter([], [], label="Data Points")
     ax.set_title("Radar Data by Frame")
@@ -94,8 +121,7 @@ def plot_data_with_slider(data, clear_plot=True):
         if clear_plot:
             scatter.set_offsets(data.iloc[0:0])  # Clear existing scatter data
 
-        frame_data = data[data["Frame"] == unique_frames[frame_idx]]
-        scatter.set_offsets(frame_data[["X [m]", "Y [m]"]])
+        scatter.set_offsets(frame_points[unique_frames[frame_idx]])
         ax.set_title(f"Frame: {unique_frames[frame_idx]}")
 
     slider_ax = plt.axes([0.2, 0.1, 0.6, 0.03])
@@ -116,7 +142,8 @@ def plot_data_by_fps(data, fps=10, clear_plot=True):
     - fps (int): Frames per second for animation.
     - clear_plot (bool): If True, clears the plot between frames. If False, overlays data on the existing plot.
     """
-    unique_frames = sorted(data["Frame"].unique())
+    frame_points = group_points(data, "Frame")  # Points of every frame, split once
+    unique_frames = list(frame_points)
     fig, ax = initialize_plot(data["X [m]"].min() - 1, data["X [m]"].max() + 1)
     scatter = ax.scatter([], [], label="Data Points")
     ax.set_title("Radar Data Animation")
@@ -125,8 +152,7 @@ def plot_data_by_fps(data, fps=10, clear_plot=True):
         if clear_plot:
             scatter.set_offsets(data.iloc[0:0])  # Clear existing scatter data
 
-        frame_data = data[data["Frame"] == unique_frames[frame_idx]]
-        scatter.set_offsets(frame_data[["X [m]", "Y [m]"]])
+        scatter.set_offsets(frame_points[unique_frames[frame_idx]])
         ax.set_title(f"Frame: {unique_frames[frame_idx]}")
 
     ani = FuncAnimation(fig, update, frames=len(unique_frames), interval=1000 / fps, repeat=True)
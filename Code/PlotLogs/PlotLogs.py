@@ -11,6 +11,18 @@ import threading
 # Global variable to specify which TLVs to process
 interested_tlv_types = [1]  # Example: Interested in Detected Points (1) and Temperature Statistics (9)
 
+# Precompiled binary layouts, so the format strings are parsed once at import
+FRAME_HEADER_STRUCT = struct.Struct('<QIIIIIIII')
+TLV_HEADER_STRUCT = struct.Struct('<II')
+SIDE_INFO_STRUCT = struct.Struct('<HH')
+POINT_DTYPE = np.dtype([("X [m]", "<f4"), ("Y [m]", "<f4"), ("Z [m]", "<f4"), ("Doppler [m/s]", "<f4")])
+STATISTICS_STRUCTS = {}  # Statistics layouts ('<' + 'I' * count), created once per count
+
+def get_statistics_struct(count):
+    if count not in STATISTICS_STRUCTS:
+        STATISTICS_STRUCTS[count] = struct.Struct('<' + 'I' * count)
+    return STATISTICS_STRUCTS[count]
+
 def initialize_csv(filename="coordinates.csv"):
     """
     Initializes the CSV file by deleting any existing data and adding headers.
@@ -31,7 +43,7 @@ def append_frame_to_csv(frame_number, timestamp, coordinates, filename="coordina
     Appends frame data to the CSV file.
     :param frame_number: The frame number.
     :param timestamp: The UNIX timestamp of the frame.
-    :param coordinates: List of dictionaries with keys "X [m]", "Y [m]", "Z [m]", "Doppler [m/s]".
+    :param coordinates: Structured array (POINT_DTYPE) with fields "X [m]", "Y [m]", "Z [m]", "Doppler [m/s]".
     :param filename: Name of the CSV file to append to.
     """
     script_dir = os.path.dirname(os.path.abspath(__file__))  # Current script directory
@@ -39,19 +51,31 @@ def append_frame_to_csv(frame_number, timestamp, coordinates, filename="coordina
 
     # Append the frame data
     with open(file_path, 'a') as f:
-        for point in coordinates:
-            f.write(f"{frame_number},{timestamp},{point['X [m]']},{point['Y [m]']},{point['Z [m]']},{point['Doppler [m/s]']}\n")
+        for x, y, z, doppler in coordinates.tolist():
+            f.write(f"{frame_number},{timestamp},{x},{y},{z},{doppler}\n")
 
     #print(f"Appended Frame {frame_number} data to {file_path}")
 
+def point_coordinates(points):
+    """
+    Returns the (X, Y, Z) tuples of a structured array of detected points.
+    """
+    return points[["X [m]", "Y [m]", "Z [m]"]].tolist()
+
+def split_by_doppler(points, doppler_threshold):
+    """
+    Splits detected points into stationary (|Doppler| <= threshold) and moving (X, Y, Z) tuples.
+    """
+    stationary = np.abs(points["Doppler [m/s]"], dtype=np.float64) <= doppler_threshold
+    return point_coordinates(points[stationary]), point_coordinates(points[~stationary])
+
 
-def parse_frame_header(raw_data):
-    if len(raw_data) < 40:
+def parse_frame_header(raw_data, offset=0):
+    if len(raw_data) - offset < FRAME_HEADER_STRUCT.size:
         raise ValueError("Insufficient data for Frame Header")
 
-    # Extract values and unpack
-    raw_bytes = bytes([raw_data.pop(0) for _ in range(40)])
-    frame_header = struct.unpack('<QIIIIIIII', raw_bytes)
+    # Unpack in place and advance the offset
+    frame_header = FRAME_HEADER_STRUCT.unpack_from(raw_data, offset)
 
     return {
         "Magic Word": f"0x{frame_header[0]:016X}",
@@ -63,42 +87,44 @@ def parse_frame_header(raw_data):
         "Num Detected Obj": frame_header[6],
         "Num TLVs": frame_header[7],
         "Subframe Number": frame_header[8]
-    }
+    }, offset + FRAME_HEADER_STRUCT.size
 
-def parse_tlv_header(raw_data):
-    if len(raw_data) < 8:
+def parse_tlv_header(raw_data, offset):
+    if len(raw_data) - offset < TLV_HEADER_STRUCT.size:
         raise ValueError("Insufficient data for TLV Header")
 
-    # Extract values and unpack
-    raw_bytes = bytes([raw_data.pop(0) for _ in range(8)])
-    tlv_type, tlv_length = struct.unpack('<II', raw_bytes)
+    # Unpack in place and advance the offset
+    tlv_type, tlv_length = TLV_HEADER_STRUCT.unpack_from(raw_data, offset)
 
-    return {"TLV Type": tlv_type, "TLV Length": tlv_length}
+    return {"TLV Type": tlv_type, "TLV Length": tlv_length}, offset + TLV_HEADER_STRUCT.size
 
-def parse_tlv_payload(tlv_header, raw_data):
+def parse_tlv_payload(tlv_header, raw_data, offset):
+    """
+    Parses the TLV payload starting at offset. raw_data holds the frame bytes; returns the parsed
+    payload and the offset after it.
+    """
     tlv_type = tlv_header["TLV Type"]
     tlv_length = tlv_header["TLV Length"]
     payload_length = tlv_length
 
-    if len(raw_data) < payload_length:
+    if len(raw_data) - offset < payload_length:
         raise ValueError(f"Insufficient data for TLV Payload: expected {payload_length} bytes, "
-                         f"but got {len(raw_data)} bytes.")
+                         f"but got {len(raw_data) - offset} bytes.")
 
-    # Extract the payload as a list
-    payload = [raw_data.pop(0) for _ in range(payload_length)]
+    # Slice out the payload and advance the offset past it
+    payload = raw_data[offset:offset + payload_length]
+    payload_offset = offset
+    offset += payload_length
 
     # Only process TLVs we're interested in
     if tlv_type == 1:  # Detected Points
-        point_size = 16
-        detected_points = []
-        for i in range(payload_length // point_size):
-            point_bytes = bytes(payload[i * point_size:(i + 1) * point_size])
-            x, y, z, doppler = struct.unpack('<ffff', point_bytes)
-            detected_points.append({"X [m]": x, "Y [m]": y, "Z [m]": z, "Doppler [m/s]": doppler})
+        # Decode all points at once into a structured array (one record per point)
+        detected_points = np.frombuffer(raw_data, dtype=POINT_DTYPE, count=payload_length // POINT_DTYPE.itemsize,
+                                        offset=payload_offset)
 
         #Insert logic here
 
-        return {"Detected Points": detected_points}
+        return {"Detected Points": detected_points}, offset
 
     elif tlv_type in (2, 3):  # Range Profile or Noise Profile
         range_points = []
@@ -106,7 +132,7 @@ def parse_tlv_payload(tlv_header, raw_data):
             point_raw = (payload[i * 2 + 1] << 8) | payload[i * 2]
             point_q9 = point_raw / 512.0  # Convert Q9 format to float
             range_points.append(point_q9)
-        return {"Range Profile" if tlv_type == 2 else "Noise Profile": range_points}
+        return {"Range Profile" if tlv_type == 2 else "Noise Profile": range_points}, offset
 
     elif tlv_type in (4, 8):  # Azimuth Static Heatmap or Azimuth/Elevation Heatmap
         heatmap = []
@@ -114,18 +140,18 @@ def parse_tlv_payload(tlv_header, raw_data):
             imag = (payload[i * 4 + 1] << 8) | payload[i * 4]
             real = (payload[i * 4 + 3] << 8) | payload[i * 4 + 2]
             heatmap.append({"Real": real, "Imaginary": imag})
-        return {"Azimuth Static Heatmap" if tlv_type == 4 else "Azimuth/Elevation Static Heatmap": heatmap}
+        return {"Azimuth Static Heatmap" if tlv_type == 4 else "Azimuth/Elevation Static Heatmap": heatmap}, offset
 
     elif tlv_type == 5:  # Range-Doppler Heatmap
         heatmap = []
         row_size = int(payload_length ** 0.5)  # Assuming square 2D array
         for i in range(row_size):
-            row = payload[i * row_size:(i + 1) * row_size]
+            row = list(payload[i * row_size:(i + 1) * row_size])
             heatmap.append(row)
-        return {"Range-Doppler Heatmap": heatmap}
+        return {"Range-Doppler Heatmap": heatmap}, offset
 
     elif tlv_type == 6:  # Statistics
-        stats = struct.unpack('<' + 'I' * (payload_length // 4), bytes(payload))
+        stats = get_statistics_struct(payload_length // 4).unpack_from(raw_data, payload_offset)
         return {
             "Statistics": {
                 "InterFrameProcessingTime": stats[0],
@@ -135,15 +161,15 @@ def parse_tlv_payload(tlv_header, raw_data):
                 "ActiveFrameCPULoad": stats[4],
                 "InterFrameCPULoad": stats[5]
             }
-        }
+        }, offset
 
     elif tlv_type == 7:  # Side Info for Detected Points
         side_info = []
-        point_size = 4  # Each point has 4 bytes of side info
+        point_size = SIDE_INFO_STRUCT.size  # Each point has 4 bytes of side info
         for i in range(payload_length // point_size):
-            snr, noise = struct.unpack('<HH', bytes(payload[i * point_size:(i + 1) * point_size]))
+            snr, noise = SIDE_INFO_STRUCT.unpack_from(raw_data, payload_offset + i * point_size)
             side_info.append({"SNR": snr, "Noise": noise})
-        return {"Side Info for Detected Points": side_info}
+        return {"Side Info for Detected Points": side_info}, offset
 
     elif tlv_type == 9:  # Temperature Statistics
         # Type 9 payload structure:
@@ -176,18 +202,19 @@ def parse_tlv_payload(tlv_header, raw_data):
                 "Time (ms)": time_ms,
                 **temperature_data
             }
-        }
+        }, offset
 
     # If not interested, return None
-    return None
+    return None, offset
 
-def print_tlvs(num_tlvs, raw_data_list):
+def print_tlvs(num_tlvs, raw_data, offset):
     """
-    Parse and print only the TLVs of interest for the current frame.
+    Parse and print only the TLVs of interest for the current frame, starting at offset.
+    Returns the offset after the last TLV processed.
     """
     for tlv_idx in range(num_tlvs):
         # Parse the TLV header
-        tlv_header = parse_tlv_header(raw_data_list)
+        tlv_header, offset = parse_tlv_header(raw_data, offset)
 
         # Check if this TLV is in the list of types we're interested in
         if tlv_header["TLV Type"] in interested_tlv_types:
@@ -197,7 +224,7 @@ def print_tlvs(num_tlvs, raw_data_list):
                 print(f"{key}: {value}")
 
             # Parse the TLV payload
-            tlv_payload = parse_tlv_payload(tlv_header, raw_data_list)
+            tlv_payload, offset = parse_tlv_payload(tlv_header, raw_data, offset)
             if tlv_payload:
                 print("\nParsed TLV Payload:")
                 print(tlv_payload)
@@ -205,17 +232,16 @@ def print_tlvs(num_tlvs, raw_data_list):
             # Skip payload for uninterested TLVs
             tlv_length = tlv_header["TLV Length"]
 
-            # Ensure the list has enough data to discard
-            if tlv_length > len(raw_data_list):
+            # Ensure the buffer has enough data to skip
+            if tlv_length > len(raw_data) - offset:
                 print(f"WARNING: Insufficient data to discard uninterested TLV {tlv_idx + 1} payload. "
-                      f"Expected {tlv_length} bytes, but only {len(raw_data_list)} bytes remain.")
+                      f"Expected {tlv_length} bytes, but only {len(raw_data) - offset} bytes remain.")
                 break  # Exit processing if there is insufficient data
 
-            # Discard payload for uninterested TLVs
-            if tlv_length > 0:
-                _ = [raw_data_list.pop(0) for _ in range(tlv_length)]
+            # Skip the payload of uninterested TLVs by advancing the offset
+            offset += tlv_length
 
-    return
+    return offset
 
 def convert_timestamp_to_unix(timestamp_str):
     """
@@ -255,10 +281,10 @@ def plot_all_data(data, doppler_threshold=0.1, axis_limit=3):
                 continue
 
             # Get raw data from the current row
-            raw_data_list = [int(x) for x in data.iloc[row_idx]['RawData'].split(',')]
+            raw_data = bytes(int(x) for x in data.iloc[row_idx]['RawData'].split(','))
 
             # Parse the frame header
-            frame_header = parse_frame_header(raw_data_list)
+            frame_header, offset = parse_frame_header(raw_data)
             num_tlvs = frame_header["Num TLVs"]
 
             # Use the row index as the frame number (1-indexed)
@@ -266,16 +292,14 @@ def plot_all_data(data, doppler_threshold=0.1, axis_limit=3):
 
             # Parse TLVs
             for _ in range(num_tlvs):
-                tlv_header = parse_tlv_header(raw_data_list)
+                tlv_header, offset = parse_tlv_header(raw_data, offset)
                 if tlv_header["TLV Type"] == 1:  # Interested in Detected Points
-                    tlv_payload = parse_tlv_payload(tlv_header, raw_data_list)
+                    tlv_payload, offset = parse_tlv_payload(tlv_header, raw_data, offset)
                     if tlv_payload and "Detected Points" in tlv_payload:
-                        for point in tlv_payload["Detected Points"]:
-                            # Categorize based on Doppler threshold
-                            if abs(point["Doppler [m/s]"]) <= doppler_threshold:
-                                stationary_coords.append((point["X [m]"], point["Y [m]"], point["Z [m]"]))
-                            else:
-                                moving_coords.append((point["X [m]"], point["Y [m]"], point["Z [m]"]))
+                        # Categorize based on Doppler threshold
+                        stationary_points, moving_points = split_by_doppler(tlv_payload["Detected Points"], doppler_threshold)
+                        stationary_coords.extend(stationary_points)
+                        moving_coords.extend(moving_points)
 
                         append_frame_to_csv(frame_number, timestamp, tlv_payload["Detected Points"], csv_file)
 
@@ -343,21 +367,20 @@ def plot_all_data_with_kalman(data, doppler_threshold=0.1, axis_limit=3):
                 continue
 
             # Get raw data from the current row
-            raw_data_list = [int(x) for x in data.iloc[row_idx]['RawData'].split(',')]
+            raw_data = bytes(int(x) for x in data.iloc[row_idx]['RawData'].split(','))
 
             # Parse the frame header
-            frame_header = parse_frame_header(raw_data_list)
+            frame_header, offset = parse_frame_header(raw_data)
             num_tlvs = frame_header["Num TLVs"]
 
             # Parse TLVs
             detected_coords = []
             for _ in range(num_tlvs):
-                tlv_header = parse_tlv_header(raw_data_list)
+                tlv_header, offset = parse_tlv_header(raw_data, offset)
                 if tlv_header["TLV Type"] == 1:  # Interested in Detected Points
-                    tlv_payload = parse_tlv_payload(tlv_header, raw_data_list)
+                    tlv_payload, offset = parse_tlv_payload(tlv_header, raw_data, offset)
                     if tlv_payload and "Detected Points" in tlv_payload:
-                        for point in tlv_payload["Detected Points"]:
-                            detected_coords.append((point["X [m]"], point["Y [m]"], point["Z [m]"]))
+                        detected_coords.extend(point_coordinates(tlv_payload["Detected Points"]))
 
             if not detected_coords:
                 continue
@@ -451,23 +474,22 @@ def live_visualization_with_dbscan(data, doppler_threshold=0.1, axis_limit=12, d
                 print(f"Skipping row {row_idx + 1} due to invalid timestamp.")
                 continue
 
-            raw_data_list = [int(x) for x in data.iloc[row_idx]['RawData'].split(',')]
-            frame_header = parse_frame_header(raw_data_list)
+            raw_data = bytes(int(x) for x in data.iloc[row_idx]['RawData'].split(','))
+            frame_header, offset = parse_frame_header(raw_data)
             num_tlvs = frame_header["Num TLVs"]
 
             stationary_coords = []  # Stationary points: (X, Y, Z)
             moving_coords = []      # Moving points: (X, Y, Z)
 
             for _ in range(num_tlvs):
-                tlv_header = parse_tlv_header(raw_data_list)
+                tlv_header, offset = parse_tlv_header(raw_data, offset)
                 if tlv_header["TLV Type"] == 1:
-                    tlv_payload = parse_tlv_payload(tlv_header, raw_data_list)
+                    tlv_payload, offset = parse_tlv_payload(tlv_header, raw_data, offset)
                     if tlv_payload and "Detected Points" in tlv_payload:
-                        for point in tlv_payload["Detected Points"]:
-                            if abs(point["Doppler [m/s]"]) <= doppler_threshold:
-                                stationary_coords.append((point["X [m]"], point["Y [m]"], point["Z [m]"]))
-                            else:
-                                moving_coords.append((point["X [m]"], point["Y [m]"], point["Z [m]"]))
+                        # Categorize based on Doppler threshold
+                        stationary_points, moving_points = split_by_doppler(tlv_payload["Detected Points"], doppler_threshold)
+                        stationary_coords.extend(stationary_points)
+                        moving_coords.extend(moving_points)
 
             ax_stationary.cla()
             ax_moving.cla()
@@ -579,19 +601,18 @@ def live_visualization_with_kalman(
                 print(f"Skipping row {row_idx + 1} due to invalid timestamp.")
                 continue
 
-            raw_data_list = [int(x) for x in data.iloc[row_idx]['RawData'].split(',')]
-            frame_header = parse_frame_header(raw_data_list)
+            raw_data = bytes(int(x) for x in data.iloc[row_idx]['RawData'].split(','))
+            frame_header, offset = parse_frame_header(raw_data)
             num_tlvs = frame_header["Num TLVs"]
 
             detected_coords = []
 
             for _ in range(num_tlvs):
-                tlv_header = parse_tlv_header(raw_data_list)
+                tlv_header, offset = parse_tlv_header(raw_data, offset)
                 if tlv_header["TLV Type"] == 1:
-                    tlv_payload = parse_tlv_payload(tlv_header, raw_data_list)
+                    tlv_payload, offset = parse_tlv_payload(tlv_header, raw_data, offset)
                     if tlv_payload and "Detected Points" in tlv_payload:
-                        for point in tlv_payload["Detected Points"]:
-                            detected_coords.append([point["X [m]"], point["Y [m]"], point["Z [m]"]])
+                        detected_coords.extend(point_coordinates(tlv_payload["Detected Points"]))
 
             if not detected_coords:
                 continue
@@ -660,10 +681,10 @@ def live_visualization(data, doppler_threshold=0.1, axis_limit=12, delay=0.5):
                 continue
 
             # Get raw data from the current row
-            raw_data_list = [int(x) for x in data.iloc[row_idx]['RawData'].split(',')]
+            raw_data = bytes(int(x) for x in data.iloc[row_idx]['RawData'].split(','))
 
             # Parse the frame header
-            frame_header = parse_frame_header(raw_data_list)
+            frame_header, offset = parse_frame_header(raw_data)
             num_tlvs = frame_header["Num TLVs"]
 
             # Storage for stationary and moving points
@@ -672,16 +693,14 @@ def live_visualization(data, doppler_threshold=0.1, axis_limit=12, delay=0.5):
 
             # Parse TLVs
             for _ in range(num_tlvs):
-                tlv_header = parse_tlv_header(raw_data_list)
+                tlv_header, offset = parse_tlv_header(raw_data, offset)
                 if tlv_header["TLV Type"] == 1:  # Interested in Detected Points
-                    tlv_payload = parse_tlv_payload(tlv_header, raw_data_list)
+                    tlv_payload, offset = parse_tlv_payload(tlv_header, raw_data, offset)
                     if tlv_payload and "Detected Points" in tlv_payload:
-                        for point in tlv_payload["Detected Points"]:
-                            # Categorize based on Doppler threshold
-                            if abs(point["Doppler [m/s]"]) <= doppler_threshold:
-                                stationary_coords.append((point["X [m]"], point["Y [m]"], point["Z [m]"]))
-                            else:
-                                moving_coords.append((point["X [m]"], point["Y [m]"], point["Z [m]"]))
+                        # Categorize based on Doppler threshold
+                        stationary_points, moving_points = split_by_doppler(tlv_payload["Detected Points"], doppler_threshold)
+                        stationary_coords.extend(stationary_points)
+                        moving_coords.extend(moving_points)
 
             # Clear plots for new frame
             ax_stationary.cla()
@@ -777,23 +796,22 @@ def live_visualization_with_region_growing(data, doppler_threshold=0.1, axis_lim
                 print(f"Skipping row {row_idx + 1} due to invalid timestamp.")
                 continue
 
-            raw_data_list = [int(x) for x in data.iloc[row_idx]['RawData'].split(',')]
-            frame_header = parse_frame_header(raw_data_list)
+            raw_data = bytes(int(x) for x in data.iloc[row_idx]['RawData'].split(','))
+            frame_header, offset = parse_frame_header(raw_data)
             num_tlvs = frame_header["Num TLVs"]
 
             stationary_coords = []
             moving_coords = []
 
             for _ in range(num_tlvs):
-                tlv_header = parse_tlv_header(raw_data_list)
+                tlv_header, offset = parse_tlv_header(raw_data, offset)
                 if tlv_header["TLV Type"] == 1:
-                    tlv_payload = parse_tlv_payload(tlv_header, raw_data_list)
+                    tlv_payload, offset = parse_tlv_payload(tlv_header, raw_data, offset)
                     if tlv_payload and "Detected Points" in tlv_payload:
-                        for point in tlv_payload["Detected Points"]:
-                            if abs(point["Doppler [m/s]"]) <= doppler_threshold:
-                                stationary_coords.append((point["X [m]"], point["Y [m]"], point["Z [m]"]))
-                            else:
-                                moving_coords.append((point["X [m]"], point["Y [m]"], point["Z [m]"]))
+                        # Categorize based on Doppler threshold
+                        stationary_points, moving_points = split_by_doppler(tlv_payload["Detected Points"], doppler_threshold)
+                        stationary_coords.extend(stationary_points)
+                        moving_coords.extend(moving_points)
 
             ax_stationary.cla()
             ax_moving.cla()
@@ -13,10 +13,14 @@ R_zero_10 = R_zero_20 * (sigma_0_lin/sigma_20_lin)**(1/4)
 
 phi = np.arange(-90, 90, 1)
 G_phi_dB = -0.0055*phi**2 + 17.5
-G_phi_lin = 10**(G_phi_dB/10)
 
-R_phi_20 = R_zero_20 * (G_phi_lin/G_phi_lin[int(len(phi)/2)])**(1/4)
-R_phi_10 = R_zero_10 * (G_phi_lin/G_phi_lin[int(len(phi)/2)])**(1/4)
+# Coverage scales with the fourth root of the gain relative to boresight: (G/G0)**(1/4) = 10**((G_dB - G0_dB)/40).
+# The scale is computed once, in dB, and shared by both targets
+G_center_dB = G_phi_dB[int(len(phi)/2)]
+coverage_scale = 10**((G_phi_dB - G_center_dB)/40)
+
+R_phi_20 = R_zero_20 * coverage_scale
+R_phi_10 = R_zero_10 * coverage_scale
 
 
 
@@ -48,10 +48,24 @@ dots = [
     for _ in range(num_dots)
 ]
 
-# Detected dots and their Kalman filters
+# Uniform grid of dot indices with cells as large as the wedge radius, so the wedge
+# (a circle sector around its center) only ever reaches the 3x3 cells around its center
+dots_array = np.array(dots)
+dot_grid_cell = wedge_config['radius']
+dot_grid = {}
+for dot_index, (dot_x, dot_y) in enumerate(dots):
+    dot_grid.setdefault((int(dot_x // dot_grid_cell), int(dot_y // dot_grid_cell)), []).append(dot_index)
+
+# Constant-velocity Kalman model (dt = 1 frame): state (x, y, vx, vy)
+KF_P0 = np.eye(4) * 10  # Initial covariance matrix
+KF_Q = np.eye(4) * 0.01  # Process noise
+
+# Detected dots and their Kalman tracks, stored as arrays with one row per tracked dot
 detected_dots = []
 displayed_dots = set()  # To track dots whose Doppler results have already been displayed
-kalman_filters = {}
+kalman_dots = []  # Dot of each track row
+kalman_states = np.empty((0, 4))  # State of each track
+kalman_covariances = np.empty((0, 4, 4))  # Covariance of each track
 radial_speeds_over_time = {}  # Store radial speed history for each dot
 
 # Create the figure and axes
@@ -169,118 +183,104 @@ def estimating_self_speed_cosine(detected_dots):
     return phi_fit, radial_speed_fit
 
 
-def create_kalman_filter(initial_x, initial_y):
-    """Create and initialize a Kalman filter for a dot."""
-    from filterpy.kalman import KalmanFilter
-    kf = KalmanFilter(dim_x=4, dim_z=2)  # 4 states (x, y, vx, vy), 2 measurements (x, y)
-    kf.F = np.array([[1, 0, 1, 0],  # State transition matrix
-                     [0, 1, 0, 1],
-                     [0, 0, 1, 0],
-                     [0, 0, 0, 1]])
-    kf.H = np.array([[1, 0, 0, 0],  # Measurement function
-                     [0, 1, 0, 0]])
-    kf.P *= 10  # Initial covariance matrix
-    kf.R = np.array([[0.1, 0],  # Measurement noise
-                     [0, 0.1]])
-    kf.Q = np.eye(4) * 0.01  # Process noise
-    kf.x = np.array([[initial_x],  # Initial state
-                     [initial_y],
-                     [0],
-                     [0]])
-    return kf
-
-def calculate_doppler_and_radial_speed(square_position, dot_position):
+def create_kalman_filter(dot, initial_x, initial_y):
+    """Start a Kalman track for a dot (at rest at its initial position)."""
+    global kalman_states, kalman_covariances
+    kalman_dots.append(dot)
+    kalman_states = np.vstack([kalman_states, [initial_x, initial_y, 0, 0]])
+    kalman_covariances = np.concatenate([kalman_covariances, KF_P0[np.newaxis]])
+
+def predict_kalman_filters(tracks):
     """
-    Calculate the radial speed and Doppler shift for a detected dot.
+    Kalman predict of the selected tracks, all at once.
+
+    With F = [[I, I], [0, I]] (2x2 blocks), x' = F x only adds the velocity to the position, and
+    P' = F P F^T + Q is, per block of P = [[A, B], [C, D]]: [[A + B + C + D, B + D], [C + D, D]] + Q.
+
+    Parameters:
+    - tracks: Boolean mask (or indices) of the track rows to predict.
+    """
+    kalman_states[tracks, :2] += kalman_states[tracks, 2:]
+
+    A = kalman_covariances[tracks, :2, :2]
+    B = kalman_covariances[tracks, :2, 2:]
+    C = kalman_covariances[tracks, 2:, :2]
+    D = kalman_covariances[tracks, 2:, 2:]
+    kalman_covariances[tracks, :2, :2] = A + B + C + D
+    kalman_covariances[tracks, :2, 2:] = B + D
+    kalman_covariances[tracks, 2:, :2] = C + D
+    kalman_covariances[tracks] += KF_Q
+
+def calculate_doppler_and_radial_speed(square_position, dot_positions):
+    """
+    Calculate the radial speed and Doppler shift for detected dots.
 
     Parameters:
     - square_position: Tuple (x, y) of the square's position.
-    - dot_position: Tuple (x, y) of the dot's position.
+    - dot_positions: Positions (x, y) of the dots, as a sequence of tuples or an (N, 2) array.
 
     Returns:
-    - radial_speed: Radial speed (m/s) of the dot relative to the square.
-    - doppler_shift: Doppler frequency shift (Hz) due to the radial speed.
+    - radial_speed: Radial speeds (m/s) of the dots relative to the square.
+    - doppler_shift: Doppler frequency shifts (Hz) due to the radial speeds.
     """
-    # Relative position vector
-    dx = dot_position[0] - square_position[0]
-    dy = dot_position[1] - square_position[1]
+    # Relative position vectors
+    relative = np.asarray(dot_positions, dtype=float).reshape(-1, 2) - square_position
+    dx = relative[:, 0]
+    dy = relative[:, 1]
     distance = np.sqrt(dx**2 + dy**2)
-    
-    # Avoid division by zero for extremely close dots
-    if distance == 0:
-        return 0, 0
 
     # Angle between the radar's motion and the line to the dot
     theta = np.arctan2(dy, dx)
-    
-    # Radial speed (m/s)
-    radial_speed = v_s * np.cos(theta)
-    
+
+    # Radial speed (m/s), zero for extremely close dots
+    radial_speed = np.where(distance == 0, 0, v_s * np.cos(theta))
+
     # Doppler frequency shift (Hz)
     doppler_shift = (2 * f * radial_speed) / c
 
     return radial_speed, doppler_shift
 
-def is_point_in_wedge(point, wedge_center, wedge_radius, wedge_angle, wedge_direction):
-    """Check if a point is within the wedge's detection area."""
-    px, py = point
-    cx, cy = wedge_center
-    dx, dy = px - cx, py - cy
-    distance = np.sqrt(dx**2 + dy**2)
-    if distance > wedge_radius:
-        return False
-
-    angle_to_point = np.degrees(np.arctan2(dy, dx))
-    relative_angle = (angle_to_point - wedge_direction) % 360
-    if relative_angle > 180:
-        relative_angle -= 360
-
-    return -wedge_angle / 2 <= relative_angle <= wedge_angle / 2
-
-def is_point_in_wedge_with_shadow(point, wedge_center, wedge_radius, wedge_angle, slice_width, closest_points):
+def detect_dots_with_shadow(wedge_center, wedge_radius, wedge_angle, slice_width, closest_points):
     """
-    Check if a point is in the wedge and simulate shadowing.
+    Return the dots detected by the wedge, with shadowing: a dot is detected if it is within the
+    wedge's radius and angular range, and no closer dot was detected in its angular slice
+    (closest_points holds the closest detection of each slice and is updated in place).
 
-    Parameters:
-    - point: (x, y) position of the object.
-    - wedge_center: (x, y) center of the wedge.
-    - wedge_radius: Maximum detection range of the wedge.
-    - wedge_angle: Total angular range of the wedge (degrees).
-    - slice_width: Angular width of each slice (degrees).
-    - closest_points: Dictionary of the closest detected object for each angular slice.
-
-    Returns:
-    - True if the point is detected (not occluded); False otherwise.
+    Only the dots in the grid cells around the wedge center are tested, and their distance and
+    angle are computed at once; the shadow check then runs over the dots inside the wedge, in dot order.
     """
-    px, py = point
     cx, cy = wedge_center
+    cell_x, cell_y = int(cx // dot_grid_cell), int(cy // dot_grid_cell)
+    candidates = sorted(
+        dot_index
+        for grid_x in range(cell_x - 1, cell_x + 2)
+        for grid_y in range(cell_y - 1, cell_y + 2)
+        for dot_index in dot_grid.get((grid_x, grid_y), [])
+    )
+    if not candidates:
+        return []
 
-    # Calculate the relative position
-    dx, dy = px - cx, py - cy
-    distance = np.sqrt(dx**2 + dy**2)
-
-    # Ignore points outside the wedge's radius
-    if distance > wedge_radius:
-        return False
-
-    # Calculate the angle of the point relative to the wedge center
-    angle_to_point = np.degrees(np.arctan2(dy, dx))
+    # Distance and angle of every candidate relative to the wedge center
+    dx = dots_array[candidates, 0] - cx
+    dy = dots_array[candidates, 1] - cy
+    distances = np.sqrt(dx**2 + dy**2)
+    angles = np.degrees(np.arctan2(dy, dx))
+    in_wedge = (distances <= wedge_radius) & (-wedge_angle / 2 <= angles) & (angles <= wedge_angle / 2)
 
-    # Check if the angle is within the wedge's range
-    if not (-wedge_angle / 2 <= angle_to_point <= wedge_angle / 2):
-        return False
+    detected = []
+    for dot_index, distance, angle_to_point in zip(np.asarray(candidates)[in_wedge], distances[in_wedge], angles[in_wedge]):
+        # Determine which slice the point belongs to
+        slice_index = int((angle_to_point + wedge_angle / 2) / slice_width)
 
-    # Determine which slice the point belongs to
-    slice_index = int((angle_to_point + wedge_angle / 2) / slice_width)
+        # Simulate shadowing: Check if this point is closer than the current closest
+        if slice_index in closest_points and distance >= closest_points[slice_index]['distance']:
+            continue  # Occluded by a closer point
 
-    # Simulate shadowing: Check if this point is closer than the current closest
-    if slice_index in closest_points:
-        if distance >= closest_points[slice_index]['distance']:
-            return False  # Occluded by a closer point
+        # Update the closest point for this slice
+        closest_points[slice_index] = {'distance': distance, 'point': dots[dot_index]}
+        detected.append(dots[dot_index])
 
-    # Update the closest point for this slice
-    closest_points[slice_index] = {'distance': distance, 'point': point}
-    return True
+    return detected
 
 def add_shadow(ax, detected_point, wedge_center, wedge_radius, slice_width, angle_to_point):
     """
@@ -318,7 +318,7 @@ def update(frame):
     Update function for the animation. Detects and tracks dots using Kalman Filter,
     calculates Doppler shift and radial speed for detected dots, and marks detected dots with crosses.
     """
-    global detected_dots, displayed_dots, kalman_filters
+    global detected_dots, displayed_dots
 
     # Calculate the car's current speed
     v_s = calculate_exponential_speed(frame)
@@ -334,11 +334,9 @@ def update(frame):
     closest_points = {}  # Track the closest points in each angular slice
 
     # Check for new detections
-    new_detections = [
-        dot for dot in dots if is_point_in_wedge_with_shadow(
-            dot, wedge_center, wedge_config['radius'], wedge_config['angle'], slice_width, closest_points
-        )
-    ]
+    new_detections = detect_dots_with_shadow(
+        wedge_center, wedge_config['radius'], wedge_config['angle'], slice_width, closest_points
+    )
 
     for dot in new_detections:
         if dot not in detected_dots:
@@ -356,14 +354,14 @@ def update(frame):
             ax_main.plot(dot[0], dot[1], 'x', color='red')  # Mark as detected
 
 
-    # Predict and update Kalman filters for tracked dots and calculate Doppler effect
-    for dot, kf in kalman_filters.items():
-        if dot not in displayed_dots:
-            kf.predict()
-            pred_x, pred_y = kf.x[0, 0], kf.x[1, 0]
-
-            # Calculate Doppler effect and radial speed
-            radial_speed, doppler_shift = calculate_doppler_and_radial_speed(wedge_center, (pred_x, pred_y))
+    # Predict the Kalman tracks of the dots not displayed yet (in one step) and calculate Doppler effect
+    pending = np.array([dot not in displayed_dots for dot in kalman_dots], dtype=bool)
+    if pending.any():
+        predict_kalman_filters(pending)
+        pending_dots = [dot for dot, is_pending in zip(kalman_dots, pending) if is_pending]
+        # Calculate Doppler effect and radial speed of all predicted positions at once
+        radial_speeds, doppler_shifts = calculate_doppler_and_radial_speed(wedge_center, kalman_states[pending, :2])
+        for dot, radial_speed, doppler_shift in zip(pending_dots, radial_speeds, doppler_shifts):
             print(f"Dot at {dot}: Radial Speed = {radial_speed:.2f} m/s, Doppler Shift = {doppler_shift:.2f} Hz")
 
             # Add the dot to the displayed set
@@ -371,10 +369,8 @@ def update(frame):
 
     # Calculate radial speeds for detected dots
     detected_with_radial_speeds = []
-    for dot in detected_dots:
-        dist = np.sqrt(dot[0]**2 + dot[1]**2)
-        phi = np.rad2deg(np.arcsin(dot[1] / dist))
-        radial_speed, _ = calculate_doppler_and_radial_speed(wedge_center, dot)
+    radial_speeds, _ = calculate_doppler_and_radial_speed(wedge_center, detected_dots)
+    for dot, radial_speed in zip(detected_dots, radial_speeds):
         detected_with_radial_speeds.append((dot[0], dot[1], radial_speed))
         # Update radial speed history
         if dot not in radial_speeds_over_time: